@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import re
 import sys
 from logging.config import fileConfig
 from pathlib import Path
@@ -32,6 +33,25 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Search indexes created with raw DDL in ``app.models.blog``: the SQLite FTS5
+# tables with their shadow tables, and the PostgreSQL tsvector column and GIN
+# indexes. They are not in the metadata, so without this filter autogenerate
+# would propose dropping them.
+SEARCH_TABLES = re.compile(r"^blog_posts(_slug)?_fts(_\w+)?$")
+SEARCH_OBJECTS = {
+    "search_vector",
+    "ix_blog_posts_search_vector",
+    "ix_blog_posts_slug_trgm",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Leave the database-maintained search indexes out of autogenerate."""
+    if type_ == "table" and SEARCH_TABLES.match(name or ""):
+        return False
+    return not (reflected and compare_to is None and name in SEARCH_OBJECTS)
+
+
 # Build application context so Alembic can access configuration and models.
 app = create_app(os.getenv("FLASK_CONFIG", "backend.config.DevelopmentConfig"))
 
@@ -60,6 +80,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -82,7 +103,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
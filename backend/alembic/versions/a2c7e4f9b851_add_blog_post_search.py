@@ -0,0 +1,104 @@
+"""Add full-text search indexes for blog posts
+
+Revision ID: a2c7e4f9b851
+Revises: f4c8d2b6a719
+Create Date: 2026-10-19 16:02:48.271930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c7e4f9b851'
+down_revision: Union[str, None] = 'f4c8d2b6a719'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE blog_posts_fts USING fts5(
+        title, slug, content,
+        content='blog_posts', content_rowid='id', prefix='2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE blog_posts_slug_fts USING fts5(
+        slug, content='blog_posts', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER blog_posts_search_insert AFTER INSERT ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(rowid, title, slug, content)
+        VALUES (new.id, new.title, new.slug, new.content);
+        INSERT INTO blog_posts_slug_fts(rowid, slug) VALUES (new.id, new.slug);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_posts_search_delete AFTER DELETE ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, slug, content)
+        VALUES ('delete', old.id, old.title, old.slug, old.content);
+        INSERT INTO blog_posts_slug_fts(blog_posts_slug_fts, rowid, slug)
+        VALUES ('delete', old.id, old.slug);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_posts_search_update
+    AFTER UPDATE OF title, slug, content ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, slug, content)
+        VALUES ('delete', old.id, old.title, old.slug, old.content);
+        INSERT INTO blog_posts_slug_fts(blog_posts_slug_fts, rowid, slug)
+        VALUES ('delete', old.id, old.slug);
+        INSERT INTO blog_posts_fts(rowid, title, slug, content)
+        VALUES (new.id, new.title, new.slug, new.content);
+        INSERT INTO blog_posts_slug_fts(rowid, slug) VALUES (new.id, new.slug);
+    END
+    """,
+    "INSERT INTO blog_posts_fts(blog_posts_fts) VALUES ('rebuild')",
+    "INSERT INTO blog_posts_slug_fts(blog_posts_slug_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS blog_posts_search_update",
+    "DROP TRIGGER IF EXISTS blog_posts_search_delete",
+    "DROP TRIGGER IF EXISTS blog_posts_search_insert",
+    "DROP TABLE IF EXISTS blog_posts_slug_fts",
+    "DROP TABLE IF EXISTS blog_posts_fts",
+]
+
+POSTGRESQL_UPGRADE = [
+    """
+    ALTER TABLE blog_posts ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', title), 'A')
+        || setweight(to_tsvector('simple', replace(slug, '-', ' ')), 'B')
+        || setweight(to_tsvector('english', content), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX ix_blog_posts_search_vector ON blog_posts USING gin (search_vector)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_blog_posts_slug_trgm ON blog_posts USING gin (slug gin_trgm_ops)",
+]
+
+POSTGRESQL_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_blog_posts_slug_trgm",
+    "DROP INDEX IF EXISTS ix_blog_posts_search_vector",
+    "ALTER TABLE blog_posts DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {'sqlite': SQLITE_UPGRADE, 'postgresql': POSTGRESQL_UPGRADE}
+    for statement in statements.get(dialect, []):
+        op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    statements = {'sqlite': SQLITE_DOWNGRADE, 'postgresql': POSTGRESQL_DOWNGRADE}
+    for statement in statements.get(dialect, []):
+        op.execute(sa.text(statement))
@@ -10,7 +10,17 @@ from flask import Flask
 from flask_cors import CORS
 
 from .admin import setup_admin
-from .extensions import bcrypt, db, jwt, limiter, ma, mail, migrate
+from .extensions import (
+    bcrypt,
+    cache,
+    compress,
+    db,
+    jwt,
+    limiter,
+    ma,
+    mail,
+    migrate,
+)
 from .jwt_callbacks import configure_jwt
 from .routes.admin import admin_bp
 from .routes.auth import auth_bp
@@ -19,6 +29,7 @@ from .routes.lessons import lesson_bp
 from .routes.profile import profile_bp
 from .routes.public import public_bp
 from .routes.resources import resource_bp
+from .routes.reviews import review_bp
 from .routes.web import web_bp
 from .utils.logging import LOGGING_CONFIG
 
@@ -49,9 +60,6 @@ def create_app(config_class: str = "backend.config.DevelopmentConfig") -> Flask:
 
 def register_extensions(app: Flask) -> None:
     """Bind Flask extensions to the application."""
-    from .models.base import Base
-
-    db.Model = Base  # type: ignore[attr-defined]
     db.init_app(app)
     migrate.init_app(app, db)
     mail.init_app(app)
@@ -60,6 +68,8 @@ def register_extensions(app: Flask) -> None:
     bcrypt.init_app(app)
     limiter.init_app(app)
     ma.init_app(app)
+    cache.init_app(app)
+    compress.init_app(app)
 
 
 def register_blueprints(app: Flask) -> None:
@@ -69,6 +79,7 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(resource_bp, url_prefix="/api/v1/resources")
     app.register_blueprint(flashcard_bp, url_prefix="/api/v1/flashcards")
     app.register_blueprint(lesson_bp, url_prefix="/api/v1/lessons")
+    app.register_blueprint(review_bp, url_prefix="/api/v1/reviews")
     app.register_blueprint(admin_bp, url_prefix="/api/v1/admin")
     app.register_blueprint(public_bp, url_prefix="/api/v1/public")
     app.register_blueprint(web_bp)
@@ -89,9 +100,21 @@ def configure_cors(app: Flask) -> None:
 
 def register_cli(app: Flask) -> None:
     """Register custom CLI commands."""
+    from .cli import (
+        fit_review_parameters_command,
+        generate_backlog_command,
+        public_group,
+        reconcile_counters_command,
+        render_lessons_command,
+    )
     from .seeds.seed_data import seed_command
 
     app.cli.add_command(seed_command)
+    app.cli.add_command(generate_backlog_command)
+    app.cli.add_command(fit_review_parameters_command)
+    app.cli.add_command(render_lessons_command)
+    app.cli.add_command(public_group)
+    app.cli.add_command(reconcile_counters_command)
 
 
 __all__ = ["create_app", "register_extensions"]
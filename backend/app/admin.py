@@ -6,6 +6,7 @@ from flask import abort
 from flask_admin import Admin, AdminIndexView
 from flask_admin.contrib.sqla import ModelView
 from flask_jwt_extended import current_user
+from markupsafe import Markup
 
 from .extensions import db
 from .models import (
@@ -20,11 +21,20 @@ from .models import (
     Role,
     User,
 )
+from .utils.http_cache import (
+    PUBLIC_BLOG,
+    PUBLIC_DECKS,
+    PUBLIC_LESSONS,
+    invalidate_public,
+)
 
 
 class SecureModelView(ModelView):
     """ModelView enforcing admin authentication."""
 
+    #: Public response cache namespaces retired when a record changes.
+    cache_namespaces: tuple[str, ...] = ()
+
     def is_accessible(self) -> bool:  # type: ignore[override]
         return bool(
             current_user
@@ -35,6 +45,25 @@ class SecureModelView(ModelView):
     def inaccessible_callback(self, name, **kwargs):  # type: ignore[override]
         abort(403)
 
+    def after_model_change(self, form, model, is_created):  # type: ignore[override]
+        invalidate_public(*self.cache_namespaces)
+
+    def after_model_delete(self, model):  # type: ignore[override]
+        invalidate_public(*self.cache_namespaces)
+
+
+class LessonAdminView(SecureModelView):
+    """Lesson admin showing the stored HTML rendering instead of raw content."""
+
+    can_view_details = True
+    column_exclude_list = ("content", "rendered_hash")
+    form_excluded_columns = ("rendered_content", "rendered_hash")
+    column_formatters = {
+        "rendered_content": lambda view, context, model, name: Markup(
+            model.rendered_content or ""
+        )
+    }
+
 
 class SecureAdminIndexView(AdminIndexView):
     """Custom admin index that enforces authentication."""
@@ -73,6 +102,16 @@ def setup_admin(app) -> Admin:
         (BlogPost, "blog_post_admin"),
         (Notification, "notification_admin"),
     ]
+    views = {Lesson: LessonAdminView}
+    namespaces = {
+        Category: (PUBLIC_LESSONS,),
+        FlashcardDeck: (PUBLIC_DECKS,),
+        Flashcard: (PUBLIC_DECKS,),
+        Lesson: (PUBLIC_LESSONS,),
+        BlogPost: (PUBLIC_BLOG,),
+    }
     for model, endpoint in models:
-        admin_instance.add_view(SecureModelView(model, db.session, endpoint=endpoint))
+        view = views.get(model, SecureModelView)(model, db.session, endpoint=endpoint)
+        view.cache_namespaces = namespaces.get(model, ())
+        admin_instance.add_view(view)
     return admin_instance
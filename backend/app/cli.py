@@ -0,0 +1,138 @@
+"""Operational CLI commands."""
+
+from __future__ import annotations
+
+from itertools import groupby
+
+import click
+import sqlalchemy as sa
+from flask import current_app
+from flask.cli import with_appcontext
+
+from .extensions import db
+from .models import FlashcardDeck, Lesson, Resource
+from .services.counter_service import counter_service
+from .services.flashcard_service import flashcard_service
+from .services.public_snapshot import SNAPSHOT_PATHS, SnapshotError, build_snapshot
+from .services.review_service import review_service
+
+
+@click.command("generate-backlog")
+@click.option("--limit", default=100, show_default=True, help="Resources to process.")
+@click.option("--provider", default=None, help="AI provider name (default: config).")
+@with_appcontext
+def generate_backlog_command(limit: int, provider: str | None) -> None:
+    """Generate decks for resources with text but no deck, in packed batches."""
+    stmt = (
+        sa.select(Resource)
+        .where(
+            Resource.text_content.is_not(None),
+            Resource.ai_processing_status.in_(("pending", "ready")),
+            ~sa.exists().where(FlashcardDeck.resource_id == Resource.id),
+        )
+        .order_by(Resource.owner_id, Resource.id)
+        .limit(limit)
+    )
+    resources = db.session.scalars(stmt).all()
+    created = failed = 0
+    for _, group in groupby(resources, key=lambda resource: resource.owner_id):
+        owned = list(group)
+        results = flashcard_service.generate_decks_batch(
+            owner=owned[0].owner, resources=owned, provider=provider
+        )
+        for result in results:
+            if result.deck is not None:
+                created += 1
+            else:
+                failed += 1
+                click.echo(f"Resource {result.resource.id}: {result.error}", err=True)
+    click.echo(f"Generated {created} decks; {failed} resources failed.")
+
+
+@click.command("fit-review-parameters")
+@click.option(
+    "--min-reviews",
+    type=int,
+    default=None,
+    help="Reviews a user needs before fitting (default: REVIEW_FIT_MIN_REVIEWS).",
+)
+@click.option("--iterations", default=40, show_default=True, help="Optimizer steps.")
+@click.option(
+    "--batch-users", default=2000, show_default=True, help="Users fitted together."
+)
+@with_appcontext
+def fit_review_parameters_command(
+    min_reviews: int | None, iterations: int, batch_users: int
+) -> None:
+    """Fit per-user FSRS weights from review history and store them."""
+    total = review_service.count_fit_reviews(min_reviews=min_reviews)
+    with click.progressbar(length=total, label="Fitting reviews") as bar:
+        summary = review_service.fit_parameters(
+            min_reviews=min_reviews,
+            users_per_batch=batch_users,
+            iterations=iterations,
+            progress=bar.update,
+        )
+    click.echo(
+        f"Fitted {summary.users} users from {summary.reviews} reviews; "
+        f"{summary.improved} improved on their previous weights."
+    )
+
+
+@click.command("render-lessons")
+@click.option(
+    "--batch-size", default=200, show_default=True, help="Lessons per commit."
+)
+@with_appcontext
+def render_lessons_command(batch_size: int) -> None:
+    """Store HTML renderings for lessons whose content changed since rendering."""
+    rendered = 0
+    last_id = 0
+    while True:
+        lessons = db.session.scalars(
+            sa.select(Lesson)
+            .where(Lesson.id > last_id)
+            .order_by(Lesson.id)
+            .limit(batch_size)
+        ).all()
+        if not lessons:
+            break
+        rendered += sum(lesson.refresh_rendered_content() for lesson in lessons)
+        last_id = lessons[-1].id
+        db.session.commit()
+    click.echo(f"Rendered {rendered} lessons.")
+
+
+@click.group("public")
+def public_group() -> None:
+    """Manage static copies of public content."""
+
+
+@public_group.command("snapshot")
+@click.option(
+    "--only",
+    "namespaces",
+    multiple=True,
+    type=click.Choice(sorted(SNAPSHOT_PATHS)),
+    help="Namespace to rebuild (repeatable; default: all).",
+)
+@with_appcontext
+def public_snapshot_command(namespaces: tuple[str, ...]) -> None:
+    """Write public endpoint payloads and gzip copies to PUBLIC_SNAPSHOT_DIR."""
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    try:
+        manifest = build_snapshot(app, namespaces or None)
+    except SnapshotError as exc:
+        raise click.ClickException(str(exc)) from exc
+    for path, entry in sorted(manifest["files"].items()):
+        click.echo(f"{path}: {entry['size']} bytes, {entry['gzip_size']} gzipped")
+
+
+@click.command("reconcile-counters")
+@with_appcontext
+def reconcile_counters_command() -> None:
+    """Recount the admin dashboard counters and repair any drift."""
+    drift = counter_service.reconcile()
+    for name, (stored, actual) in sorted(drift.items()):
+        click.echo(f"{name}: {stored} -> {actual}")
+    click.echo(f"Reconciled {len(drift)} drifted counters.")
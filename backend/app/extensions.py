@@ -10,8 +10,17 @@ from flask_mail import Mail
 from flask_marshmallow import Marshmallow
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import DeclarativeBase
 
-db = SQLAlchemy()
+from .utils.cache import Cache
+from .utils.compression import Compress
+
+
+class _DeclarativeBase(DeclarativeBase):
+    """SQLAlchemy 2.0 base that Flask-SQLAlchemy turns into ``db.Model``."""
+
+
+db = SQLAlchemy(model_class=_DeclarativeBase, disable_autonaming=True)
 migrate = Migrate()
 mail = Mail()
 jwt = JWTManager()
@@ -20,4 +29,16 @@ limiter = Limiter(
     key_func=get_remote_address, default_limits=["200 per day", "50 per hour"]
 )
 ma = Marshmallow()
-__all__ = ["db", "migrate", "mail", "jwt", "bcrypt", "limiter", "ma"]
+cache = Cache()
+compress = Compress()
+__all__ = [
+    "db",
+    "migrate",
+    "mail",
+    "jwt",
+    "bcrypt",
+    "limiter",
+    "ma",
+    "cache",
+    "compress",
+]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from .admin_counter import AdminCounter
 from .blog import BlogPost
 from .category import Category
 from .faq import FAQ
@@ -10,11 +11,15 @@ from .lesson import Lesson
 from .notification import Notification
 from .profile import Profile
 from .resource import Resource
+from .review import CardReview, CardState, ReviewParameters
 from .role import Role
 from .user import User
 
 __all__ = [
+    "AdminCounter",
     "BlogPost",
+    "CardReview",
+    "CardState",
     "Category",
     "Flashcard",
     "FlashcardDeck",
@@ -23,6 +28,7 @@ __all__ = [
     "Notification",
     "Profile",
     "Resource",
+    "ReviewParameters",
     "Role",
     "User",
 ]
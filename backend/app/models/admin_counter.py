@@ -0,0 +1,166 @@
+"""Row counts for the admin dashboards, maintained as rows change.
+
+Each counter in :data:`COUNTERS` counts the rows of one model matching a
+condition on one attribute; those attributes use ``active_history`` so the
+previous value is known when they change. Flush hooks on ``db.session`` add
+the net change of every flush to the counter rows in the same transaction,
+so the dashboards read all counts with one query instead of scanning the
+tables. Deleted rows are counted by ``before_delete`` mapper events, which
+also fire for ORM cascades and orphans; the relationships leading to counted
+models therefore keep ``passive_deletes=False`` so their rows are never
+removed by ``ON DELETE CASCADE`` behind the ORM's back.
+Writes issued as Core statements bypass the hooks, so set-based updates
+apply their own deltas (see ``CounterService.update_deltas``); ``flask
+reconcile-counters`` recounts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import sqlalchemy as sa
+from sqlalchemy import BigInteger, String, event, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column, object_session
+
+from ..extensions import db
+from .base import Base
+from .blog import BlogPost
+from .lesson import Lesson
+from .notification import Notification
+from .resource import Resource
+from .user import User
+
+_DELTAS_KEY = "admin_counter_deltas"
+
+
+class AdminCounter(Base):
+    """Current value of one dashboard counter."""
+
+    __tablename__ = "admin_counters"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+
+    def __repr__(self) -> str:
+        return f"<AdminCounter {self.name}={self.value}>"
+
+
+@dataclass(frozen=True)
+class CounterSpec:
+    """Rows of ``model`` whose ``attribute`` satisfies ``matches``.
+
+    ``clause`` is the same condition in SQL, used when recounting.
+    """
+
+    model: type[Base]
+    attribute: str | None
+    matches: Callable[[Any], bool]
+    clause: sa.ColumnElement[bool]
+
+
+COUNTERS: dict[str, CounterSpec] = {
+    "users": CounterSpec(User, None, lambda _: True, sa.true()),
+    "pending_resources": CounterSpec(
+        Resource,
+        "ai_processing_status",
+        lambda status: status is not None and status != "complete",
+        Resource.ai_processing_status != "complete",
+    ),
+    "published_lessons": CounterSpec(
+        Lesson,
+        "status",
+        lambda status: status == "published",
+        Lesson.status == "published",
+    ),
+    "unread_notifications": CounterSpec(
+        Notification,
+        "is_read",
+        lambda is_read: is_read is False,
+        Notification.is_read.is_(False),
+    ),
+    "published_posts": CounterSpec(
+        BlogPost,
+        "is_published",
+        lambda published: published is True,
+        BlogPost.is_published.is_(True),
+    ),
+    "draft_posts": CounterSpec(
+        BlogPost,
+        "is_published",
+        lambda published: published is False,
+        BlogPost.is_published.is_(False),
+    ),
+}
+
+
+def _matches(spec: CounterSpec, obj: Any) -> bool:
+    if spec.attribute is None:
+        return True
+    return spec.matches(getattr(obj, spec.attribute))
+
+
+def _add(deltas: dict[str, int], name: str, delta: int) -> None:
+    deltas[name] = deltas.get(name, 0) + delta
+
+
+def _count_deleted(mapper, connection, target) -> None:
+    # Runs before the DELETE, while unloaded attributes can still be read.
+    session = object_session(target)
+    if session is None or not isinstance(session, db.session.session_factory.class_):
+        return
+    deltas = session.info.setdefault(_DELTAS_KEY, {})
+    for name, spec in COUNTERS.items():
+        if isinstance(target, spec.model) and _matches(spec, target):
+            _add(deltas, name, -1)
+
+
+for _model in dict.fromkeys(spec.model for spec in COUNTERS.values()):
+    event.listen(_model, "before_delete", _count_deleted)
+
+
+@event.listens_for(db.session, "after_flush")
+def _apply_counter_deltas(session: Session, flush_context) -> None:
+    deltas = session.info.pop(_DELTAS_KEY, {})
+    for obj in session.new:
+        for name, spec in COUNTERS.items():
+            if isinstance(obj, spec.model) and _matches(spec, obj):
+                _add(deltas, name, 1)
+    for obj in session.dirty:
+        for name, spec in COUNTERS.items():
+            if spec.attribute is None or not isinstance(obj, spec.model):
+                continue
+            history = inspect(obj).attrs[spec.attribute].history
+            if not history.has_changes() or not history.deleted:
+                continue
+            was = spec.matches(history.deleted[0])
+            now = spec.matches(getattr(obj, spec.attribute))
+            if was != now:
+                _add(deltas, name, 1 if now else -1)
+
+    apply_counter_deltas(session.connection(), deltas)
+
+
+def apply_counter_deltas(connection: sa.Connection, deltas: dict[str, int]) -> None:
+    """Add ``deltas`` to the stored counters, in name order to avoid deadlocks."""
+    for name, delta in sorted(deltas.items()):
+        if delta:
+            connection.execute(
+                sa.update(AdminCounter)
+                .where(AdminCounter.name == name)
+                .values(value=AdminCounter.value + delta)
+            )
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _discard_counter_deltas(session: Session, previous_transaction) -> None:
+    session.info.pop(_DELTAS_KEY, None)
+
+
+@event.listens_for(AdminCounter.__table__, "after_create")
+def _create_counter_rows(target, connection, **kw) -> None:
+    connection.execute(
+        sa.insert(AdminCounter), [{"name": name, "value": 0} for name in COUNTERS]
+    )
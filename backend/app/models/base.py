@@ -4,11 +4,13 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column
 
+from ..extensions import db
 
-class Base(DeclarativeBase):
-    """Custom declarative base."""
+# Models inherit from ``db.Model`` so ``db.create_all`` uses their metadata
+# and ``Model.query`` is available.
+Base = db.Model
 
 
 class TimestampMixin:
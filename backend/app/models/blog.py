@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import DDL, ForeignKey, Index, Integer, String, Text, event, inspect
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from ..utils.rendering import excerpt, plain_text, reading_minutes
 from .base import Base, TimestampMixin
 
 if TYPE_CHECKING:
@@ -17,6 +18,10 @@ class BlogPost(TimestampMixin, Base):
     """Marketing content for the public site."""
 
     __tablename__ = "blog_posts"
+    __table_args__ = (
+        Index("ix_blog_posts_published_created", "is_published", "created_at", "id"),
+        Index("ix_blog_posts_updated_at", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -26,9 +31,114 @@ class BlogPost(TimestampMixin, Base):
     author_id: Mapped[int | None] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
-    is_published: Mapped[bool] = mapped_column(default=False)
+    is_published: Mapped[bool] = mapped_column(default=False, active_history=True)
+    excerpt: Mapped[str | None] = mapped_column(String(500))
+    reading_minutes: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
 
     author: Mapped["User | None"] = relationship("User")
 
+    def refresh_summary(self) -> None:
+        """Recompute ``excerpt`` and ``reading_minutes`` from ``content``."""
+        text = plain_text(self.content or "")
+        self.excerpt = excerpt(text)
+        self.reading_minutes = reading_minutes(text)
+
     def __repr__(self) -> str:
         return f"<BlogPost {self.slug}>"
+
+
+@event.listens_for(BlogPost, "before_insert")
+def _summarize_new_post(mapper, connection, target: BlogPost) -> None:
+    target.refresh_summary()
+
+
+@event.listens_for(BlogPost, "before_update")
+def _summarize_post(mapper, connection, target: BlogPost) -> None:
+    if inspect(target).attrs.content.history.has_changes():
+        target.refresh_summary()
+
+
+# Search indexes kept up to date by the database itself. SQLite mirrors the
+# posts into an FTS5 table for words and a trigram table for slug fragments
+# through triggers; PostgreSQL uses a generated tsvector column and a pg_trgm
+# index on ``slug``. ``blog_search`` queries them.
+SEARCH_DDL = {
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE blog_posts_fts USING fts5(
+            title, slug, content,
+            content='blog_posts', content_rowid='id', prefix='2 3'
+        )
+        """,
+        """
+        CREATE VIRTUAL TABLE blog_posts_slug_fts USING fts5(
+            slug, content='blog_posts', content_rowid='id', tokenize='trigram'
+        )
+        """,
+        """
+        CREATE TRIGGER blog_posts_search_insert AFTER INSERT ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(rowid, title, slug, content)
+            VALUES (new.id, new.title, new.slug, new.content);
+            INSERT INTO blog_posts_slug_fts(rowid, slug) VALUES (new.id, new.slug);
+        END
+        """,
+        """
+        CREATE TRIGGER blog_posts_search_delete AFTER DELETE ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, slug, content)
+            VALUES ('delete', old.id, old.title, old.slug, old.content);
+            INSERT INTO blog_posts_slug_fts(blog_posts_slug_fts, rowid, slug)
+            VALUES ('delete', old.id, old.slug);
+        END
+        """,
+        """
+        CREATE TRIGGER blog_posts_search_update
+        AFTER UPDATE OF title, slug, content ON blog_posts BEGIN
+            INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, slug, content)
+            VALUES ('delete', old.id, old.title, old.slug, old.content);
+            INSERT INTO blog_posts_slug_fts(blog_posts_slug_fts, rowid, slug)
+            VALUES ('delete', old.id, old.slug);
+            INSERT INTO blog_posts_fts(rowid, title, slug, content)
+            VALUES (new.id, new.title, new.slug, new.content);
+            INSERT INTO blog_posts_slug_fts(rowid, slug) VALUES (new.id, new.slug);
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        ALTER TABLE blog_posts ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', title), 'A')
+            || setweight(to_tsvector('simple', replace(slug, '-', ' ')), 'B')
+            || setweight(to_tsvector('english', content), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX ix_blog_posts_search_vector ON blog_posts "
+        "USING gin (search_vector)",
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX ix_blog_posts_slug_trgm ON blog_posts "
+        "USING gin (slug gin_trgm_ops)",
+    ],
+}
+SEARCH_DROP_DDL = {
+    "sqlite": [
+        "DROP TABLE IF EXISTS blog_posts_slug_fts",
+        "DROP TABLE IF EXISTS blog_posts_fts",
+    ],
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            BlogPost.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+for _dialect, _statements in SEARCH_DROP_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            BlogPost.__table__,
+            "after_drop",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
@@ -2,10 +2,22 @@
 
 from __future__ import annotations
 
+from collections import Counter, defaultdict
+from datetime import datetime
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    update,
+)
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from .base import Base, TimestampMixin
 
@@ -18,6 +30,9 @@ class FlashcardDeck(TimestampMixin, Base):
     """Deck of flashcards generated from a resource."""
 
     __tablename__ = "flashcard_decks"
+    __table_args__ = (
+        Index("ix_flashcard_decks_public_feed", "is_public", "published_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -26,6 +41,19 @@ class FlashcardDeck(TimestampMixin, Base):
     resource_id: Mapped[int | None] = mapped_column(
         ForeignKey("resources.id", ondelete="SET NULL")
     )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    source_deck_id: Mapped[int | None] = mapped_column(
+        ForeignKey("flashcard_decks.id", ondelete="SET NULL"), index=True
+    )
+    is_public: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="0"
+    )
+    published_at: Mapped[datetime | None] = mapped_column(DateTime)
+    card_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     owner: Mapped["User"] = relationship("User", back_populates="flashcard_decks")
     resource: Mapped["Resource | None"] = relationship(
@@ -59,3 +87,33 @@ class Flashcard(TimestampMixin, Base):
 
     def __repr__(self) -> str:
         return f"<Flashcard {self.id}>"
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_cards(session: Session, flush_context) -> None:
+    # Cards flushed through the unit of work; bulk statements in
+    # ``services.flashcard_store`` adjust the count themselves. Deltas are
+    # summed per deck so a flush touching many cards issues one UPDATE per
+    # distinct delta, and decks deleted in the same flush are skipped.
+    deltas: Counter[int] = Counter()
+    for card in session.new:
+        if isinstance(card, Flashcard):
+            deltas[card.deck_id] += 1
+    deleted_decks = set()
+    for obj in session.deleted:
+        if isinstance(obj, Flashcard):
+            deltas[obj.deck_id] -= 1
+        elif isinstance(obj, FlashcardDeck):
+            deleted_decks.add(obj.id)
+
+    by_delta: defaultdict[int, list[int]] = defaultdict(list)
+    for deck_id, delta in deltas.items():
+        if delta and deck_id is not None and deck_id not in deleted_decks:
+            by_delta[delta].append(deck_id)
+    connection = session.connection()
+    for delta, deck_ids in by_delta.items():
+        connection.execute(
+            update(FlashcardDeck)
+            .where(FlashcardDeck.id.in_(deck_ids))
+            .values(card_count=FlashcardDeck.card_count + delta)
+        )
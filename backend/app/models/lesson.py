@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from ..utils.rendering import content_hash, render_markdown
 from .base import Base, TimestampMixin
 from .category import lesson_categories
 
@@ -20,6 +21,9 @@ class Lesson(TimestampMixin, Base):
     """Lesson generated from resources and curated by experts."""
 
     __tablename__ = "lessons"
+    __table_args__ = (
+        Index("ix_lessons_status_created", "status", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -31,7 +35,11 @@ class Lesson(TimestampMixin, Base):
     resource_id: Mapped[int | None] = mapped_column(
         ForeignKey("resources.id", ondelete="SET NULL")
     )
-    status: Mapped[str] = mapped_column(String(50), default="draft")
+    status: Mapped[str] = mapped_column(
+        String(50), default="draft", active_history=True
+    )
+    rendered_content: Mapped[str | None] = mapped_column(Text)
+    rendered_hash: Mapped[str | None] = mapped_column(String(64))
 
     author: Mapped["User | None"] = relationship("User", back_populates="lessons")
     resource: Mapped["Resource | None"] = relationship("Resource")
@@ -42,5 +50,20 @@ class Lesson(TimestampMixin, Base):
         lazy="selectin",
     )
 
+    def refresh_rendered_content(self) -> bool:
+        """Re-render ``content`` to HTML if it changed since the last render."""
+        digest = content_hash(self.content or "")
+        if digest == self.rendered_hash:
+            return False
+        self.rendered_content = render_markdown(self.content or "")
+        self.rendered_hash = digest
+        return True
+
     def __repr__(self) -> str:
         return f"<Lesson {self.title}>"
+
+
+@event.listens_for(Lesson, "before_insert")
+@event.listens_for(Lesson, "before_update")
+def _render_lesson(mapper, connection, target: Lesson) -> None:
+    target.refresh_rendered_content()
@@ -24,7 +24,9 @@ class Notification(TimestampMixin, Base):
     )
     subject: Mapped[str] = mapped_column(String(255), nullable=False)
     message: Mapped[str] = mapped_column(Text, nullable=False)
-    is_read: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_read: Mapped[bool] = mapped_column(
+        Boolean, default=False, active_history=True
+    )
 
     recipient: Mapped["User"] = relationship("User", back_populates="notifications")
 
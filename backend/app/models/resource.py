@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, Any, List
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -29,7 +29,10 @@ class Resource(TimestampMixin, Base):
     storage_url: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[str | None] = mapped_column(Text)
     text_content: Mapped[str | None] = mapped_column(Text)
-    ai_processing_status: Mapped[str] = mapped_column(String(50), default="pending")
+    ai_processing_status: Mapped[str] = mapped_column(
+        String(50), default="pending", active_history=True
+    )
+    ai_study_pack: Mapped[dict[str, Any] | None] = mapped_column(JSON)
 
     owner: Mapped["User"] = relationship("User", back_populates="resources")
     categories: Mapped[List["Category"]] = relationship(
@@ -0,0 +1,85 @@
+"""Spaced-repetition review history, card memory state and fitted weights."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class CardState(Base):
+    """A user's current memory state and next due time for one flashcard."""
+
+    __tablename__ = "card_states"
+    __table_args__ = (Index("ix_card_states_user_due", "user_id", "due_at"),)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    flashcard_id: Mapped[int] = mapped_column(
+        ForeignKey("flashcards.id", ondelete="CASCADE"), primary_key=True
+    )
+    stability: Mapped[float] = mapped_column(Float, nullable=False)
+    difficulty: Mapped[float] = mapped_column(Float, nullable=False)
+    due_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    last_reviewed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    scheduled_days: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    reps: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    lapses: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CardState user={self.user_id} card={self.flashcard_id}>"
+
+
+class CardReview(Base):
+    """One answer given while studying, kept for scheduling and fitting."""
+
+    __tablename__ = "card_reviews"
+    __table_args__ = (
+        Index(
+            "ix_card_reviews_user_card_time", "user_id", "flashcard_id", "reviewed_at"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    flashcard_id: Mapped[int] = mapped_column(
+        ForeignKey("flashcards.id", ondelete="CASCADE")
+    )
+    rating: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    reviewed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    elapsed_days: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    scheduled_days: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    stability: Mapped[float] = mapped_column(Float, nullable=False)
+    difficulty: Mapped[float] = mapped_column(Float, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CardReview {self.id}>"
+
+
+class ReviewParameters(Base):
+    """Per-user FSRS weights fitted from the user's review history."""
+
+    __tablename__ = "review_parameters"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    weights: Mapped[list[float]] = mapped_column(JSON, nullable=False)
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    log_loss: Mapped[float] = mapped_column(Float, nullable=False)
+    fitted_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ReviewParameters user={self.user_id}>"
@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Boolean, DateTime, Integer, String
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..extensions import bcrypt
@@ -27,6 +27,10 @@ class User(TimestampMixin, Base):
     """Core user entity."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created", "created_at", "id"),
+        Index("ix_users_active_created", "is_active", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     email: Mapped[str] = mapped_column(
@@ -50,10 +54,13 @@ class User(TimestampMixin, Base):
         uselist=False,
         lazy="joined",
     )
+    # Children counted by ``models.admin_counter`` are deleted through the ORM
+    # (``passive_deletes=False``) so the counter hooks see every row.
     resources: Mapped[List["Resource"]] = relationship(
         "Resource",
         back_populates="owner",
         cascade="all, delete-orphan",
+        passive_deletes=False,
     )
     flashcard_decks: Mapped[List["FlashcardDeck"]] = relationship(
         "FlashcardDeck",
@@ -64,11 +71,13 @@ class User(TimestampMixin, Base):
         "Lesson",
         back_populates="author",
         cascade="all, delete-orphan",
+        passive_deletes=False,
     )
     notifications: Mapped[List["Notification"]] = relationship(
         "Notification",
         back_populates="recipient",
         cascade="all, delete-orphan",
+        passive_deletes=False,
     )
 
     def set_password(self, password: str) -> None:
@@ -97,3 +106,17 @@ class User(TimestampMixin, Base):
 
     def get_id(self) -> str:
         return str(self.id)
+
+
+# Prefix searches in the admin user directory match ``lower(column) LIKE 'x%'``;
+# ``text_pattern_ops`` lets PostgreSQL use these indexes for such patterns.
+Index(
+    "ix_users_email_lower",
+    func.lower(User.email).label("email_lower"),
+    postgresql_ops={"email_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_users_username_lower",
+    func.lower(User.username).label("username_lower"),
+    postgresql_ops={"username_lower": "text_pattern_ops"},
+)
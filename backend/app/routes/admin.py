@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 import sqlalchemy as sa
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import current_user, jwt_required
 from sqlalchemy.orm import selectinload
 
 from ..extensions import db
-from ..models import FAQ, BlogPost, Lesson, Notification, Resource, Role, User
+from ..models import FAQ, BlogPost, Notification, Resource, Role, User
 from ..schemas import BlogPostSchema, ResourceSchema, UserSchema
+from ..services.blog_search import blog_search_service
+from ..services.bulk_admin import BulkAdminError, bulk_admin_service
+from ..services.counter_service import counter_service
+from ..services.gemini_service import gemini_service
+from ..services.user_directory import user_directory_service
+from ..utils.http_cache import PUBLIC_BLOG, PUBLIC_FAQ, invalidate_public
+from ..utils.pagination import InvalidCursorError, parse_limit
 from ..utils.security import roles_accepted, roles_required
 
 admin_bp = Blueprint("admin_api", __name__)
@@ -30,14 +39,54 @@ VALID_RESOURCE_STATUSES: set[str] = {
 @jwt_required()
 @roles_required("admin")
 def list_users():
-    """Return all users."""
-    stmt = (
-        sa.select(User)
-        .order_by(User.created_at.desc())
-        .options(selectinload(User.roles))
-    )
-    users = db.session.scalars(stmt).all()
-    return user_schema.jsonify(users, many=True), 200
+    """Return a page of users, newest first.
+
+    Accepts ``role``, ``active`` (``true``/``false``) and ``q`` (email or
+    username prefix) filters, ``limit`` and the ``cursor`` returned as
+    ``next_cursor`` by the previous page.
+    """
+    try:
+        filters = _user_filters()
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            default=current_app.config["ADMIN_USERS_PAGE_SIZE"],
+            maximum=current_app.config["ADMIN_USERS_MAX_PAGE_SIZE"],
+        )
+    except ValueError:
+        return jsonify({"message": "limit must be an integer"}), 400
+    try:
+        page = user_directory_service.page(
+            **filters, cursor=request.args.get("cursor"), limit=limit
+        )
+    except InvalidCursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(page), 200
+
+
+@admin_bp.get("/users/count")
+@jwt_required()
+@roles_required("admin")
+def count_users():
+    """Return the number of users matching the ``list_users`` filters."""
+    try:
+        filters = _user_filters()
+    except ValueError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify({"count": user_directory_service.count(**filters)}), 200
+
+
+def _user_filters() -> dict[str, Any]:
+    active = request.args.get("active")
+    if active not in (None, "", "true", "false"):
+        raise ValueError("active must be true or false")
+    return {
+        "role": request.args.get("role") or None,
+        "active": None if not active else active == "true",
+        "prefix": request.args.get("q") or None,
+    }
 
 
 @admin_bp.post("/users/role")
@@ -108,6 +157,54 @@ def update_user(user_id: int):
     return user_schema.jsonify(user), 200
 
 
+@admin_bp.post("/users/bulk")
+@jwt_required()
+@roles_required("admin")
+def bulk_update_users():
+    """Activate or suspend every user selected by ``ids`` or ``filter``.
+
+    ``filter`` accepts the ``list_users`` fields ``role``, ``active`` and
+    ``q``. With ``dry_run`` the affected count is reported without writing.
+    """
+    payload = request.get_json() or {}
+    if not isinstance(payload.get("is_active"), bool):
+        return jsonify({"message": "is_active must be true or false"}), 400
+    try:
+        result = bulk_admin_service.set_users_active(
+            payload["is_active"], **_bulk_selection(payload)
+        )
+    except BulkAdminError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(result), 200
+
+
+@admin_bp.post("/users/bulk/roles")
+@jwt_required()
+@roles_required("admin")
+def bulk_assign_role():
+    """Grant a role to every user selected by ``ids`` or ``filter``."""
+    payload = request.get_json() or {}
+    role_name = payload.get("role")
+    if not role_name:
+        return jsonify({"message": "role is required"}), 400
+    role = db.session.scalar(sa.select(Role).where(Role.name == str(role_name)))
+    if not role:
+        return jsonify({"message": "Role not found"}), 404
+    try:
+        result = bulk_admin_service.assign_role(role, **_bulk_selection(payload))
+    except BulkAdminError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(result), 200
+
+
+def _bulk_selection(payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "ids": payload.get("ids"),
+        "filters": payload.get("filter"),
+        "dry_run": bool(payload.get("dry_run")),
+    }
+
+
 @admin_bp.get("/resources")
 @jwt_required()
 @roles_required("admin")
@@ -161,6 +258,51 @@ def update_resource(resource_id: int):
     return resource_schema.jsonify(resource), 200
 
 
+@admin_bp.post("/resources/bulk")
+@jwt_required()
+@roles_required("admin")
+def bulk_update_resources():
+    """Set the moderation status of every resource selected by ids or filter.
+
+    ``filter`` accepts ``status`` and ``owner_id``.
+    """
+    payload = request.get_json() or {}
+    status = str(payload.get("ai_processing_status"))
+    if status not in VALID_RESOURCE_STATUSES:
+        return (
+            jsonify(
+                {
+                    "message": "Invalid status",
+                    "allowed": sorted(VALID_RESOURCE_STATUSES),
+                }
+            ),
+            400,
+        )
+    try:
+        result = bulk_admin_service.set_resource_status(
+            status, **_bulk_selection(payload)
+        )
+    except BulkAdminError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(result), 200
+
+
+@admin_bp.post("/lessons/bulk/publish")
+@jwt_required()
+@roles_required("admin")
+def bulk_publish_lessons():
+    """Publish every lesson selected by ``ids`` or ``filter``.
+
+    ``filter`` accepts ``status``, ``author_id`` and ``resource_id``.
+    """
+    payload = request.get_json() or {}
+    try:
+        result = bulk_admin_service.publish_lessons(**_bulk_selection(payload))
+    except BulkAdminError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(result), 200
+
+
 @admin_bp.get("/blog-posts")
 @jwt_required()
 @roles_accepted("admin", "marketing")
@@ -169,26 +311,24 @@ def list_blog_posts():
 
     status = request.args.get("status")
     search = request.args.get("q")
+    published = {"published": True, "draft": False}.get(status or "")
+
+    if search:
+        posts = blog_search_service.search(
+            search,
+            published=published,
+            limit=current_app.config["BLOG_SEARCH_MAX_PAGE_SIZE"],
+            options=(selectinload(BlogPost.author),),
+        )
+        return blog_post_schema.jsonify(posts, many=True), 200
 
     stmt = (
         sa.select(BlogPost)
         .options(selectinload(BlogPost.author))
         .order_by(BlogPost.created_at.desc())
     )
-
-    if status == "published":
-        stmt = stmt.where(BlogPost.is_published.is_(True))
-    elif status == "draft":
-        stmt = stmt.where(BlogPost.is_published.is_(False))
-
-    if search:
-        pattern = f"%{search.lower()}%"
-        stmt = stmt.where(
-            sa.or_(
-                sa.func.lower(BlogPost.title).like(pattern),
-                sa.func.lower(BlogPost.slug).like(pattern),
-            )
-        )
+    if published is not None:
+        stmt = stmt.where(BlogPost.is_published.is_(published))
 
     posts = db.session.scalars(stmt).all()
     return blog_post_schema.jsonify(posts, many=True), 200
@@ -228,6 +368,7 @@ def create_blog_post():
 
     db.session.add(post)
     db.session.commit()
+    invalidate_public(PUBLIC_BLOG)
     return blog_post_schema.jsonify(post), 201
 
 
@@ -266,6 +407,7 @@ def update_blog_post(slug: str):
         post.author = current_user
 
     db.session.commit()
+    invalidate_public(PUBLIC_BLOG)
     return blog_post_schema.jsonify(post), 200
 
 
@@ -289,6 +431,7 @@ def toggle_blog_post_publish(slug: str):
         post.author = current_user
 
     db.session.commit()
+    invalidate_public(PUBLIC_BLOG)
     return blog_post_schema.jsonify(post), 200
 
 
@@ -304,6 +447,7 @@ def delete_blog_post(slug: str):
 
     db.session.delete(post)
     db.session.commit()
+    invalidate_public(PUBLIC_BLOG)
     return jsonify({"message": "Blog post removed"}), 200
 
 
@@ -316,6 +460,7 @@ def create_faq():
     faq = FAQ(question=payload.get("question"), answer=payload.get("answer"))
     db.session.add(faq)
     db.session.commit()
+    invalidate_public(PUBLIC_FAQ)
     return jsonify({"message": "FAQ created", "id": faq.id}), 201
 
 
@@ -324,38 +469,14 @@ def create_faq():
 @roles_required("admin")
 def admin_summary():
     """Return aggregate metrics for the admin dashboard."""
-    user_count = db.session.scalar(sa.select(sa.func.count()).select_from(User)) or 0
-    resource_pending = (
-        db.session.scalar(
-            sa.select(sa.func.count())
-            .select_from(Resource)
-            .where(Resource.ai_processing_status != "complete")
-        )
-        or 0
-    )
-    published_lessons = (
-        db.session.scalar(
-            sa.select(sa.func.count())
-            .select_from(Lesson)
-            .where(Lesson.status == "published")
-        )
-        or 0
-    )
-    unread_notifications = (
-        db.session.scalar(
-            sa.select(sa.func.count())
-            .select_from(Notification)
-            .where(Notification.is_read.is_(False))
-        )
-        or 0
-    )
+    counters = counter_service.values()
     return (
         jsonify(
             {
-                "user_count": user_count,
-                "resource_pending": resource_pending,
-                "published_lessons": published_lessons,
-                "unread_notifications": unread_notifications,
+                "user_count": counters["users"],
+                "resource_pending": counters["pending_resources"],
+                "published_lessons": counters["published_lessons"],
+                "unread_notifications": counters["unread_notifications"],
             }
         ),
         200,
@@ -368,24 +489,7 @@ def admin_summary():
 def marketing_summary():
     """Return metrics tailored for marketing administrators."""
 
-    published_posts = (
-        db.session.scalar(
-            sa.select(sa.func.count())
-            .select_from(BlogPost)
-            .where(BlogPost.is_published.is_(True))
-        )
-        or 0
-    )
-
-    draft_posts = (
-        db.session.scalar(
-            sa.select(sa.func.count())
-            .select_from(BlogPost)
-            .where(BlogPost.is_published.is_(False))
-        )
-        or 0
-    )
-
+    counters = counter_service.values()
     latest_stmt = (
         sa.select(BlogPost)
         .options(selectinload(BlogPost.author))
@@ -397,8 +501,8 @@ def marketing_summary():
     return (
         jsonify(
             {
-                "published_posts": published_posts,
-                "draft_posts": draft_posts,
+                "published_posts": counters["published_posts"],
+                "draft_posts": counters["draft_posts"],
                 "recent_posts": [
                     {
                         "title": post.title,
@@ -425,6 +529,14 @@ def marketing_summary():
     )
 
 
+@admin_bp.get("/ai/scheduler")
+@jwt_required()
+@roles_required("admin")
+def ai_scheduler_metrics():
+    """Return queue depth and wait-time metrics for scheduled AI calls."""
+    return jsonify(gemini_service.scheduler.snapshot()), 200
+
+
 @admin_bp.get("/notifications")
 @jwt_required()
 @roles_required("admin")
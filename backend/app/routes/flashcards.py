@@ -2,15 +2,39 @@
 
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request
+import json
+from typing import Any
+
+import sqlalchemy as sa
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 from flask_jwt_extended import current_user, jwt_required
 
+from ..extensions import db
 from ..models import FlashcardDeck, Resource
 from ..schemas import FlashcardDeckSchema
-from ..services.flashcard_service import FlashcardServiceError, flashcard_service
+from ..services.deck_package import (
+    PACKAGE_MIMETYPE,
+    DeckPackageError,
+    export_deck,
+    import_deck,
+)
+from ..services.flashcard_service import (
+    DeckVersionConflictError,
+    FlashcardServiceError,
+    flashcard_service,
+)
+from ..utils.pagination import InvalidCursorError, parse_limit
 
 flashcard_bp = Blueprint("flashcards", __name__)
 deck_schema = FlashcardDeckSchema()
+deck_summary_schema = FlashcardDeckSchema(exclude=("flashcards",))
 
 
 @flashcard_bp.post("/generate")
@@ -23,31 +47,288 @@ def generate_flashcards():
         return jsonify({"message": "resource_id is required"}), 400
     resource = Resource.query.get_or_404(resource_id)
     try:
-        deck = flashcard_service.generate_deck(owner=current_user, resource=resource)
+        deck = flashcard_service.generate_deck(
+            owner=current_user,
+            resource=resource,
+            use_study_pack=payload.get("mode") == "combined",
+            provider=payload.get("provider"),
+        )
     except FlashcardServiceError as exc:
         return jsonify({"message": str(exc)}), 400
     return deck_schema.jsonify(deck), 201
 
 
+@flashcard_bp.post("/generate/batch")
+@jwt_required()
+def generate_flashcards_batch():
+    """Generate a deck for each listed resource, packing several per AI request."""
+    payload = request.get_json() or {}
+    resource_ids = payload.get("resource_ids")
+    if (
+        not isinstance(resource_ids, list)
+        or not resource_ids
+        or not all(
+            isinstance(resource_id, int) and not isinstance(resource_id, bool)
+            for resource_id in resource_ids
+        )
+    ):
+        return (
+            jsonify({"message": "resource_ids must be a non-empty list of integers"}),
+            400,
+        )
+    maximum = current_app.config.get("FLASHCARD_BATCH_MAX", 25)
+    if len(resource_ids) > maximum:
+        return (
+            jsonify({"message": f"At most {maximum} resources can be batched"}),
+            400,
+        )
+    resources = db.session.scalars(
+        sa.select(Resource).where(Resource.id.in_(resource_ids))
+    ).all()
+    found = {resource.id for resource in resources}
+    missing = [resource_id for resource_id in resource_ids if resource_id not in found]
+    if missing:
+        return jsonify({"message": "Resources not found", "missing": missing}), 404
+    try:
+        results = flashcard_service.generate_decks_batch(
+            owner=current_user, resources=resources, provider=payload.get("provider")
+        )
+    except FlashcardServiceError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return (
+        jsonify(
+            {
+                "results": [
+                    {
+                        "resource_id": result.resource.id,
+                        "deck": deck_schema.dump(result.deck) if result.deck else None,
+                        "error": result.error,
+                    }
+                    for result in results
+                ]
+            }
+        ),
+        200,
+    )
+
+
+@flashcard_bp.post("/generate/stream")
+@jwt_required()
+def stream_flashcards():
+    """Generate flashcards, pushing each card to the client as a Server-Sent Event.
+
+    Emits ``card`` events while Gemini is still producing output, then a single
+    ``deck`` event with the persisted deck, or an ``error`` event on failure.
+    """
+    payload = request.get_json() or {}
+    resource_id = payload.get("resource_id")
+    if not resource_id:
+        return jsonify({"message": "resource_id is required"}), 400
+    resource = Resource.query.get_or_404(resource_id)
+    try:
+        events = flashcard_service.stream_deck(
+            owner=current_user, resource=resource, provider=payload.get("provider")
+        )
+    except FlashcardServiceError as exc:
+        return jsonify({"message": str(exc)}), 400
+
+    def generate():
+        try:
+            for kind, data in events:
+                if kind == "card":
+                    card = {"question": data.question, "answer": data.answer}
+                    yield _sse("card", card)
+                else:
+                    yield _sse(kind, deck_schema.dump(data))
+        except FlashcardServiceError as exc:
+            yield _sse("error", {"message": str(exc)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @flashcard_bp.get("/<int:deck_id>")
 @jwt_required()
 def get_deck(deck_id: int):
-    """Retrieve a specific flashcard deck."""
+    """Retrieve a deck's metadata; its cards are served by ``/cards``."""
+    deck = FlashcardDeck.query.get_or_404(deck_id)
+    if not flashcard_service.can_view(current_user, deck):
+        return jsonify({"message": "Not authorized"}), 403
+    return jsonify(deck_summary_schema.dump(deck)), 200
+
+
+@flashcard_bp.get("/<int:deck_id>/cards")
+@jwt_required()
+def list_deck_cards(deck_id: int):
+    """Return a page of a deck's cards.
+
+    Accepts ``limit`` and the ``cursor`` returned as ``next_cursor`` by the
+    previous page.
+    """
     deck = FlashcardDeck.query.get_or_404(deck_id)
-    if deck.owner_id != current_user.id and not current_user.has_role("admin"):
+    if not flashcard_service.can_view(current_user, deck):
         return jsonify({"message": "Not authorized"}), 403
-    return deck_schema.jsonify(deck), 200
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            default=current_app.config["DECK_CARDS_PAGE_SIZE"],
+            maximum=current_app.config["DECK_CARDS_MAX_PAGE_SIZE"],
+        )
+    except ValueError:
+        return jsonify({"message": "limit must be an integer"}), 400
+    try:
+        page = flashcard_service.card_page(
+            deck, cursor=request.args.get("cursor"), limit=limit
+        )
+    except InvalidCursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(page), 200
+
+
+@flashcard_bp.get("/<int:deck_id>/cards/stream")
+@jwt_required()
+def stream_deck_cards(deck_id: int):
+    """Stream every card of a deck as newline-delimited JSON."""
+    deck = FlashcardDeck.query.get_or_404(deck_id)
+    if not flashcard_service.can_view(current_user, deck):
+        return jsonify({"message": "Not authorized"}), 403
+
+    def generate():
+        for card in flashcard_service.iter_cards(deck):
+            yield json.dumps(card) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"},
+    )
 
 
 @flashcard_bp.put("/<int:deck_id>")
 @jwt_required()
 def update_deck(deck_id: int):
-    """Replace flashcards in a deck."""
+    """Update a deck's flashcards to match the submitted list.
+
+    Cards with an ``id`` are kept (and edited if changed), cards without one
+    are added and omitted cards are removed. ``version`` must match the
+    deck's current version when supplied; a stale version returns 409.
+    Returns the deck's metadata and new version; cards are served by
+    ``/cards``.
+    """
     deck = FlashcardDeck.query.get_or_404(deck_id)
-    if deck.owner_id != current_user.id and not current_user.has_role("admin"):
+    if not flashcard_service.can_edit(current_user, deck):
         return jsonify({"message": "Not authorized"}), 403
-    cards = request.json.get("cards")
-    if not cards:
+    payload = request.get_json() or {}
+    cards = payload.get("cards")
+    if not isinstance(cards, list) or not cards:
         return jsonify({"message": "cards are required"}), 400
-    deck = flashcard_service.update_cards(deck=deck, cards=cards)
-    return deck_schema.jsonify(deck), 200
+    version = payload.get("version")
+    if version is not None and not isinstance(version, int):
+        return jsonify({"message": "version must be an integer"}), 400
+    try:
+        deck = flashcard_service.update_cards(
+            deck=deck, cards=cards, expected_version=version
+        )
+    except DeckVersionConflictError as exc:
+        current = db.session.get(FlashcardDeck, deck_id)
+        return jsonify({"message": str(exc), "version": current.version}), 409
+    except FlashcardServiceError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(deck_summary_schema.dump(deck)), 200
+
+
+@flashcard_bp.get("/<int:deck_id>/export")
+@jwt_required()
+def export_deck_package(deck_id: int):
+    """Download a deck as a gzip-compressed NDJSON package."""
+    deck = FlashcardDeck.query.get_or_404(deck_id)
+    if not flashcard_service.can_view(current_user, deck):
+        return jsonify({"message": "Not authorized"}), 403
+    return Response(
+        stream_with_context(export_deck(deck)),
+        mimetype=PACKAGE_MIMETYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="deck-{deck.id}.ndjson.gz"'
+        },
+    )
+
+
+@flashcard_bp.post("/import")
+@jwt_required()
+def import_deck_package():
+    """Import a deck package as a new deck, or into ``deck_id`` when given.
+
+    Cards already present in the target deck are skipped.
+    """
+    uploaded_file = request.files.get("file")
+    if not uploaded_file:
+        return jsonify({"message": "file is required"}), 400
+    deck = None
+    deck_id = request.form.get("deck_id")
+    if deck_id:
+        if not deck_id.isdigit():
+            return jsonify({"message": "deck_id must be an integer"}), 400
+        deck = FlashcardDeck.query.get_or_404(int(deck_id))
+        if not flashcard_service.can_edit(current_user, deck):
+            return jsonify({"message": "Not authorized"}), 403
+    try:
+        result = import_deck(owner=current_user, stream=uploaded_file.stream, deck=deck)
+    except DeckPackageError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return (
+        jsonify(
+            {
+                **deck_summary_schema.dump(result.deck),
+                "imported": result.imported,
+                "duplicates": result.duplicates,
+            }
+        ),
+        201 if deck is None else 200,
+    )
+
+
+@flashcard_bp.post("/<int:deck_id>/clone")
+@jwt_required()
+def clone_deck(deck_id: int):
+    """Copy a deck and its cards into the current user's library."""
+    deck = FlashcardDeck.query.get_or_404(deck_id)
+    if not flashcard_service.can_view(current_user, deck):
+        return jsonify({"message": "Not authorized"}), 403
+    payload = request.get_json(silent=True) or {}
+    try:
+        clone, copied = flashcard_service.clone_deck(
+            owner=current_user, deck=deck, title=payload.get("title")
+        )
+    except FlashcardServiceError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify({**deck_summary_schema.dump(clone), "card_count": copied}), 201
+
+
+@flashcard_bp.post("/<int:deck_id>/publish")
+@jwt_required()
+def publish_deck(deck_id: int):
+    """List a deck in the public feed."""
+    return _set_public(deck_id, True)
+
+
+@flashcard_bp.post("/<int:deck_id>/unpublish")
+@jwt_required()
+def unpublish_deck(deck_id: int):
+    """Remove a deck from the public feed."""
+    return _set_public(deck_id, False)
+
+
+def _set_public(deck_id: int, is_public: bool):
+    deck = FlashcardDeck.query.get_or_404(deck_id)
+    if not flashcard_service.can_edit(current_user, deck):
+        return jsonify({"message": "Not authorized"}), 403
+    deck = flashcard_service.set_public(deck=deck, is_public=is_public)
+    return jsonify(deck_summary_schema.dump(deck)), 200
+
+
+def _sse(event: str, data: Any) -> str:
+    """Format a Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
@@ -6,29 +6,51 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import current_user, jwt_required
 
 from ..models import Lesson, Resource
-from ..schemas import LessonSchema
+from ..schemas import FlashcardDeckSchema, LessonSchema
+from ..services.ai_registry import ai_providers
 from ..services.lesson_service import LessonServiceError, lesson_service
 from ..utils.security import roles_accepted
 
 lesson_bp = Blueprint("lessons", __name__)
 lesson_schema = LessonSchema()
+deck_schema = FlashcardDeckSchema()
 
 
 @lesson_bp.post("/generate")
 @jwt_required()
 @roles_accepted("teacher", "expert", "admin")
 def generate_lesson():
-    """Generate a lesson for a resource."""
+    """Generate a lesson for a resource.
+
+    With ``include_deck`` a flashcard deck is created from the same AI response,
+    so the combined workflow costs a single Gemini call, and the lesson and
+    deck are saved together or not at all.
+    """
     payload = request.get_json() or {}
     resource_id = payload.get("resource_id")
     if not resource_id:
         return jsonify({"message": "resource_id is required"}), 400
+    provider = payload.get("provider")
+    if provider and provider not in ai_providers.names:
+        return (
+            jsonify({"message": "Unknown AI provider", "allowed": ai_providers.names}),
+            400,
+        )
     resource = Resource.query.get_or_404(resource_id)
     try:
-        lesson = lesson_service.generate_lesson(author=current_user, resource=resource)
+        if not payload.get("include_deck"):
+            lesson = lesson_service.generate_lesson(
+                author=current_user, resource=resource, provider=provider
+            )
+            return lesson_schema.jsonify(lesson), 201
+        lesson, deck = lesson_service.generate_lesson_with_deck(
+            author=current_user, resource=resource, provider=provider
+        )
     except LessonServiceError as exc:
         return jsonify({"message": str(exc)}), 400
-    return lesson_schema.jsonify(lesson), 201
+    data = lesson_schema.dump(lesson)
+    data["deck"] = deck_schema.dump(deck)
+    return jsonify(data), 201
 
 
 @lesson_bp.put("/<int:lesson_id>/publish")
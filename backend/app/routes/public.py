@@ -1,65 +1,150 @@
-"""Public content endpoints."""
+"""Public content endpoints.
+
+Responses are cached per namespace and revalidated with ETags; writes to
+the underlying content call ``invalidate_public`` for the namespace.
+"""
 
 from __future__ import annotations
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify, request
 
-from ..models import FAQ, BlogPost, FlashcardDeck, Lesson
-from ..schemas import FlashcardDeckSchema, LessonSchema
+from ..models import FAQ
+from ..services.blog_search import blog_search_service
+from ..services.blog_service import blog_service
+from ..services.flashcard_service import flashcard_service
+from ..services.lesson_service import lesson_service
+from ..utils.http_cache import (
+    PUBLIC_BLOG,
+    PUBLIC_DECKS,
+    PUBLIC_FAQ,
+    PUBLIC_LESSONS,
+    cached_response,
+)
+from ..utils.pagination import InvalidCursorError, parse_limit
 
 public_bp = Blueprint("public", __name__)
-deck_schema = FlashcardDeckSchema()
-lesson_schema = LessonSchema()
 
 
 @public_bp.get("/lessons")
+@cached_response(PUBLIC_LESSONS)
 def list_public_lessons():
-    """Return published lessons."""
-    lessons = (
-        Lesson.query.filter_by(status="published")
-        .order_by(Lesson.created_at.desc())
-        .all()
-    )
-    return lesson_schema.jsonify(lessons, many=True), 200
+    """Return summaries of published lessons, newest first.
+
+    Accepts repeated ``category`` filters, ``limit`` and the ``cursor``
+    returned as ``next_cursor`` by the previous page.
+    """
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            default=current_app.config["LESSON_CATALOG_PAGE_SIZE"],
+            maximum=current_app.config["LESSON_CATALOG_MAX_PAGE_SIZE"],
+        )
+    except ValueError:
+        return jsonify({"message": "limit must be an integer"}), 400
+    try:
+        page = lesson_service.catalog(
+            categories=request.args.getlist("category"),
+            cursor=request.args.get("cursor"),
+            limit=limit,
+        )
+    except InvalidCursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(page), 200
 
 
 @public_bp.get("/flashcards")
+@cached_response(PUBLIC_DECKS)
 def list_public_decks():
-    """Return flashcard decks flagged as public."""
-    decks = (
-        FlashcardDeck.query.order_by(FlashcardDeck.created_at.desc()).limit(20).all()
-    )
-    return deck_schema.jsonify(decks, many=True), 200
+    """Return summaries of decks flagged as public, newest first.
+
+    Accepts ``limit`` and the ``cursor`` returned as ``next_cursor`` by the
+    previous page.
+    """
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            default=current_app.config["PUBLIC_FEED_PAGE_SIZE"],
+            maximum=current_app.config["PUBLIC_FEED_MAX_PAGE_SIZE"],
+        )
+    except ValueError:
+        return jsonify({"message": "limit must be an integer"}), 400
+    try:
+        page = flashcard_service.public_feed(
+            cursor=request.args.get("cursor"), limit=limit
+        )
+    except InvalidCursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(page), 200
 
 
 @public_bp.get("/blog")
+@cached_response(PUBLIC_BLOG)
 def list_posts():
-    """Return published blog posts."""
-    posts = (
-        BlogPost.query.filter_by(is_published=True)
-        .order_by(BlogPost.created_at.desc())
-        .with_entities(
-            BlogPost.title, BlogPost.slug, BlogPost.content, BlogPost.hero_image_url
+    """Return summaries of published blog posts, newest first.
+
+    Accepts ``limit`` and the ``cursor`` returned as ``next_cursor`` by the
+    previous page. Full posts are served by ``/blog/<slug>``.
+    """
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            default=current_app.config["BLOG_FEED_PAGE_SIZE"],
+            maximum=current_app.config["BLOG_FEED_MAX_PAGE_SIZE"],
         )
-        .all()
-    )
+    except ValueError:
+        return jsonify({"message": "limit must be an integer"}), 400
+    try:
+        page = blog_service.feed(cursor=request.args.get("cursor"), limit=limit)
+    except InvalidCursorError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return jsonify(page), 200
+
+
+@public_bp.get("/blog/search")
+@cached_response(PUBLIC_BLOG)
+def search_posts():
+    """Return published blog posts matching ``q``, best match first."""
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"message": "q is required"}), 400
+    try:
+        limit = parse_limit(
+            request.args.get("limit"),
+            default=current_app.config["BLOG_SEARCH_PAGE_SIZE"],
+            maximum=current_app.config["BLOG_SEARCH_MAX_PAGE_SIZE"],
+        )
+    except ValueError:
+        return jsonify({"message": "limit must be an integer"}), 400
+    posts = blog_search_service.search(query, published=True, limit=limit)
     return (
         jsonify(
             [
                 {
-                    "title": title,
-                    "slug": slug,
-                    "content": content,
-                    "hero_image_url": hero_image_url,
+                    "title": post.title,
+                    "slug": post.slug,
+                    "excerpt": post.excerpt,
+                    "reading_minutes": post.reading_minutes,
+                    "hero_image_url": post.hero_image_url,
                 }
-                for title, slug, content, hero_image_url in posts
+                for post in posts
             ]
         ),
         200,
     )
 
 
+@public_bp.get("/blog/<string:slug>")
+@cached_response(PUBLIC_BLOG)
+def get_post(slug: str):
+    """Return a published blog post with its full content."""
+    post = blog_service.published_post(slug)
+    if post is None:
+        return jsonify({"message": "Blog post not found"}), 404
+    return jsonify(post), 200
+
+
 @public_bp.get("/faq")
+@cached_response(PUBLIC_FAQ)
 def list_faq():
     """Return active FAQs."""
     faqs = FAQ.query.filter_by(is_active=True).order_by(FAQ.created_at.asc()).all()
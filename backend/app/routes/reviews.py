@@ -0,0 +1,54 @@
+"""Spaced-repetition review endpoints."""
+
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import current_user, jwt_required
+
+from ..services.review_service import ReviewServiceError, review_service
+
+review_bp = Blueprint("reviews", __name__)
+
+MAX_DUE_LIMIT = 200
+
+
+@review_bp.get("/due")
+@jwt_required()
+def due_cards():
+    """Return the cards the current user should study next."""
+    limit = request.args.get("limit", default=20, type=int)
+    limit = max(1, min(limit, MAX_DUE_LIMIT))
+    cards = review_service.due_cards(current_user, limit=limit)
+    return jsonify({"cards": cards}), 200
+
+
+@review_bp.post("")
+@jwt_required()
+def submit_reviews():
+    """Record a batch of review answers and return the updated schedule."""
+    payload = request.get_json() or {}
+    reviews = payload.get("reviews")
+    if not isinstance(reviews, list):
+        return jsonify({"message": "reviews must be a list"}), 400
+    try:
+        states = review_service.submit_reviews(current_user, reviews)
+    except ReviewServiceError as exc:
+        return jsonify({"message": str(exc)}), 400
+    return (
+        jsonify(
+            {
+                "cards": [
+                    {
+                        "flashcard_id": state.flashcard_id,
+                        "due_at": state.due_at.isoformat(),
+                        "stability": round(state.stability, 4),
+                        "difficulty": round(state.difficulty, 4),
+                        "reps": state.reps,
+                        "lapses": state.lapses,
+                    }
+                    for state in states
+                ]
+            }
+        ),
+        200,
+    )
@@ -22,7 +22,7 @@ class ResourceSchema(ma.SQLAlchemyAutoSchema):
         sqla_session = db.session
         load_instance = True
         include_fk = True
-        exclude = ("text_content",)
+        exclude = ("text_content", "ai_study_pack")
 
     def dump(self, obj, *, many: bool | None = None):  # type: ignore[override]
         payload = super().dump(obj, many=many)
@@ -16,7 +16,6 @@ from ..models import (
     FAQ,
     BlogPost,
     Category,
-    Flashcard,
     FlashcardDeck,
     Lesson,
     Notification,
@@ -25,6 +24,7 @@ from ..models import (
     Role,
     User,
 )
+from ..services.flashcard_store import insert_deck
 
 
 @click.command("seed")
@@ -207,14 +207,6 @@ def _ensure_flashcard_deck(*, owner: User, resource: Resource) -> FlashcardDeck:
     if deck:
         return deck
 
-    deck = FlashcardDeck(
-        title="AI Fundamentals Deck",
-        description="Starter deck illustrating how Flashy structures AI core concepts.",
-        owner=owner,
-        resource=resource,
-    )
-    db.session.add(deck)
-
     flashcards = [
         {
             "question": "What is the primary goal of active recall?",
@@ -234,13 +226,13 @@ def _ensure_flashcard_deck(*, owner: User, resource: Resource) -> FlashcardDeck:
         },
     ]
 
-    for data in flashcards:
-        db.session.add(
-            Flashcard(question=data["question"], answer=data["answer"], deck=deck)
-        )
-
-    db.session.flush()
-    return deck
+    return insert_deck(
+        title="AI Fundamentals Deck",
+        description="Starter deck illustrating how Flashy structures AI core concepts.",
+        owner_id=owner.id,
+        resource_id=resource.id,
+        cards=flashcards,
+    )
 
 
 def _ensure_lesson(
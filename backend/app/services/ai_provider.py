@@ -0,0 +1,234 @@
+"""Provider-agnostic interface for AI flashcard and lesson generation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Mapping, Protocol
+
+from flask import current_app
+
+from ..models import Resource
+from .prompt_compactor import compact_text
+
+
+@dataclass
+class FlashcardItem:
+    """Structured flashcard output."""
+
+    question: str
+    answer: str
+
+
+@dataclass
+class FlashcardPayload:
+    """AI response for flashcards and deck metadata."""
+
+    cards: List[FlashcardItem]
+    summary: str
+    source: str = ""
+
+
+@dataclass
+class StudyPackPayload:
+    """Combined AI response backing both decks and lessons."""
+
+    cards: List[FlashcardItem]
+    summary: str
+    lesson: str
+    source: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        return {
+            "flashcards": [
+                {"question": card.question, "answer": card.answer}
+                for card in self.cards
+            ],
+            "summary": self.summary,
+            "lesson": self.lesson,
+            "source": self.source,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "StudyPackPayload":
+        """Rebuild a payload from :meth:`to_dict` output."""
+        cards = [card for card in map(parse_card, data["flashcards"]) if card]
+        return cls(
+            cards=cards,
+            summary=data["summary"],
+            lesson=data["lesson"],
+            source=data.get("source", ""),
+        )
+
+
+class AIProviderError(Exception):
+    """Raised when an AI provider cannot produce a result."""
+
+
+class AIProviderUnavailableError(AIProviderError):
+    """Raised when a provider is temporarily unavailable and may be bypassed."""
+
+
+class AIProvider(Protocol):
+    """Operations every AI generation backend implements."""
+
+    name: str
+
+    def chunk_resource(
+        self, resource: Resource, *, chunk_size: int = 800
+    ) -> list[str]: ...
+
+    def generate_flashcards(self, chunks: Iterable[str]) -> FlashcardPayload: ...
+
+    def generate_study_pack(self, chunks: Iterable[str]) -> StudyPackPayload: ...
+
+    def generate_flashcard_batch(
+        self, documents: Mapping[str, Iterable[str]]
+    ) -> dict[str, FlashcardPayload | AIProviderError]: ...
+
+    def stream_flashcards(
+        self, chunks: Iterable[str]
+    ) -> Iterator[FlashcardItem | FlashcardPayload]: ...
+
+
+class FallbackProvider:
+    """Use ``primary`` and switch to ``fallback`` while it is unavailable."""
+
+    def __init__(self, primary: AIProvider, fallback: AIProvider) -> None:
+        self.name = "auto"
+        self._primary = primary
+        self._fallback = fallback
+
+    def chunk_resource(self, resource: Resource, *, chunk_size: int = 800) -> list[str]:
+        return self._primary.chunk_resource(resource, chunk_size=chunk_size)
+
+    def generate_flashcards(self, chunks: Iterable[str]) -> FlashcardPayload:
+        chunks = list(chunks)
+        try:
+            return self._primary.generate_flashcards(chunks)
+        except AIProviderUnavailableError as exc:
+            self._log_fallback(exc)
+            return self._fallback.generate_flashcards(chunks)
+
+    def generate_study_pack(self, chunks: Iterable[str]) -> StudyPackPayload:
+        chunks = list(chunks)
+        try:
+            return self._primary.generate_study_pack(chunks)
+        except AIProviderUnavailableError as exc:
+            self._log_fallback(exc)
+            return self._fallback.generate_study_pack(chunks)
+
+    def generate_flashcard_batch(
+        self, documents: Mapping[str, Iterable[str]]
+    ) -> dict[str, FlashcardPayload | AIProviderError]:
+        documents = {key: list(chunks) for key, chunks in documents.items()}
+        try:
+            return self._primary.generate_flashcard_batch(documents)
+        except AIProviderUnavailableError as exc:
+            self._log_fallback(exc)
+            return self._fallback.generate_flashcard_batch(documents)
+
+    def stream_flashcards(
+        self, chunks: Iterable[str]
+    ) -> Iterator[FlashcardItem | FlashcardPayload]:
+        chunks = list(chunks)
+        started = False
+        try:
+            for item in self._primary.stream_flashcards(chunks):
+                started = True
+                yield item
+        except AIProviderUnavailableError as exc:
+            if started:
+                raise
+            self._log_fallback(exc)
+            yield from self._fallback.stream_flashcards(chunks)
+
+    def _log_fallback(self, exc: Exception) -> None:
+        current_app.logger.warning(
+            "AI provider %s unavailable (%s); falling back to %s",
+            self._primary.name,
+            exc,
+            self._fallback.name,
+        )
+
+
+class AIProviderRegistry:
+    """Resolve AI providers by name, defaulting to the ``AI_PROVIDER`` setting."""
+
+    def __init__(self, providers: Mapping[str, AIProvider]) -> None:
+        self._providers = dict(providers)
+
+    @property
+    def names(self) -> list[str]:
+        """Return the registered provider names."""
+        return sorted(self._providers)
+
+    def get(self, name: str | None = None) -> AIProvider:
+        """Return the provider registered under ``name``."""
+        resolved = name or current_app.config.get("AI_PROVIDER", "auto")
+        try:
+            return self._providers[resolved]
+        except KeyError as exc:
+            raise AIProviderError(
+                f"Unknown AI provider '{resolved}'. Choose one of: "
+                + ", ".join(self.names)
+            ) from exc
+
+
+def chunk_resource(resource: Resource, *, chunk_size: int = 800) -> list[str]:
+    """Split resource text into whitespace-delimited chunks of ``chunk_size``.
+
+    Unless ``AI_PROMPT_COMPACTION`` is disabled, the text is first compacted to
+    drop repeated headers, page numbers and near-duplicate paragraphs.
+    """
+    if chunk_size <= 0:
+        raise AIProviderError("chunk_size must be positive")
+
+    text_source = (resource.text_content or resource.description or "").strip()
+    if not text_source:
+        raise AIProviderError("Resource missing textual content")
+
+    if current_app.config.get("AI_PROMPT_COMPACTION", True):
+        compaction = compact_text(text_source)
+        current_app.logger.info(
+            "Prompt compaction for resource %s saved %d of %d tokens (%.0f%%)",
+            resource.id,
+            compaction.saved_tokens,
+            compaction.original_tokens,
+            compaction.saved_ratio * 100,
+        )
+        text_source = compaction.text or text_source
+
+    words = text_source.split()
+    if not words:
+        raise AIProviderError("Resource text could not be tokenized")
+
+    chunks: list[str] = []
+    current_chunk: list[str] = []
+    current_length = 0
+
+    for word in words:
+        word_length = len(word) + 1  # include a space
+        if current_chunk and current_length + word_length > chunk_size:
+            chunks.append(" ".join(current_chunk))
+            current_chunk = [word]
+            current_length = len(word)
+        else:
+            current_chunk.append(word)
+            current_length += word_length
+
+    if current_chunk:
+        chunks.append(" ".join(current_chunk))
+
+    return chunks
+
+
+def parse_card(item: Any) -> FlashcardItem | None:
+    """Convert a decoded JSON object into a flashcard if it is complete."""
+    if not isinstance(item, dict):
+        return None
+    question = item.get("question")
+    answer = item.get("answer")
+    if not question or not answer:
+        return None
+    return FlashcardItem(question=question, answer=answer)
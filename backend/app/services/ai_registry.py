@@ -0,0 +1,15 @@
+"""Registry of the AI providers available to generation services."""
+
+from __future__ import annotations
+
+from .ai_provider import AIProviderRegistry, FallbackProvider
+from .extractive_service import extractive_service
+from .gemini_service import gemini_service
+
+ai_providers = AIProviderRegistry(
+    {
+        gemini_service.name: gemini_service,
+        extractive_service.name: extractive_service,
+        "auto": FallbackProvider(gemini_service, extractive_service),
+    }
+)
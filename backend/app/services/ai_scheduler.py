@@ -0,0 +1,303 @@
+"""Fair-share scheduling and quota enforcement for outbound AI calls."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Mapping
+
+from ..models import User
+
+PRIORITY_CLASSES: tuple[str, ...] = ("interactive", "batch")
+DEFAULT_ROLE_WEIGHTS: dict[str, float] = {
+    "admin": 4.0,
+    "teacher": 2.0,
+    "expert": 2.0,
+    "student": 1.0,
+}
+
+
+class SchedulerError(Exception):
+    """Raised when the scheduler cannot admit a call."""
+
+
+class QueueTimeoutError(SchedulerError):
+    """Raised when a call waits longer than the queue timeout for quota."""
+
+
+@dataclass(frozen=True)
+class Requester:
+    """Who an AI call is made for and how urgently it is needed."""
+
+    user_id: int | None = None
+    roles: tuple[str, ...] = ()
+    priority: str = "interactive"
+
+
+_current_requester: ContextVar[Requester | None] = ContextVar(
+    "ai_requester", default=None
+)
+
+
+@contextmanager
+def ai_requester(
+    user: User | None, *, priority: str = "interactive"
+) -> Iterator[Requester]:
+    """Attribute AI calls made inside the block to ``user``.
+
+    Services wrap provider calls with this so the scheduler can queue them
+    fairly without the provider interface having to carry the user around.
+    """
+    if priority not in PRIORITY_CLASSES:
+        raise SchedulerError(f"Unknown priority class '{priority}'")
+    requester = Requester(
+        user_id=user.id if user is not None else None,
+        roles=tuple(role.name for role in user.roles) if user is not None else (),
+        priority=priority,
+    )
+    # Restore rather than ``reset`` so a streaming generator that is closed
+    # from another context does not fail on exit.
+    previous = _current_requester.get()
+    _current_requester.set(requester)
+    try:
+        yield requester
+    finally:
+        _current_requester.set(previous)
+
+
+def current_requester() -> Requester:
+    """Return the requester attributed to the running AI call."""
+    return _current_requester.get() or Requester()
+
+
+@dataclass
+class TokenBucket:
+    """Refill ``rate`` tokens per second up to ``capacity``.
+
+    The bucket is not synchronized; :class:`AIScheduler` guards it with its
+    own lock.
+    """
+
+    rate: float
+    capacity: float
+    clock: Callable[[], float] = time.monotonic
+    _tokens: float = field(init=False)
+    _updated: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.capacity <= 0:
+            raise SchedulerError("Token bucket rate and capacity must be positive")
+        self._tokens = self.capacity
+        self._updated = self.clock()
+
+    @property
+    def tokens(self) -> float:
+        """Return the tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self, cost: float) -> float:
+        """Return how long until ``cost`` tokens are available (0 if now)."""
+        self._refill()
+        if self._tokens >= cost:
+            return 0.0
+        return (cost - self._tokens) / self.rate
+
+    def take(self, cost: float) -> None:
+        """Consume ``cost`` tokens; callers check :meth:`wait_time` first."""
+        self._refill()
+        self._tokens -= cost
+
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+
+@dataclass(order=True)
+class _Ticket:
+    rank: int
+    finish: float
+    seq: int
+    start: float = field(compare=False)
+    cost: float = field(compare=False)
+    priority: str = field(compare=False)
+    user_key: Any = field(compare=False)
+
+
+class AIScheduler:
+    """Admit AI calls against a global token bucket in fair-share order.
+
+    Waiting calls are ordered first by priority class (interactive calls
+    always go ahead of batch work) and then by start-time fair queueing
+    across users: every user accumulates virtual time in proportion to the
+    quota they consume divided by the weight of their strongest role, so a
+    user submitting many calls cannot starve others, and teachers get a
+    larger share than students. Only the head of the queue may take tokens.
+
+    The bucket lives in the process, so with several workers the provider
+    sees up to one bucket's rate per worker.
+    """
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        *,
+        role_weights: Mapping[str, float] | None = None,
+        queue_timeout: float = 30.0,
+        wait_window: int = 500,
+    ) -> None:
+        self.bucket = bucket
+        self.role_weights = dict(role_weights or DEFAULT_ROLE_WEIGHTS)
+        self.queue_timeout = queue_timeout
+        self._clock = bucket.clock
+        self._condition = threading.Condition()
+        self._queue: list[_Ticket] = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags: dict[Any, float] = {}
+        self._granted = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._timed_out = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._waits = {
+            priority: deque(maxlen=wait_window) for priority in PRIORITY_CLASSES
+        }
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], prefix: str) -> "AIScheduler":
+        """Build a scheduler from ``<prefix>*`` quota keys and ``AI_ROLE_WEIGHTS``."""
+        per_minute = float(config.get(f"{prefix}REQUESTS_PER_MINUTE", 60))
+        return cls(
+            TokenBucket(
+                rate=per_minute / 60.0,
+                capacity=float(config.get(f"{prefix}BURST", 10)),
+            ),
+            role_weights=parse_role_weights(config.get("AI_ROLE_WEIGHTS")),
+            queue_timeout=float(config.get(f"{prefix}QUEUE_TIMEOUT", 30)),
+        )
+
+    def acquire(self, cost: float = 1.0, requester: Requester | None = None) -> float:
+        """Block until the call may proceed and return the seconds spent queued.
+
+        Raises:
+            QueueTimeoutError: If quota is not granted within ``queue_timeout``.
+        """
+        requester = requester or current_requester()
+        if requester.priority not in PRIORITY_CLASSES:
+            raise SchedulerError(f"Unknown priority class '{requester.priority}'")
+        if cost > self.bucket.capacity:
+            raise SchedulerError("Call cost exceeds the token bucket capacity")
+
+        with self._condition:
+            enqueued_at = self._clock()
+            ticket = self._enqueue(requester, cost)
+            deadline = enqueued_at + self.queue_timeout
+            while True:
+                delay: float | None = None
+                if self._queue[0] is ticket:
+                    delay = self.bucket.wait_time(cost)
+                    if delay <= 0:
+                        break
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    self._abandon(ticket)
+                    raise QueueTimeoutError(
+                        "AI quota exhausted; request timed out in the queue"
+                    )
+                self._condition.wait(
+                    remaining if delay is None else min(delay, remaining)
+                )
+
+            heapq.heappop(self._queue)
+            self.bucket.take(cost)
+            self._virtual_time = max(self._virtual_time, ticket.start)
+            if not self._queue:
+                # An idle system owes nobody anything; drop per-user history.
+                self._finish_tags.clear()
+            waited = self._clock() - enqueued_at
+            self._granted[ticket.priority] += 1
+            self._waits[ticket.priority].append(waited)
+            self._condition.notify_all()
+            return waited
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return queue depth, throughput and wait-time metrics."""
+        with self._condition:
+            depth = dict.fromkeys(PRIORITY_CLASSES, 0)
+            for ticket in self._queue:
+                depth[ticket.priority] += 1
+            return {
+                "tokens_available": round(self.bucket.tokens, 3),
+                "capacity": self.bucket.capacity,
+                "refill_per_second": self.bucket.rate,
+                "queue_depth": depth,
+                "waiting_users": len({ticket.user_key for ticket in self._queue}),
+                "granted": dict(self._granted),
+                "timed_out": dict(self._timed_out),
+                "wait_seconds": {
+                    priority: _summarize(waits)
+                    for priority, waits in self._waits.items()
+                },
+            }
+
+    def _enqueue(self, requester: Requester, cost: float) -> _Ticket:
+        user_key = requester.user_id
+        weight = max(
+            (self.role_weights.get(role, 1.0) for role in requester.roles),
+            default=1.0,
+        )
+        start = max(self._virtual_time, self._finish_tags.get(user_key, 0.0))
+        finish = start + cost / weight
+        self._finish_tags[user_key] = finish
+        ticket = _Ticket(
+            rank=PRIORITY_CLASSES.index(requester.priority),
+            finish=finish,
+            seq=next(self._seq),
+            start=start,
+            cost=cost,
+            priority=requester.priority,
+            user_key=user_key,
+        )
+        heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _abandon(self, ticket: _Ticket) -> None:
+        self._queue.remove(ticket)
+        heapq.heapify(self._queue)
+        self._timed_out[ticket.priority] += 1
+        self._condition.notify_all()
+
+
+def parse_role_weights(value: str | Mapping[str, float] | None) -> dict[str, float]:
+    """Parse ``"admin:4,teacher:2"`` style role weights."""
+    if not value:
+        return dict(DEFAULT_ROLE_WEIGHTS)
+    if isinstance(value, Mapping):
+        return {str(role): float(weight) for role, weight in value.items()}
+    weights: dict[str, float] = {}
+    for entry in value.split(","):
+        role, _, weight = entry.partition(":")
+        if not role.strip() or not weight.strip():
+            raise SchedulerError(f"Invalid role weight entry '{entry}'")
+        weights[role.strip()] = float(weight)
+    return weights
+
+
+def _summarize(waits: deque[float]) -> dict[str, float | int]:
+    if not waits:
+        return {"count": 0, "mean": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(waits)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 4),
+        "p95": round(p95, 4),
+        "max": round(ordered[-1], 4),
+    }
@@ -0,0 +1,146 @@
+"""Full-text search over blog posts.
+
+Words in the query are matched as prefixes against the title, slug and
+content through the dialect's search index (FTS5 on SQLite, ``tsvector`` on
+PostgreSQL), ranked with title matches first. Posts whose slug contains the
+whole query are also returned, after the word matches, so partial slugs such
+as ``"ntro-to"`` still find ``"intro-to-python"``. Other dialects fall back
+to a ``LIKE`` scan.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Sequence
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy.orm.interfaces import ORMOption
+
+from ..extensions import db
+from ..models import BlogPost
+from ..utils.sql import escape_like
+
+_WORD = re.compile(r"\w+")
+# Trigram indexes cannot serve fragments shorter than one trigram.
+_TRIGRAM_MIN = 3
+
+
+class BlogSearchService:
+    """Query the blog post search indexes."""
+
+    def search(
+        self,
+        query: str,
+        *,
+        published: bool | None = None,
+        limit: int | None = None,
+        options: Sequence[ORMOption] = (),
+    ) -> Sequence[BlogPost]:
+        """Return up to ``limit`` posts matching ``query``, best match first.
+
+        ``published`` restricts results to published (``True``) or draft
+        (``False``) posts; ``options`` are applied to the post query.
+        """
+        fragment = " ".join(query.split()).casefold()
+        if not fragment:
+            return []
+        limit = limit or current_app.config.get("BLOG_SEARCH_PAGE_SIZE", 20)
+        words = _WORD.findall(fragment)
+        dialect = db.engine.dialect.name
+        if dialect == "sqlite":
+            hits = self._sqlite_hits(words, fragment)
+        elif dialect == "postgresql":
+            hits = self._postgresql_hits(words, fragment)
+        else:
+            hits = self._like_hits(fragment)
+
+        ranked = hits.subquery()
+        rank = sa.func.min(ranked.c.rank)
+        stmt = (
+            sa.select(BlogPost)
+            .join(ranked, ranked.c.id == BlogPost.id)
+            .group_by(BlogPost.id)
+            .order_by(rank, BlogPost.created_at.desc(), BlogPost.id)
+            .limit(limit)
+            .options(*options)
+        )
+        if published is not None:
+            stmt = stmt.where(BlogPost.is_published.is_(published))
+        return db.session.scalars(stmt).all()
+
+    def _sqlite_hits(self, words: list[str], fragment: str) -> sa.CompoundSelect:
+        # bm25() is negative and lower is better; slug-only hits rank after it.
+        selects: list[sa.Select] = []
+        if words:
+            terms = " ".join(f'"{word}"*' for word in words)
+            selects.append(
+                sa.select(
+                    sa.literal_column("rowid").label("id"),
+                    sa.literal_column("bm25(blog_posts_fts, 10.0, 5.0, 1.0)").label(
+                        "rank"
+                    ),
+                )
+                .select_from(sa.table("blog_posts_fts"))
+                .where(sa.literal_column("blog_posts_fts").op("MATCH")(terms))
+            )
+        if len(fragment) >= _TRIGRAM_MIN:
+            quoted = fragment.replace('"', '""')
+            selects.append(
+                sa.select(
+                    sa.literal_column("rowid").label("id"),
+                    sa.literal(0.0).label("rank"),
+                )
+                .select_from(sa.table("blog_posts_slug_fts"))
+                .where(
+                    sa.literal_column("blog_posts_slug_fts").op("MATCH")(f'"{quoted}"')
+                )
+            )
+        else:
+            selects.append(self._slug_prefix_hits(fragment))
+        return sa.union_all(*selects)
+
+    def _postgresql_hits(
+        self, words: list[str], fragment: str
+    ) -> sa.CompoundSelect:
+        vector = sa.literal_column("blog_posts.search_vector")
+        selects: list[sa.Select] = []
+        if words:
+            tsquery = sa.func.to_tsquery(
+                "english", " & ".join(f"{word}:*" for word in words)
+            )
+            selects.append(
+                sa.select(
+                    BlogPost.id.label("id"),
+                    (-sa.func.ts_rank(vector, tsquery)).label("rank"),
+                ).where(vector.op("@@")(tsquery))
+            )
+        if len(fragment) >= _TRIGRAM_MIN:
+            selects.append(
+                sa.select(BlogPost.id.label("id"), sa.literal(0.0).label("rank")).where(
+                    BlogPost.slug.ilike(f"%{escape_like(fragment)}%", escape="\\")
+                )
+            )
+        else:
+            selects.append(self._slug_prefix_hits(fragment))
+        return sa.union_all(*selects)
+
+    def _like_hits(self, fragment: str) -> sa.CompoundSelect:
+        pattern = f"%{escape_like(fragment)}%"
+        return sa.union_all(
+            sa.select(BlogPost.id.label("id"), sa.literal(0.0).label("rank")).where(
+                sa.or_(
+                    sa.func.lower(BlogPost.title).like(pattern, escape="\\"),
+                    sa.func.lower(BlogPost.slug).like(pattern, escape="\\"),
+                )
+            )
+        )
+
+    def _slug_prefix_hits(self, fragment: str) -> sa.Select:
+        # Fragments too short for a trigram only match the start of a slug.
+        return sa.select(BlogPost.id.label("id"), sa.literal(0.0).label("rank")).where(
+            BlogPost.slug.like(f"{escape_like(fragment)}%", escape="\\")
+        )
+
+
+blog_search_service = BlogSearchService()
@@ -0,0 +1,86 @@
+"""Read access to published blog posts."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from flask import current_app
+
+from ..extensions import db
+from ..models import BlogPost
+from ..utils.pagination import decode_cursor, encode_cursor
+
+
+class BlogService:
+    """Serve published blog posts to the public site."""
+
+    def feed(self, *, cursor: str | None = None, limit: int | None = None) -> dict:
+        """Return a page of published post summaries, newest first.
+
+        Only the stored excerpt and reading time are selected; post bodies
+        are never loaded. Pages are keyset paginated on ``(created_at, id)``.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed.
+        """
+        limit = limit or current_app.config.get("BLOG_FEED_PAGE_SIZE", 10)
+        stmt = (
+            sa.select(
+                BlogPost.id,
+                BlogPost.title,
+                BlogPost.slug,
+                BlogPost.excerpt,
+                BlogPost.reading_minutes,
+                BlogPost.hero_image_url,
+                BlogPost.created_at,
+            )
+            .where(BlogPost.is_published.is_(True))
+            .order_by(BlogPost.created_at.desc(), BlogPost.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            created_at, post_id = decode_cursor(cursor, (datetime, int))
+            stmt = stmt.where(
+                sa.tuple_(BlogPost.created_at, BlogPost.id) < (created_at, post_id)
+            )
+        rows = db.session.execute(stmt).all()
+        last = rows[limit - 1] if len(rows) > limit else None
+        return {
+            "items": [
+                {
+                    "title": row.title,
+                    "slug": row.slug,
+                    "excerpt": row.excerpt,
+                    "reading_minutes": row.reading_minutes,
+                    "hero_image_url": row.hero_image_url,
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in rows[:limit]
+            ],
+            "next_cursor": encode_cursor([last.created_at, last.id]) if last else None,
+        }
+
+    def published_post(self, slug: str) -> dict[str, Any] | None:
+        """Return the published post at ``slug`` or ``None``."""
+        post = db.session.scalar(
+            sa.select(BlogPost).where(
+                BlogPost.slug == slug, BlogPost.is_published.is_(True)
+            )
+        )
+        if post is None:
+            return None
+        return {
+            "title": post.title,
+            "slug": post.slug,
+            "content": post.content,
+            "excerpt": post.excerpt,
+            "reading_minutes": post.reading_minutes,
+            "hero_image_url": post.hero_image_url,
+            "created_at": post.created_at.isoformat(),
+            "updated_at": post.updated_at.isoformat(),
+        }
+
+
+blog_service = BlogService()
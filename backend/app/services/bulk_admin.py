@@ -0,0 +1,200 @@
+"""Set-based bulk changes for the admin moderation tools."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Mapping
+
+import sqlalchemy as sa
+from flask import current_app
+
+from ..extensions import db
+from ..models import Lesson, Resource, Role, User
+from ..models.base import Base
+from ..models.role import user_roles
+from ..utils.http_cache import PUBLIC_LESSONS, invalidate_public
+from .counter_service import counter_service
+from .user_directory import user_directory_service
+
+FilterSpec = dict[str, tuple[type, Callable[[Any], sa.ColumnElement[bool]]]]
+
+
+def _user_filter(name: str) -> Callable[[Any], sa.ColumnElement[bool]]:
+    return lambda value: sa.and_(*user_directory_service.filters(**{name: value}))
+
+
+USER_FILTERS: FilterSpec = {
+    "role": (str, _user_filter("role")),
+    "active": (bool, _user_filter("active")),
+    "q": (str, _user_filter("prefix")),
+}
+RESOURCE_FILTERS: FilterSpec = {
+    "status": (str, lambda value: Resource.ai_processing_status == value),
+    "owner_id": (int, lambda value: Resource.owner_id == value),
+}
+LESSON_FILTERS: FilterSpec = {
+    "status": (str, lambda value: Lesson.status == value),
+    "author_id": (int, lambda value: Lesson.author_id == value),
+    "resource_id": (int, lambda value: Lesson.resource_id == value),
+}
+
+_TYPE_NAMES = {str: "a string", int: "an integer", bool: "a boolean"}
+
+
+class BulkAdminError(Exception):
+    """Raised when a bulk selection is malformed."""
+
+
+class BulkAdminService:
+    """Apply one change to many rows with a single statement.
+
+    Rows are selected either by ``ids`` or by a ``filters`` mapping of the
+    fields in the matching ``*_FILTERS`` table. Only rows the change would
+    actually modify are written. Each operation returns the number of
+    selected rows (``matched``) and of rows changed (``affected``); with
+    ``dry_run`` nothing is written and ``affected`` is the number of rows
+    that would change.
+    """
+
+    def set_users_active(
+        self,
+        active: bool,
+        *,
+        ids: Any = None,
+        filters: Any = None,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """Activate or suspend the selected users."""
+        where = self._selection(User, ids, filters, USER_FILTERS)
+        return self._update(User, where, {"is_active": active}, dry_run=dry_run)
+
+    def assign_role(
+        self,
+        role: Role,
+        *,
+        ids: Any = None,
+        filters: Any = None,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """Grant ``role`` to the selected users with one ``INSERT ... SELECT``."""
+        where = self._selection(User, ids, filters, USER_FILTERS)
+        missing = sa.and_(
+            where,
+            ~sa.exists()
+            .where(user_roles.c.user_id == User.id)
+            .where(user_roles.c.role_id == role.id),
+        )
+        matched = self._count(User, where)
+        affected = self._count(User, missing)
+        if not dry_run and affected:
+            result = db.session.execute(
+                sa.insert(user_roles).from_select(
+                    ["user_id", "role_id"],
+                    sa.select(User.id, sa.literal(role.id)).where(missing),
+                )
+            )
+            db.session.commit()
+            affected = result.rowcount
+        return {"matched": matched, "affected": affected, "dry_run": dry_run}
+
+    def set_resource_status(
+        self,
+        status: str,
+        *,
+        ids: Any = None,
+        filters: Any = None,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """Set the moderation status of the selected resources."""
+        where = self._selection(Resource, ids, filters, RESOURCE_FILTERS)
+        return self._update(
+            Resource, where, {"ai_processing_status": status}, dry_run=dry_run
+        )
+
+    def publish_lessons(
+        self,
+        *,
+        ids: Any = None,
+        filters: Any = None,
+        dry_run: bool = False,
+    ) -> dict[str, Any]:
+        """Publish the selected lessons."""
+        where = self._selection(Lesson, ids, filters, LESSON_FILTERS)
+        result = self._update(Lesson, where, {"status": "published"}, dry_run=dry_run)
+        if not dry_run and result["affected"]:
+            invalidate_public(PUBLIC_LESSONS)
+        return result
+
+    def _update(
+        self,
+        model: type[Base],
+        where: sa.ColumnElement[bool],
+        values: Mapping[str, Any],
+        *,
+        dry_run: bool,
+    ) -> dict[str, Any]:
+        # Rows already holding the new values are left alone, so ``affected``
+        # counts real changes and ``updated_at`` only moves on those rows.
+        differs = [
+            sa.or_(getattr(model, key) != value, getattr(model, key).is_(None))
+            for key, value in values.items()
+        ]
+        changed = sa.and_(where, sa.or_(*differs))
+        matched = self._count(model, where)
+        affected = self._count(model, changed)
+        if not dry_run and affected:
+            deltas = counter_service.update_deltas(model, changed, values)
+            result = db.session.execute(
+                sa.update(model).where(changed).values(**values),
+                execution_options={"synchronize_session": False},
+            )
+            counter_service.apply(deltas)
+            db.session.commit()
+            affected = result.rowcount
+        return {"matched": matched, "affected": affected, "dry_run": dry_run}
+
+    def _count(self, model: type[Base], where: sa.ColumnElement[bool]) -> int:
+        return db.session.scalar(
+            sa.select(sa.func.count()).select_from(model).where(where)
+        )
+
+    def _selection(
+        self, model: type[Base], ids: Any, filters: Any, allowed: FilterSpec
+    ) -> sa.ColumnElement[bool]:
+        if (ids is None) == (filters is None):
+            raise BulkAdminError("Provide either ids or filter")
+        if ids is not None:
+            if (
+                not isinstance(ids, list)
+                or not ids
+                or not all(_is_type(value, int) for value in ids)
+            ):
+                raise BulkAdminError("ids must be a non-empty list of integers")
+            maximum = current_app.config.get("ADMIN_BULK_MAX_IDS", 1000)
+            if len(ids) > maximum:
+                raise BulkAdminError(f"At most {maximum} ids can be changed at once")
+            return model.id.in_(sorted(set(ids)))
+
+        if not isinstance(filters, dict) or not filters:
+            raise BulkAdminError("filter must name at least one field")
+        unknown = sorted(set(filters) - set(allowed))
+        if unknown:
+            raise BulkAdminError(f"Unknown filter fields: {', '.join(unknown)}")
+        clauses = []
+        for key, value in filters.items():
+            expected, build = allowed[key]
+            if not _is_type(value, expected):
+                raise BulkAdminError(f"filter.{key} must be {_TYPE_NAMES[expected]}")
+            if isinstance(value, str) and not value.strip():
+                raise BulkAdminError(f"filter.{key} must not be blank")
+            clauses.append(build(value))
+        return sa.and_(*clauses)
+
+
+def _is_type(value: Any, expected: type) -> bool:
+    # ``bool`` is a subclass of ``int``; ``True`` is not an id.
+    return isinstance(value, expected) and (
+        expected is bool or not isinstance(value, bool)
+    )
+
+
+bulk_admin_service = BulkAdminService()
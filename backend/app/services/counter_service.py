@@ -0,0 +1,84 @@
+"""Dashboard counters read from and reconciled against ``admin_counters``."""
+
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+import sqlalchemy as sa
+
+from ..extensions import db
+from ..models.admin_counter import COUNTERS, AdminCounter, apply_counter_deltas
+from ..models.base import Base
+
+
+class CounterService:
+    """Read and repair the incrementally maintained dashboard counters."""
+
+    def values(self) -> dict[str, int]:
+        """Return every counter in one query; missing counters read as zero."""
+        stored = dict(
+            db.session.execute(sa.select(AdminCounter.name, AdminCounter.value)).all()
+        )
+        return {name: int(stored.get(name) or 0) for name in COUNTERS}
+
+    def update_deltas(
+        self,
+        model: type[Base],
+        where: sa.ColumnElement[bool],
+        values: Mapping[str, Any],
+    ) -> dict[str, int]:
+        """Return the counter changes of setting ``values`` on rows matching ``where``.
+
+        Core ``UPDATE`` statements bypass the flush hooks, so set-based writes
+        compute their deltas before updating and pass them to :meth:`apply`.
+        """
+        deltas: dict[str, int] = {}
+        for name, spec in COUNTERS.items():
+            if spec.model is not model or spec.attribute not in values:
+                continue
+            count = sa.select(sa.func.count()).select_from(model).where(where)
+            before = db.session.scalar(count.where(spec.clause))
+            after = 0
+            if spec.matches(values[spec.attribute]):
+                after = db.session.scalar(count)
+            if after != before:
+                deltas[name] = after - before
+        return deltas
+
+    def apply(self, deltas: dict[str, int]) -> None:
+        """Add ``deltas`` to the counters in the current transaction."""
+        apply_counter_deltas(db.session.connection(), deltas)
+
+    def reconcile(self) -> dict[str, tuple[int, int]]:
+        """Recount every counter and store the result.
+
+        Counter rows are locked first, so flushes that would change them wait
+        until the recount commits. Returns ``{name: (stored, actual)}`` for
+        the counters that had drifted.
+        """
+        stored = dict(
+            db.session.execute(
+                sa.select(AdminCounter.name, AdminCounter.value).with_for_update()
+            ).all()
+        )
+        drift: dict[str, tuple[int, int]] = {}
+        for name, spec in COUNTERS.items():
+            actual = db.session.scalar(
+                sa.select(sa.func.count()).select_from(spec.model).where(spec.clause)
+            )
+            if name not in stored:
+                db.session.add(AdminCounter(name=name, value=actual))
+            elif stored[name] != actual:
+                db.session.execute(
+                    sa.update(AdminCounter)
+                    .where(AdminCounter.name == name)
+                    .values(value=actual)
+                )
+            else:
+                continue
+            drift[name] = (int(stored.get(name) or 0), actual)
+        db.session.commit()
+        return drift
+
+
+counter_service = CounterService()
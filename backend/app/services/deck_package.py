@@ -0,0 +1,210 @@
+"""Export and import decks as gzip-compressed NDJSON packages.
+
+A package is a gzip stream of newline-delimited JSON. The first line is a
+header describing the deck and every following line is one card::
+
+    {"format": "flashy-deck", "version": 1, "title": "...", "description": ...}
+    {"question": "...", "answer": "..."}
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Any, Iterator
+
+import sqlalchemy as sa
+from flask import current_app
+
+from ..extensions import db
+from ..models import FlashcardDeck, User
+from ..utils.http_cache import PUBLIC_DECKS, invalidate_public
+from .flashcard_service import flashcard_service
+from .flashcard_store import insert_cards, insert_deck
+
+PACKAGE_FORMAT = "flashy-deck"
+PACKAGE_VERSION = 1
+PACKAGE_MIMETYPE = "application/gzip"
+
+
+class DeckPackageError(Exception):
+    """Raised when a deck package cannot be read."""
+
+
+@dataclass
+class ImportResult:
+    """Outcome of importing a package into a deck."""
+
+    deck: FlashcardDeck
+    imported: int
+    duplicates: int
+
+
+def export_deck(deck: FlashcardDeck, *, compresslevel: int = 6) -> Iterator[bytes]:
+    """Yield a gzip-compressed package of ``deck`` built from a DB cursor.
+
+    Cards are compressed as they are read, so neither the card list nor the
+    uncompressed document is ever held in memory.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+    header = {
+        "format": PACKAGE_FORMAT,
+        "version": PACKAGE_VERSION,
+        "title": deck.title,
+        "description": deck.description,
+        "card_count": deck.card_count,
+    }
+    yield compressor.compress(_line(header))
+    for card in flashcard_service.iter_cards(deck):
+        chunk = compressor.compress(
+            _line({"question": card["question"], "answer": card["answer"]})
+        )
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def import_deck(
+    *,
+    owner: User,
+    stream: IO[bytes],
+    deck: FlashcardDeck | None = None,
+    batch_size: int | None = None,
+) -> ImportResult:
+    """Read a package from ``stream`` into ``deck`` or a new deck for ``owner``.
+
+    Cards are inserted in batches of ``batch_size`` (default
+    ``DECK_IMPORT_BATCH_SIZE``). A card whose normalized question and answer
+    hash to the same value as a card already in the deck, or earlier in the
+    package, is skipped. Everything is committed together.
+
+    Raises:
+        DeckPackageError: If the package is not valid gzip NDJSON, has the
+            wrong header, holds a malformed card or exceeds
+            ``DECK_IMPORT_MAX_CARDS``, ``DECK_IMPORT_MAX_LINE_BYTES`` or
+            ``DECK_IMPORT_MAX_BYTES``.
+    """
+    config = current_app.config
+    batch_size = batch_size or config.get("DECK_IMPORT_BATCH_SIZE", 1000)
+    max_cards = config.get("DECK_IMPORT_MAX_CARDS", 50000)
+    lines = _read_lines(
+        stream,
+        max_line=config.get("DECK_IMPORT_MAX_LINE_BYTES", 64 * 1024),
+        max_total=config.get("DECK_IMPORT_MAX_BYTES", 64 * 1024 * 1024),
+    )
+    header = next(lines, None)
+    if (
+        not isinstance(header, dict)
+        or header.get("format") != PACKAGE_FORMAT
+        or header.get("version") != PACKAGE_VERSION
+    ):
+        raise DeckPackageError("Not a Flashy deck package")
+
+    try:
+        if deck is None:
+            title = header.get("title")
+            if not isinstance(title, str) or not title.strip():
+                raise DeckPackageError("Package header is missing a title")
+            description = header.get("description")
+            if not isinstance(description, str):
+                description = None
+            deck = insert_deck(
+                title=title.strip()[:255],
+                description=description[:500] if description else None,
+                owner_id=owner.id,
+                cards=(),
+            )
+            seen: set[bytes] = set()
+        else:
+            seen = {
+                card_hash(card["question"], card["answer"])
+                for card in flashcard_service.iter_cards(deck)
+            }
+
+        imported = duplicates = 0
+        batch: list[dict[str, str]] = []
+        for card in lines:
+            question, answer = _card_fields(card)
+            digest = card_hash(question, answer)
+            if digest in seen:
+                duplicates += 1
+                continue
+            seen.add(digest)
+            batch.append({"question": question, "answer": answer})
+            if imported + len(batch) > max_cards:
+                raise DeckPackageError(f"Packages may hold at most {max_cards} cards")
+            if len(batch) >= batch_size:
+                imported += insert_cards(deck.id, batch)
+                batch = []
+        imported += insert_cards(deck.id, batch)
+
+        if imported:
+            db.session.execute(
+                sa.update(FlashcardDeck)
+                .where(FlashcardDeck.id == deck.id)
+                .values(
+                    version=FlashcardDeck.version + 1, updated_at=datetime.utcnow()
+                )
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    db.session.refresh(deck)
+    if imported and deck.is_public:
+        invalidate_public(PUBLIC_DECKS)
+    return ImportResult(deck=deck, imported=imported, duplicates=duplicates)
+
+
+def card_hash(question: str, answer: str) -> bytes:
+    """Return the content hash used to detect duplicate cards."""
+    normalized = "\x1f".join(
+        " ".join(text.split()).casefold() for text in (question, answer)
+    )
+    return hashlib.sha1(normalized.encode()).digest()
+
+
+def _line(record: dict[str, Any]) -> bytes:
+    text = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    return text.encode() + b"\n"
+
+
+def _read_lines(
+    stream: IO[bytes], *, max_line: int, max_total: int
+) -> Iterator[Any]:
+    # Lines are read with a bound so a package without newlines cannot be
+    # decompressed into memory in one piece.
+    total = 0
+    try:
+        with gzip.GzipFile(fileobj=stream, mode="rb") as archive:
+            while raw := archive.readline(max_line + 1):
+                if len(raw) > max_line:
+                    raise DeckPackageError(
+                        f"Package lines may be at most {max_line} bytes"
+                    )
+                total += len(raw)
+                if total > max_total:
+                    raise DeckPackageError(
+                        f"Packages may be at most {max_total} bytes uncompressed"
+                    )
+                if raw.strip():
+                    yield json.loads(raw)
+    except (OSError, EOFError, ValueError) as exc:
+        raise DeckPackageError(f"Could not read deck package: {exc}") from exc
+
+
+def _card_fields(card: Any) -> tuple[str, str]:
+    if not isinstance(card, dict):
+        raise DeckPackageError("Each card must be an object")
+    question, answer = card.get("question"), card.get("answer")
+    if not isinstance(question, str) or not isinstance(answer, str):
+        raise DeckPackageError("Each card requires a question and an answer")
+    if not question.strip() or not answer.strip():
+        raise DeckPackageError("Each card requires a question and an answer")
+    return question, answer
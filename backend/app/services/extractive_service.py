@@ -0,0 +1,297 @@
+"""Offline extractive flashcard generation backed by TF-IDF sentence scoring."""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, Mapping
+
+import numpy as np
+
+from ..models import Resource
+from .ai_provider import (
+    AIProviderError,
+    FlashcardItem,
+    FlashcardPayload,
+    StudyPackPayload,
+    chunk_resource,
+)
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_WORD = re.compile(r"[a-z][a-z'-]*[a-z]|[a-z]")
+_DEFINITION_PATTERNS = (
+    re.compile(
+        r"^(?P<term>[A-Z][\w\s()'-]{1,80}?)\s+(?P<verb>is|are)\s+"
+        r"(?:defined as\s+)?(?P<definition>(?:a|an|the|one)\s.+)$"
+    ),
+    re.compile(
+        r"^(?P<term>[A-Z][\w\s()'-]{1,80}?)\s+(?P<verb>refers to|means|describes)\s+"
+        r"(?P<definition>.+)$"
+    ),
+)
+_LEADING_ARTICLE = re.compile(r"^(A|An|The)\s")
+_QUESTION_TEMPLATES = {
+    "is": "What is {term}?",
+    "are": "What are {term}?",
+    "refers to": "What does {term} refer to?",
+    "means": "What does {term} mean?",
+    "describes": "What does {term} describe?",
+}
+STOPWORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because
+    been before being below between both but by can could did do does doing down
+    during each few for from further had has have having he her here hers him his
+    how i if in into is it its itself just me more most my no nor not now of off on
+    once only or other our ours out over own same she should so some such than that
+    the their theirs them then there these they this those through to too under
+    until up very was we were what when where which while who whom why will with
+    would you your yours
+    """.split()
+)
+MIN_SENTENCE_WORDS = 5
+MAX_SENTENCE_WORDS = 60
+MAX_TERM_WORDS = 8
+
+
+class ExtractiveServiceError(AIProviderError):
+    """Raised when the extractive backend cannot build cards from a text."""
+
+
+class ExtractiveService:
+    """Build flashcards locally from the most central sentences of a resource.
+
+    Sentences are scored by the cosine similarity of their TF-IDF vector (with
+    IDF computed over the resource chunks) to the document centroid. The top
+    definitional sentences ("X is a ...", "X refers to ...") become "What is X?"
+    cards and the remaining slots are filled with cloze deletions of each
+    sentence's most distinctive term. No network access is required.
+    """
+
+    name = "extractive"
+
+    def __init__(self, *, max_cards: int = 5, summary_sentences: int = 3) -> None:
+        self._max_cards = max_cards
+        self._summary_sentences = summary_sentences
+
+    def chunk_resource(self, resource: Resource, *, chunk_size: int = 800) -> list[str]:
+        """Chunk resource content for processing."""
+        return chunk_resource(resource, chunk_size=chunk_size)
+
+    def generate_flashcards(self, chunks: Iterable[str]) -> FlashcardPayload:
+        """Generate flashcards and a summary from text chunks."""
+        cards, summary, _ = self._extract(chunks)
+        return FlashcardPayload(cards=cards, summary=summary, source=self.name)
+
+    def generate_study_pack(self, chunks: Iterable[str]) -> StudyPackPayload:
+        """Generate flashcards, a summary and a lesson outline from text chunks."""
+        cards, summary, key_points = self._extract(chunks)
+        sections = [f"Overview\n{summary}"]
+        if cards:
+            sections.append(
+                "Key questions\n"
+                + "\n".join(f"- {card.question} {card.answer}" for card in cards)
+            )
+        if key_points:
+            sections.append(
+                "Key points\n" + "\n".join(f"- {point}" for point in key_points)
+            )
+        return StudyPackPayload(
+            cards=cards,
+            summary=summary,
+            lesson="\n\n".join(sections),
+            source=self.name,
+        )
+
+    def generate_flashcard_batch(
+        self, documents: Mapping[str, Iterable[str]]
+    ) -> dict[str, FlashcardPayload | AIProviderError]:
+        """Generate flashcards for several documents, isolating failures."""
+        results: dict[str, FlashcardPayload | AIProviderError] = {}
+        for key, chunks in documents.items():
+            try:
+                results[key] = self.generate_flashcards(chunks)
+            except ExtractiveServiceError as exc:
+                results[key] = exc
+        return results
+
+    def stream_flashcards(
+        self, chunks: Iterable[str]
+    ) -> Iterator[FlashcardItem | FlashcardPayload]:
+        """Yield each card followed by the full payload."""
+        payload = self.generate_flashcards(chunks)
+        yield from payload.cards
+        yield payload
+
+    def _extract(
+        self, chunks: Iterable[str]
+    ) -> tuple[list[FlashcardItem], str, list[str]]:
+        chunk_list = [chunk for chunk in chunks if chunk and chunk.strip()]
+        sentences = [
+            sentence for chunk in chunk_list for sentence in _split_sentences(chunk)
+        ]
+        if not sentences:
+            raise ExtractiveServiceError(
+                "Resource text is too short for extractive generation"
+            )
+
+        vocabulary: dict[str, int] = {}
+        sentence_tokens = [
+            [vocabulary.setdefault(token, len(vocabulary)) for token in _tokens(text)]
+            for text in sentences
+        ]
+        chunk_tokens = [
+            [vocabulary[token] for token in _tokens(chunk) if token in vocabulary]
+            for chunk in chunk_list
+        ]
+        if not vocabulary:
+            raise ExtractiveServiceError("Resource text has no informative terms")
+
+        idf = _inverse_document_frequency(chunk_tokens, len(vocabulary))
+        rows = _tfidf_rows(sentence_tokens, idf)
+        scores = _centrality_scores(rows, len(vocabulary))
+        ranked = [int(index) for index in np.argsort(-scores, kind="stable")]
+
+        cards = self._build_cards(sentences, ranked, sentence_tokens, idf, vocabulary)
+        if not cards:
+            raise ExtractiveServiceError("No flashcards could be extracted")
+
+        top = sorted(ranked[: self._summary_sentences])
+        summary = " ".join(sentences[index] for index in top)
+        key_points = [sentences[index] for index in ranked[: self._max_cards]]
+        return cards, summary, key_points
+
+    def _build_cards(
+        self,
+        sentences: list[str],
+        ranked: list[int],
+        sentence_tokens: list[list[int]],
+        idf: np.ndarray,
+        vocabulary: dict[str, int],
+    ) -> list[FlashcardItem]:
+        cards: list[FlashcardItem] = []
+        seen_terms: set[str] = set()
+        used: set[int] = set()
+
+        for index in ranked:
+            definition = _definition_card(sentences[index])
+            if definition is None:
+                continue
+            term, card = definition
+            if term.lower() in seen_terms:
+                continue
+            seen_terms.add(term.lower())
+            used.add(index)
+            cards.append(card)
+            if len(cards) >= self._max_cards:
+                return cards
+
+        terms = {term_id: term for term, term_id in vocabulary.items()}
+        for index in ranked:
+            if index in used or not sentence_tokens[index]:
+                continue
+            candidates = [
+                term_id
+                for term_id in sorted(set(sentence_tokens[index]))
+                if len(terms[term_id]) > 3 and terms[term_id] not in seen_terms
+            ]
+            if not candidates:
+                continue
+            term_id = max(candidates, key=lambda candidate: idf[candidate])
+            card = _cloze_card(sentences[index], terms[term_id])
+            if card is None:
+                continue
+            seen_terms.add(terms[term_id])
+            cards.append(card)
+            if len(cards) >= self._max_cards:
+                break
+        return cards
+
+
+def _split_sentences(text: str) -> list[str]:
+    sentences = []
+    for raw in _SENTENCE_BOUNDARY.split(" ".join(text.split())):
+        word_count = len(raw.split())
+        if MIN_SENTENCE_WORDS <= word_count <= MAX_SENTENCE_WORDS:
+            sentences.append(raw.strip())
+    return sentences
+
+
+def _tokens(text: str) -> list[str]:
+    return [token for token in _WORD.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _inverse_document_frequency(
+    documents: list[list[int]], vocabulary_size: int
+) -> np.ndarray:
+    """Return smoothed IDF weights for every vocabulary term."""
+    present = [np.unique(np.asarray(doc, dtype=np.intp)) for doc in documents]
+    document_frequency = np.bincount(
+        np.concatenate(present) if present else np.zeros(0, dtype=np.intp),
+        minlength=vocabulary_size,
+    )
+    return np.log((1 + len(documents)) / (1 + document_frequency)) + 1.0
+
+
+def _tfidf_rows(
+    documents: list[list[int]], idf: np.ndarray
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Return L2-normalized TF-IDF rows as ``(term ids, weights)`` pairs.
+
+    Rows are kept sparse: a dense documents x vocabulary matrix would not fit
+    in memory for book-length resources.
+    """
+    rows = []
+    for doc in documents:
+        terms, counts = np.unique(np.asarray(doc, dtype=np.intp), return_counts=True)
+        weights = counts / max(len(doc), 1) * idf[terms]
+        norm = np.linalg.norm(weights)
+        rows.append((terms, weights / norm if norm else weights))
+    return rows
+
+
+def _centrality_scores(
+    rows: list[tuple[np.ndarray, np.ndarray]], vocabulary_size: int
+) -> np.ndarray:
+    """Return the cosine similarity of every row to the mean row."""
+    centroid = np.bincount(
+        np.concatenate([terms for terms, _ in rows]),
+        weights=np.concatenate([weights for _, weights in rows]),
+        minlength=vocabulary_size,
+    ) / len(rows)
+    centroid_norm = np.linalg.norm(centroid)
+    if not centroid_norm:  # pragma: no cover - only when every row is empty
+        return np.zeros(len(rows))
+    centroid /= centroid_norm
+    return np.array([weights @ centroid[terms] for terms, weights in rows])
+
+
+def _definition_card(sentence: str) -> tuple[str, FlashcardItem] | None:
+    """Turn a definitional sentence into a term and a "What is X?" card."""
+    text = sentence.rstrip(".!? ")
+    for pattern in _DEFINITION_PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+        term = match.group("term").strip()
+        if len(term.split()) > MAX_TERM_WORDS:
+            continue
+        term = _LEADING_ARTICLE.sub(lambda m: m.group(1).lower() + " ", term)
+        question = _QUESTION_TEMPLATES[match.group("verb")].format(term=term)
+        definition = match.group("definition").strip()
+        answer = f"{definition[:1].upper()}{definition[1:]}."
+        return term, FlashcardItem(question=question, answer=answer)
+    return None
+
+
+def _cloze_card(sentence: str, term: str) -> FlashcardItem | None:
+    pattern = re.compile(rf"\b{re.escape(term)}\b", re.IGNORECASE)
+    match = pattern.search(sentence)
+    if not match:
+        return None
+    blanked = f"{sentence[: match.start()]}_____{sentence[match.end() :]}"
+    return FlashcardItem(
+        question=f"Fill in the blank: {blanked}", answer=match.group(0)
+    )
+
+
+extractive_service = ExtractiveService()
@@ -2,66 +2,516 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Sequence
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
 
 from ..extensions import db
 from ..models import Flashcard, FlashcardDeck, Resource, User
-from .gemini_service import GeminiService, GeminiServiceError, gemini_service
+from ..utils.http_cache import PUBLIC_DECKS, invalidate_public
+from ..utils.pagination import decode_cursor, encode_cursor
+from .ai_provider import (
+    AIProvider,
+    AIProviderError,
+    AIProviderRegistry,
+    FlashcardItem,
+    FlashcardPayload,
+    StudyPackPayload,
+)
+from .ai_registry import ai_providers
+from .ai_scheduler import ai_requester
+from .flashcard_store import clone_deck, insert_cards, insert_deck
+from .prompt_compactor import estimate_tokens
+from .study_pack_service import StudyPackService, study_pack_service
 
 
 class FlashcardServiceError(Exception):
     """Raised when flashcard operations fail."""
 
 
+class DeckVersionConflictError(FlashcardServiceError):
+    """Raised when a deck update is based on an outdated deck version."""
+
+
+@dataclass
+class BatchDeckResult:
+    """Outcome of generating a deck for one resource in a batch."""
+
+    resource: Resource
+    deck: FlashcardDeck | None = None
+    error: str | None = None
+
+
 class FlashcardService:
     """Service orchestrating flashcard lifecycle."""
 
-    def __init__(self, ai_service: GeminiService) -> None:
-        self._ai_service = ai_service
+    def __init__(
+        self, providers: AIProviderRegistry, study_packs: StudyPackService
+    ) -> None:
+        self._providers = providers
+        self._study_packs = study_packs
 
     def generate_deck(
-        self, *, owner: User, resource: Resource, chunk_size: int = 800
+        self,
+        *,
+        owner: User,
+        resource: Resource,
+        chunk_size: int = 800,
+        use_study_pack: bool = False,
+        provider: str | None = None,
     ) -> FlashcardDeck:
-        """Generate a deck of flashcards from a resource."""
-        if resource.owner_id != owner.id and not owner.has_role("admin"):
-            raise FlashcardServiceError(
-                "Unauthorized to generate flashcards for this resource"
-            )
+        """Generate a deck of flashcards from a resource.
+
+        With ``use_study_pack`` the cards come from the resource's combined
+        study pack, which is shared with lesson generation. ``provider`` selects
+        the AI backend by name and defaults to the ``AI_PROVIDER`` setting.
+        """
+        self._ensure_can_generate(owner, resource)
+        ai_service = self._resolve_provider(provider)
 
         try:
-            chunks = self._ai_service.chunk_resource(resource, chunk_size=chunk_size)
-            ai_payload = self._ai_service.generate_flashcards(chunks)
-        except GeminiServiceError as exc:  # pragma: no cover - airflow depends on SDK
-            resource.ai_processing_status = "failed"
-            db.session.commit()
+            with ai_requester(owner):
+                if use_study_pack:
+                    pack = self._study_packs.get_study_pack(
+                        resource, provider=provider
+                    )
+                    ai_payload = FlashcardPayload(
+                        cards=pack.cards, summary=pack.summary, source=pack.source
+                    )
+                else:
+                    chunks = ai_service.chunk_resource(
+                        resource, chunk_size=chunk_size
+                    )
+                    ai_payload = ai_service.generate_flashcards(chunks)
+        except AIProviderError as exc:  # pragma: no cover - airflow depends on SDK
+            self._mark_failed(resource)
             raise FlashcardServiceError(str(exc)) from exc
 
-        deck = FlashcardDeck(
-            title=f"AI Deck for {resource.original_name}",
-            description=ai_payload.summary,
+        return self._persist_deck(owner=owner, resource=resource, payload=ai_payload)
+
+    def add_study_pack_deck(
+        self, *, owner: User, resource: Resource, pack: StudyPackPayload
+    ) -> FlashcardDeck:
+        """Add a deck built from an already generated study ``pack``.
+
+        Nothing is committed, so the deck can be saved together with other
+        work derived from the same pack.
+        """
+        self._ensure_can_generate(owner, resource)
+        return self._add_deck(
             owner=owner,
             resource=resource,
+            payload=FlashcardPayload(
+                cards=pack.cards, summary=pack.summary, source=pack.source
+            ),
         )
-        db.session.add(deck)
-        for item in ai_payload.cards:
-            flashcard = Flashcard(question=item.question, answer=item.answer, deck=deck)
-            db.session.add(flashcard)
-        resource.ai_processing_status = "complete"
-        db.session.commit()
-        return deck
+
+    def stream_deck(
+        self,
+        *,
+        owner: User,
+        resource: Resource,
+        chunk_size: int = 800,
+        provider: str | None = None,
+    ) -> Iterator[tuple[str, Any]]:
+        """Generate a deck while streaming cards as soon as they are produced.
+
+        Authorization and chunking happen eagerly so callers can report those
+        errors before a streaming response is started. The returned iterator
+        yields ``("card", FlashcardItem)`` events followed by a final
+        ``("deck", FlashcardDeck)`` event once the deck has been persisted.
+        """
+        self._ensure_can_generate(owner, resource)
+        ai_service = self._resolve_provider(provider)
+        try:
+            chunks = ai_service.chunk_resource(resource, chunk_size=chunk_size)
+        except AIProviderError as exc:
+            raise FlashcardServiceError(str(exc)) from exc
+
+        def events() -> Iterator[tuple[str, Any]]:
+            payload: FlashcardPayload | None = None
+            try:
+                with ai_requester(owner):
+                    for item in ai_service.stream_flashcards(chunks):
+                        if isinstance(item, FlashcardItem):
+                            yield "card", item
+                        else:
+                            payload = item
+            except AIProviderError as exc:
+                self._mark_failed(resource)
+                raise FlashcardServiceError(str(exc)) from exc
+            if payload is None:  # pragma: no cover - defensive
+                self._mark_failed(resource)
+                raise FlashcardServiceError("Gemini stream ended unexpectedly")
+            yield "deck", self._persist_deck(
+                owner=owner, resource=resource, payload=payload
+            )
+
+        return events()
+
+    def generate_decks_batch(
+        self,
+        *,
+        owner: User,
+        resources: Sequence[Resource],
+        chunk_size: int = 800,
+        provider: str | None = None,
+        token_budget: int | None = None,
+        max_documents: int | None = None,
+    ) -> list[BatchDeckResult]:
+        """Generate one deck per resource, packing small resources per request.
+
+        Resources are packed first-fit-decreasing into requests whose
+        estimated prompt size stays within ``token_budget`` (default
+        ``AI_BATCH_TOKEN_BUDGET``) and that hold at most ``max_documents``
+        resources. The response is split back into separate decks. A
+        resource that fails authorization, is omitted from the response or
+        cannot be saved is reported in its result and marked failed without
+        affecting the others. Calls are scheduled at batch priority.
+        """
+        config = current_app.config
+        budget = token_budget or config.get("AI_BATCH_TOKEN_BUDGET", 6000)
+        limit = max_documents or config.get("AI_BATCH_MAX_DOCUMENTS", 8)
+        ai_service = self._resolve_provider(provider)
+
+        results = {resource.id: BatchDeckResult(resource) for resource in resources}
+        documents: list[tuple[Resource, list[str], int]] = []
+        for resource in resources:
+            try:
+                self._ensure_can_generate(owner, resource)
+                chunks = ai_service.chunk_resource(resource, chunk_size=chunk_size)
+            except (FlashcardServiceError, AIProviderError) as exc:
+                results[resource.id].error = str(exc)
+                continue
+            documents.append((resource, chunks, estimate_tokens(" ".join(chunks))))
+
+        for batch in _pack_documents(documents, budget=budget, limit=limit):
+            try:
+                with ai_requester(owner, priority="batch"):
+                    payloads = ai_service.generate_flashcard_batch(
+                        {str(resource.id): chunks for resource, chunks in batch}
+                    )
+            except AIProviderError as exc:
+                payloads = {str(resource.id): exc for resource, _ in batch}
+
+            for resource, _ in batch:
+                result = results[resource.id]
+                payload = payloads.get(str(resource.id))
+                if not isinstance(payload, FlashcardPayload):
+                    result.error = str(payload or "No result returned for resource")
+                    resource.ai_processing_status = "failed"
+                    continue
+                try:
+                    with db.session.begin_nested():
+                        result.deck = self._add_deck(
+                            owner=owner, resource=resource, payload=payload
+                        )
+                except SQLAlchemyError as exc:
+                    result.error = f"Could not save deck: {exc}"
+                    resource.ai_processing_status = "failed"
+            db.session.commit()
+
+        return [results[resource.id] for resource in resources]
 
     def update_cards(
-        self, *, deck: FlashcardDeck, cards: Iterable[dict[str, str]]
+        self,
+        *,
+        deck: FlashcardDeck,
+        cards: Iterable[dict[str, Any]],
+        expected_version: int | None = None,
     ) -> FlashcardDeck:
-        """Replace deck cards with new content."""
-        Flashcard.query.filter_by(deck_id=deck.id).delete()
+        """Apply the minimal set of changes that makes the deck match ``cards``.
+
+        Cards carrying an ``id`` update that card when its text changed; cards
+        without one are inserted, and existing cards missing from ``cards``
+        are deleted. Each kind of change runs as a single bulk statement and
+        untouched cards keep their ids and timestamps.
+
+        Raises:
+            DeckVersionConflictError: If ``expected_version`` no longer matches
+                the deck, meaning another edit was saved first.
+            FlashcardServiceError: If a card is malformed or does not belong to
+                the deck.
+        """
+        existing = {
+            card_id: (question, answer)
+            for card_id, question, answer in db.session.execute(
+                sa.select(Flashcard.id, Flashcard.question, Flashcard.answer).where(
+                    Flashcard.deck_id == deck.id
+                )
+            )
+        }
+        inserts: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        kept: set[int] = set()
+        now = datetime.utcnow()
         for card in cards:
-            flashcard = Flashcard(
-                question=card["question"], answer=card["answer"], deck=deck
+            question, answer = _card_text(card)
+            card_id = card.get("id")
+            if card_id is None:
+                inserts.append({"question": question, "answer": answer})
+                continue
+            if not isinstance(card_id, int) or isinstance(card_id, bool):
+                raise FlashcardServiceError("Card id must be an integer")
+            if card_id not in existing or card_id in kept:
+                raise FlashcardServiceError(
+                    f"Card {card_id} does not belong to this deck"
+                )
+            kept.add(card_id)
+            if existing[card_id] != (question, answer):
+                updates.append(
+                    {
+                        "id": card_id,
+                        "question": question,
+                        "answer": answer,
+                        "updated_at": now,
+                    }
+                )
+        deletes = existing.keys() - kept
+
+        version = deck.version if expected_version is None else expected_version
+        bumped = db.session.execute(
+            sa.update(FlashcardDeck)
+            .where(FlashcardDeck.id == deck.id, FlashcardDeck.version == version)
+            .values(
+                version=FlashcardDeck.version + 1,
+                card_count=FlashcardDeck.card_count + len(inserts) - len(deletes),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if bumped.rowcount != 1:
+            db.session.rollback()
+            raise DeckVersionConflictError(
+                "Deck was modified by another request; reload and try again"
+            )
+
+        if deletes:
+            db.session.execute(
+                sa.delete(Flashcard)
+                .where(Flashcard.id.in_(deletes))
+                .execution_options(synchronize_session=False)
+            )
+        if updates:
+            db.session.execute(sa.update(Flashcard), updates)
+        insert_cards(deck.id, inserts, now=now, update_count=False)
+        db.session.commit()
+        if deck.is_public:
+            invalidate_public(PUBLIC_DECKS)
+        db.session.expire(deck)
+        return deck
+
+    def set_public(self, *, deck: FlashcardDeck, is_public: bool) -> FlashcardDeck:
+        """Publish or unpublish ``deck`` and retire cached public feed pages."""
+        if deck.is_public != is_public:
+            deck.is_public = is_public
+            deck.published_at = datetime.utcnow() if is_public else None
+            db.session.commit()
+            invalidate_public(PUBLIC_DECKS)
+        return deck
+
+    def public_feed(
+        self, *, cursor: str | None = None, limit: int | None = None
+    ) -> dict[str, Any]:
+        """Return a page of public deck summaries, newest first.
+
+        Pages are keyset paginated on ``(published_at, id)``; pass the
+        returned ``next_cursor`` to fetch the following page.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed.
+        """
+        limit = limit or current_app.config.get("PUBLIC_FEED_PAGE_SIZE", 20)
+
+        stmt = (
+            sa.select(
+                FlashcardDeck.id,
+                FlashcardDeck.title,
+                FlashcardDeck.description,
+                FlashcardDeck.card_count,
+                FlashcardDeck.published_at,
+                FlashcardDeck.source_deck_id,
+                User.username.label("owner"),
+            )
+            .join(User, User.id == FlashcardDeck.owner_id)
+            .where(FlashcardDeck.is_public.is_(True))
+            .order_by(FlashcardDeck.published_at.desc(), FlashcardDeck.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            published_at, deck_id = decode_cursor(cursor, (datetime, int))
+            stmt = stmt.where(
+                sa.tuple_(FlashcardDeck.published_at, FlashcardDeck.id)
+                < (published_at, deck_id)
+            )
+        rows = db.session.execute(stmt).all()
+        last = rows[limit - 1] if len(rows) > limit else None
+        page = {
+            "items": [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "description": row.description,
+                    "card_count": row.card_count,
+                    "owner": row.owner,
+                    "published_at": row.published_at.isoformat(),
+                    "source_deck_id": row.source_deck_id,
+                }
+                for row in rows[:limit]
+            ],
+            "next_cursor": (
+                encode_cursor([last.published_at, last.id]) if last else None
+            ),
+        }
+        return page
+
+    def clone_deck(
+        self, *, owner: User, deck: FlashcardDeck, title: str | None = None
+    ) -> tuple[FlashcardDeck, int]:
+        """Copy ``deck`` into ``owner``'s library and return it with its card count.
+
+        The copy is made entirely in SQL, so large decks clone in constant
+        memory. The new deck links back to ``deck`` through ``source_deck_id``.
+        """
+        if not self.can_view(owner, deck):
+            raise FlashcardServiceError("Unauthorized to clone this deck")
+        if title is not None and (not isinstance(title, str) or not title.strip()):
+            raise FlashcardServiceError("title must be a non-empty string")
+        clone, copied = clone_deck(
+            deck.id, owner_id=owner.id, title=title.strip() if title else None
+        )
+        db.session.commit()
+        return clone, copied
+
+    def card_page(
+        self, deck: FlashcardDeck, *, cursor: str | None = None, limit: int = 100
+    ) -> dict[str, Any]:
+        """Return a page of ``deck``'s cards in id order.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed.
+        """
+        stmt = _deck_cards(deck.id).limit(limit + 1)
+        if cursor is not None:
+            (after_id,) = decode_cursor(cursor, (int,))
+            stmt = stmt.where(Flashcard.id > after_id)
+        rows = db.session.execute(stmt).all()
+        return {
+            "items": [_card_row(row) for row in rows[:limit]],
+            "next_cursor": (
+                encode_cursor([rows[limit - 1].id]) if len(rows) > limit else None
+            ),
+        }
+
+    def iter_cards(
+        self, deck: FlashcardDeck, *, batch_size: int = 500
+    ) -> Iterator[dict[str, Any]]:
+        """Yield every card of ``deck`` from a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time, so memory use does not
+        grow with the size of the deck.
+        """
+        result = db.session.execute(
+            _deck_cards(deck.id).execution_options(yield_per=batch_size)
+        )
+        try:
+            for row in result:
+                yield _card_row(row)
+        finally:
+            result.close()
+
+    def can_view(self, user: User, deck: FlashcardDeck) -> bool:
+        """Return whether ``user`` may read ``deck``."""
+        return deck.is_public or self.can_edit(user, deck)
+
+    def can_edit(self, user: User, deck: FlashcardDeck) -> bool:
+        """Return whether ``user`` may change ``deck``."""
+        return deck.owner_id == user.id or user.has_role("admin")
+
+    def _ensure_can_generate(self, owner: User, resource: Resource) -> None:
+        if resource.owner_id != owner.id and not owner.has_role("admin"):
+            raise FlashcardServiceError(
+                "Unauthorized to generate flashcards for this resource"
             )
-            db.session.add(flashcard)
+
+    def _resolve_provider(self, provider: str | None) -> AIProvider:
+        try:
+            return self._providers.get(provider)
+        except AIProviderError as exc:
+            raise FlashcardServiceError(str(exc)) from exc
+
+    def _mark_failed(self, resource: Resource) -> None:
+        resource.ai_processing_status = "failed"
+        db.session.commit()
+
+    def _persist_deck(
+        self, *, owner: User, resource: Resource, payload: FlashcardPayload
+    ) -> FlashcardDeck:
+        deck = self._add_deck(owner=owner, resource=resource, payload=payload)
         db.session.commit()
         return deck
 
+    def _add_deck(
+        self, *, owner: User, resource: Resource, payload: FlashcardPayload
+    ) -> FlashcardDeck:
+        deck = insert_deck(
+            title=f"AI Deck for {resource.original_name}",
+            description=payload.summary,
+            owner_id=owner.id,
+            resource_id=resource.id,
+            cards=payload.cards,
+        )
+        resource.ai_processing_status = "complete"
+        return deck
+
+
+def _deck_cards(deck_id: int) -> sa.Select:
+    return (
+        sa.select(Flashcard.id, Flashcard.question, Flashcard.answer)
+        .where(Flashcard.deck_id == deck_id)
+        .order_by(Flashcard.id)
+    )
+
+
+def _card_row(row: Any) -> dict[str, Any]:
+    return {"id": row.id, "question": row.question, "answer": row.answer}
+
+
+def _card_text(card: Any) -> tuple[str, str]:
+    if not isinstance(card, dict):
+        raise FlashcardServiceError("Each card must be an object")
+    question = card.get("question")
+    answer = card.get("answer")
+    if not isinstance(question, str) or not isinstance(answer, str):
+        raise FlashcardServiceError("Each card requires a question and an answer")
+    if not question.strip() or not answer.strip():
+        raise FlashcardServiceError("Each card requires a question and an answer")
+    return question, answer
+
+
+def _pack_documents(
+    documents: list[tuple[Resource, list[str], int]], *, budget: int, limit: int
+) -> list[list[tuple[Resource, list[str]]]]:
+    """Group documents first-fit-decreasing into batches within ``budget``.
+
+    A document larger than the budget on its own gets a batch to itself.
+    """
+    batches: list[list[tuple[Resource, list[str]]]] = []
+    sizes: list[int] = []
+    for resource, chunks, tokens in sorted(documents, key=lambda doc: -doc[2]):
+        for index, batch in enumerate(batches):
+            if len(batch) < limit and sizes[index] + tokens <= budget:
+                batch.append((resource, chunks))
+                sizes[index] += tokens
+                break
+        else:
+            batches.append([(resource, chunks)])
+            sizes.append(tokens)
+    return batches
+
 
-flashcard_service = FlashcardService(gemini_service)
+flashcard_service = FlashcardService(ai_providers, study_pack_service)
@@ -0,0 +1,153 @@
+"""Bulk persistence helpers for decks and their flashcards."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Mapping
+
+import sqlalchemy as sa
+
+from ..extensions import db
+from ..models import Flashcard, FlashcardDeck
+from .ai_provider import FlashcardItem
+
+CardData = FlashcardItem | Mapping[str, Any]
+
+
+def insert_deck(
+    *,
+    title: str,
+    owner_id: int,
+    cards: Iterable[CardData],
+    description: str | None = None,
+    resource_id: int | None = None,
+) -> FlashcardDeck:
+    """Insert a deck and all of its cards with two statements.
+
+    The deck row is written with ``INSERT ... RETURNING id``, already
+    carrying its ``card_count``, and the cards with one executemany insert,
+    bypassing per-object unit-of-work bookkeeping. The caller owns the
+    transaction.
+    """
+    cards = list(cards)
+    now = datetime.utcnow()
+    deck_id = db.session.execute(
+        sa.insert(FlashcardDeck)
+        .values(
+            title=title,
+            description=description,
+            owner_id=owner_id,
+            resource_id=resource_id,
+            card_count=len(cards),
+            created_at=now,
+            updated_at=now,
+        )
+        .returning(FlashcardDeck.id)
+    ).scalar_one()
+    insert_cards(deck_id, cards, now=now, update_count=False)
+    return db.session.get(FlashcardDeck, deck_id)
+
+
+def insert_cards(
+    deck_id: int,
+    cards: Iterable[CardData],
+    *,
+    now: datetime | None = None,
+    update_count: bool = True,
+) -> int:
+    """Insert ``cards`` into a deck with one executemany and return the count.
+
+    The deck's denormalized ``card_count`` is bumped by the same amount
+    unless ``update_count`` is false because the caller adjusts it itself.
+    """
+    now = now or datetime.utcnow()
+    rows = [
+        {
+            "deck_id": deck_id,
+            "question": question,
+            "answer": answer,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for question, answer in map(_card_text, cards)
+    ]
+    if rows:
+        db.session.execute(sa.insert(Flashcard), rows)
+    if rows and update_count:
+        db.session.execute(
+            sa.update(FlashcardDeck)
+            .where(FlashcardDeck.id == deck_id)
+            .values(card_count=FlashcardDeck.card_count + len(rows))
+            .execution_options(synchronize_session=False)
+        )
+    return len(rows)
+
+
+def clone_deck(
+    source_id: int, *, owner_id: int, title: str | None = None
+) -> tuple[FlashcardDeck, int]:
+    """Copy a deck and its cards for ``owner_id`` without loading the cards.
+
+    Both the deck row and the cards are copied with ``INSERT ... SELECT`` so
+    the card data never leaves the database. The copy records the original
+    in ``source_deck_id``. A copy made for another user does not keep the
+    source's ``resource_id``, since that resource is private to the source
+    owner. Returns the new deck and the number of cards copied. The caller
+    owns the transaction.
+    """
+    now = sa.literal(datetime.utcnow(), sa.DateTime)
+    deck_columns = sa.select(
+        sa.literal(title, sa.String) if title else FlashcardDeck.title,
+        FlashcardDeck.description,
+        sa.literal(owner_id, sa.Integer),
+        sa.case(
+            (FlashcardDeck.owner_id == owner_id, FlashcardDeck.resource_id),
+            else_=sa.null(),
+        ),
+        FlashcardDeck.id,
+        FlashcardDeck.card_count,
+        now,
+        now,
+    ).where(FlashcardDeck.id == source_id)
+    deck_id = db.session.execute(
+        sa.insert(FlashcardDeck)
+        .from_select(
+            [
+                "title",
+                "description",
+                "owner_id",
+                "resource_id",
+                "source_deck_id",
+                "card_count",
+                "created_at",
+                "updated_at",
+            ],
+            deck_columns,
+        )
+        .returning(FlashcardDeck.id)
+    ).scalar_one()
+
+    card_columns = (
+        sa.select(
+            Flashcard.question,
+            Flashcard.answer,
+            sa.literal(deck_id, sa.Integer),
+            now,
+            now,
+        )
+        .where(Flashcard.deck_id == source_id)
+        .order_by(Flashcard.id)
+    )
+    copied = db.session.execute(
+        sa.insert(Flashcard).from_select(
+            ["question", "answer", "deck_id", "created_at", "updated_at"],
+            card_columns,
+        )
+    ).rowcount
+    return db.session.get(FlashcardDeck, deck_id), copied
+
+
+def _card_text(card: CardData) -> tuple[str, str]:
+    if isinstance(card, FlashcardItem):
+        return card.question, card.answer
+    return card["question"], card["answer"]
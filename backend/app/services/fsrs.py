@@ -0,0 +1,169 @@
+"""FSRS memory model used to schedule flashcard reviews.
+
+The formulas follow FSRS v4.5. They are written with NumPy operations so the
+same code updates a single card during a study session and whole columns of
+review history when fitting parameters. Weights are indexed as ``w[i]``;
+each entry may be a scalar or an array that broadcasts against the inputs.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Sequence
+
+import numpy as np
+
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+RATINGS = (AGAIN, HARD, GOOD, EASY)
+DEFAULT_WEIGHTS: tuple[float, ...] = (
+    0.4872,
+    1.4003,
+    3.7145,
+    13.8206,
+    5.1618,
+    1.2298,
+    0.8975,
+    0.031,
+    1.6474,
+    0.1367,
+    1.0461,
+    2.1072,
+    0.0793,
+    0.3246,
+    1.587,
+    0.2272,
+    2.8755,
+)
+DECAY = -0.5
+FACTOR = 19 / 81
+MIN_STABILITY = 0.01
+MIN_DIFFICULTY = 1.0
+MAX_DIFFICULTY = 10.0
+
+
+def retrievability(elapsed_days: Any, stability: Any) -> Any:
+    """Return the probability of recalling a card ``elapsed_days`` after review."""
+    return (1 + FACTOR * elapsed_days / stability) ** DECAY
+
+
+def interval_for(stability: Any, desired_retention: float) -> Any:
+    """Return the days until retrievability falls to ``desired_retention``."""
+    return stability / FACTOR * (desired_retention ** (1 / DECAY) - 1)
+
+
+def initial_stability(w: Sequence[Any], rating: Any) -> Any:
+    """Return the stability after the first review of a card."""
+    return np.choose(np.asarray(rating) - 1, [w[0], w[1], w[2], w[3]])
+
+
+def initial_difficulty(w: Sequence[Any], rating: Any) -> Any:
+    """Return the difficulty after the first review of a card."""
+    return np.clip(w[4] - (rating - 3) * w[5], MIN_DIFFICULTY, MAX_DIFFICULTY)
+
+
+def next_difficulty(w: Sequence[Any], difficulty: Any, rating: Any) -> Any:
+    """Move difficulty by the rating, reverting slightly toward the default."""
+    shifted = difficulty - w[6] * (rating - 3)
+    reverted = w[7] * initial_difficulty(w, GOOD) + (1 - w[7]) * shifted
+    return np.clip(reverted, MIN_DIFFICULTY, MAX_DIFFICULTY)
+
+
+def next_stability(
+    w: Sequence[Any],
+    difficulty: Any,
+    stability: Any,
+    recall_probability: Any,
+    rating: Any,
+) -> Any:
+    """Return the stability after a repeat review with ``rating``."""
+    hard_penalty = np.where(rating == HARD, w[15], 1.0)
+    easy_bonus = np.where(rating == EASY, w[16], 1.0)
+    recalled = stability * (
+        1
+        + np.exp(w[8])
+        * (11 - difficulty)
+        * stability ** (-w[9])
+        * (np.exp((1 - recall_probability) * w[10]) - 1)
+        * hard_penalty
+        * easy_bonus
+    )
+    forgotten = (
+        w[11]
+        * difficulty ** (-w[12])
+        * ((stability + 1) ** w[13] - 1)
+        * np.exp((1 - recall_probability) * w[14])
+    )
+    return np.maximum(np.where(rating == AGAIN, forgotten, recalled), MIN_STABILITY)
+
+
+@dataclass
+class CardMemory:
+    """Memory state of a card after a review."""
+
+    stability: float
+    difficulty: float
+    due_at: datetime
+    elapsed_days: float
+    scheduled_days: float
+
+
+class FSRSScheduler:
+    """Compute the next memory state and due time for a reviewed card."""
+
+    def __init__(
+        self,
+        weights: Sequence[float] = DEFAULT_WEIGHTS,
+        *,
+        desired_retention: float = 0.9,
+        maximum_interval: float = 36500,
+    ) -> None:
+        if len(weights) != len(DEFAULT_WEIGHTS):
+            raise ValueError(f"FSRS expects {len(DEFAULT_WEIGHTS)} weights")
+        self.weights = np.asarray(weights, dtype=float)
+        self.desired_retention = desired_retention
+        self.maximum_interval = maximum_interval
+
+    def review(
+        self,
+        *,
+        rating: int,
+        reviewed_at: datetime,
+        stability: float | None = None,
+        difficulty: float | None = None,
+        last_reviewed_at: datetime | None = None,
+    ) -> CardMemory:
+        """Apply one review; omit the prior state for a card's first review."""
+        w = self.weights
+        if stability is None or difficulty is None or last_reviewed_at is None:
+            elapsed = 0.0
+            new_stability = float(initial_stability(w, rating))
+            new_difficulty = float(initial_difficulty(w, rating))
+        else:
+            elapsed = max(0.0, (reviewed_at - last_reviewed_at).total_seconds() / 86400)
+            recall = retrievability(elapsed, stability)
+            new_stability = float(
+                next_stability(w, difficulty, stability, recall, rating)
+            )
+            new_difficulty = float(next_difficulty(w, difficulty, rating))
+
+        if rating == AGAIN:
+            scheduled = 0.0
+        else:
+            scheduled = float(
+                np.clip(
+                    np.round(interval_for(new_stability, self.desired_retention)),
+                    1,
+                    self.maximum_interval,
+                )
+            )
+        due_at = reviewed_at + (
+            timedelta(days=scheduled) if scheduled else timedelta(minutes=10)
+        )
+        return CardMemory(
+            stability=new_stability,
+            difficulty=new_difficulty,
+            due_at=due_at,
+            elapsed_days=elapsed,
+            scheduled_days=scheduled,
+        )
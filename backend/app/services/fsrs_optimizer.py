@@ -0,0 +1,202 @@
+"""Vectorized fitting of per-user FSRS weights from review history."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from .fsrs import (
+    AGAIN,
+    DEFAULT_WEIGHTS,
+    GOOD,
+    initial_difficulty,
+    initial_stability,
+    next_difficulty,
+    next_stability,
+    retrievability,
+)
+
+WEIGHT_COUNT = len(DEFAULT_WEIGHTS)
+LOWER_BOUNDS = np.array(
+    [0.01, 0.01, 0.01, 0.01, 1.0, 0.01, 0.01, 0.0, 0.0, 0.0, 0.01, 0.1]
+    + [0.01, 0.01, 0.0, 0.0, 1.0]
+)
+UPPER_BOUNDS = np.array(
+    [100.0, 100.0, 100.0, 100.0, 10.0, 4.0, 4.0, 0.75, 4.5, 0.8, 3.5, 5.0]
+    + [0.25, 0.9, 4.0, 1.0, 6.0]
+)
+MAX_SEQUENCE_LENGTH = 64
+_EPSILON = 1e-6
+
+
+@dataclass
+class ReviewHistory:
+    """Review sequences of many users laid out as padded columnar arrays.
+
+    Each row of ``ratings``/``elapsed`` is one (user, card) sequence in review
+    order. Rows are sorted by length, longest first, so the sequences still
+    active at step ``t`` are always the first ``active[t]`` rows.
+    """
+
+    user_ids: np.ndarray
+    sequence_user: np.ndarray
+    ratings: np.ndarray
+    elapsed: np.ndarray
+    active: np.ndarray
+    predictions: np.ndarray
+
+    @classmethod
+    def from_columns(
+        cls,
+        user_ids: np.ndarray,
+        card_ids: np.ndarray,
+        ratings: np.ndarray,
+        elapsed_days: np.ndarray,
+    ) -> "ReviewHistory":
+        """Build sequences from review columns ordered by user, card and time."""
+        count = len(user_ids)
+        starts_mask = np.ones(count, dtype=bool)
+        if count:
+            starts_mask[1:] = (user_ids[1:] != user_ids[:-1]) | (
+                card_ids[1:] != card_ids[:-1]
+            )
+        starts = np.flatnonzero(starts_mask)
+        sequence = np.cumsum(starts_mask) - 1
+        position = np.arange(count) - starts[sequence]
+        lengths = np.minimum(np.diff(np.append(starts, count)), MAX_SEQUENCE_LENGTH)
+
+        keep_rows = position < MAX_SEQUENCE_LENGTH
+        order = np.argsort(-lengths, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        width = int(lengths.max()) if count else 0
+
+        padded_ratings = np.full((len(starts), width), GOOD, dtype=np.int8)
+        padded_elapsed = np.ones((len(starts), width), dtype=np.float64)
+        rows = rank[sequence[keep_rows]]
+        padded_ratings[rows, position[keep_rows]] = ratings[keep_rows]
+        padded_elapsed[rows, position[keep_rows]] = np.maximum(
+            elapsed_days[keep_rows], 0.0
+        )
+
+        sorted_lengths = lengths[order]
+        unique_users, sequence_user = np.unique(
+            user_ids[starts][order], return_inverse=True
+        )
+        active = (sorted_lengths[None, :] > np.arange(width)[:, None]).sum(axis=1)
+        predictions = np.bincount(
+            sequence_user,
+            weights=np.maximum(sorted_lengths - 1, 0),
+            minlength=len(unique_users),
+        )
+        return cls(
+            user_ids=unique_users,
+            sequence_user=sequence_user,
+            ratings=padded_ratings,
+            elapsed=padded_elapsed,
+            active=active,
+            predictions=predictions,
+        )
+
+    def user_losses(self, weights: np.ndarray) -> np.ndarray:
+        """Return each user's mean log loss of recall predictions.
+
+        ``weights`` has one row of FSRS weights per user in ``user_ids``.
+        """
+        w = weights[self.sequence_user].T
+        ratings = self.ratings
+        if not ratings.size:
+            return np.zeros(len(self.user_ids))
+        stability = initial_stability(w, ratings[:, 0]).astype(np.float64)
+        difficulty = initial_difficulty(w, ratings[:, 0]).astype(np.float64)
+        totals = np.zeros(len(ratings))
+        for step in range(1, ratings.shape[1]):
+            k = int(self.active[step])
+            if not k:
+                break
+            wk = w[:, :k]
+            rating = ratings[:k, step]
+            recall = np.clip(
+                retrievability(self.elapsed[:k, step], stability[:k]),
+                _EPSILON,
+                1 - _EPSILON,
+            )
+            recalled = rating > AGAIN
+            totals[:k] -= np.where(recalled, np.log(recall), np.log1p(-recall))
+            stability[:k] = next_stability(
+                wk, difficulty[:k], stability[:k], recall, rating
+            )
+            difficulty[:k] = next_difficulty(wk, difficulty[:k], rating)
+        sums = np.bincount(
+            self.sequence_user, weights=totals, minlength=len(self.user_ids)
+        )
+        return sums / np.maximum(self.predictions, 1)
+
+
+@dataclass
+class FitResult:
+    """Fitted weights per user and the losses before and after fitting."""
+
+    weights: np.ndarray
+    initial_loss: np.ndarray
+    final_loss: np.ndarray
+
+
+def fit_weights(
+    history: ReviewHistory,
+    initial: np.ndarray | None = None,
+    *,
+    iterations: int = 40,
+    learning_rate: float = 0.05,
+    step: float = 1e-4,
+    progress: Callable[[int], None] | None = None,
+) -> FitResult:
+    """Fit FSRS weights for every user in ``history`` at once with Adam.
+
+    Users are independent, so one forward pass evaluates every user's loss
+    and perturbing weight ``i`` for all users together yields each user's
+    finite-difference gradient for that weight. An iteration therefore costs
+    ``WEIGHT_COUNT + 1`` vectorized passes regardless of how many users are
+    fitted. Users whose loss does not improve keep their initial weights.
+    """
+    user_count = len(history.user_ids)
+    if initial is None:
+        initial = np.tile(np.asarray(DEFAULT_WEIGHTS), (user_count, 1))
+    weights = np.clip(initial.astype(np.float64), LOWER_BOUNDS, UPPER_BOUNDS)
+    first_moment = np.zeros_like(weights)
+    second_moment = np.zeros_like(weights)
+    beta1, beta2 = 0.9, 0.999
+    initial_loss = history.user_losses(weights)
+
+    for iteration in range(1, iterations + 1):
+        base = history.user_losses(weights)
+        gradient = np.empty_like(weights)
+        for index in range(WEIGHT_COUNT):
+            delta = step * np.maximum(np.abs(weights[:, index]), 1.0)
+            shifted = weights.copy()
+            shifted[:, index] += delta
+            gradient[:, index] = (history.user_losses(shifted) - base) / delta
+        first_moment = beta1 * first_moment + (1 - beta1) * gradient
+        second_moment = beta2 * second_moment + (1 - beta2) * gradient**2
+        corrected_first = first_moment / (1 - beta1**iteration)
+        corrected_second = second_moment / (1 - beta2**iteration)
+        scale = np.maximum(np.abs(weights), 1.0)
+        weights -= (
+            learning_rate
+            * scale
+            * corrected_first
+            / (np.sqrt(corrected_second) + 1e-8)
+        )
+        weights = np.clip(weights, LOWER_BOUNDS, UPPER_BOUNDS)
+        if progress is not None:
+            progress(iteration)
+
+    final_loss = history.user_losses(weights)
+    improved = final_loss < initial_loss
+    return FitResult(
+        weights=np.where(improved[:, None], weights, initial),
+        initial_loss=initial_loss,
+        final_loss=np.where(improved, final_loss, initial_loss),
+    )
@@ -3,112 +3,359 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from typing import Iterable, List
+import threading
+from typing import Any, Iterable, Iterator, Mapping
 
 import google.generativeai as genai
 from flask import current_app
 
 from ..models import Resource
+from .ai_provider import (
+    AIProviderError,
+    AIProviderUnavailableError,
+    FlashcardItem,
+    FlashcardPayload,
+    StudyPackPayload,
+    chunk_resource,
+    parse_card,
+)
+from .ai_scheduler import AIScheduler, QueueTimeoutError
+from .resilience import CircuitOpenError, ResilientCaller, is_transient
 
 
-@dataclass
-class FlashcardItem:
-    """Structured flashcard output."""
+class GeminiServiceError(AIProviderError):
+    """Raised when Gemini operations fail."""
 
-    question: str
-    answer: str
 
+class GeminiUnavailableError(GeminiServiceError, AIProviderUnavailableError):
+    """Raised when Gemini's circuit breaker is open or its quota is exhausted."""
 
-@dataclass
-class FlashcardPayload:
-    """AI response for flashcards and deck metadata."""
 
-    cards: List[FlashcardItem]
-    summary: str
+class GeminiConfigurationError(GeminiServiceError):
+    """Raised when Gemini is not configured; never bypassed by a fallback."""
 
 
-class GeminiServiceError(Exception):
-    """Raised when Gemini operations fail."""
+FLASHCARD_PROMPT = (
+    "You are an instructional designer. Given the following study text, generate "
+    "exactly 5 high-quality flashcards with question and answer fields in JSON list format. "
+    "Also produce a concise summary paragraph capturing the key concept. "
+    "Respond strictly as JSON with keys 'flashcards' and 'summary'."
+)
+
+STUDY_PACK_PROMPT = (
+    "You are an instructional designer. Given the following study text, generate "
+    "exactly 5 high-quality flashcards with question and answer fields in JSON list format, "
+    "a concise summary paragraph capturing the key concept, and a structured lesson "
+    "that teaches the material in plain text with short sections. "
+    "Respond strictly as JSON with keys 'flashcards', 'summary' and 'lesson'."
+)
+
+
+class FlashcardStreamParser:
+    """Incrementally extract flashcards from a streamed JSON response.
+
+    Text fragments are fed as they arrive; every object inside the top-level
+    ``flashcards`` array is decoded as soon as its closing brace is seen, so
+    callers can forward cards long before the full document is complete.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: list[str] = []
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = ""
+        self._last_key = ""
+        self._array_key: str | None = None
+        self._object_start: int | None = None
+        self._text = ""
+
+    @property
+    def text(self) -> str:
+        """Return all text received so far."""
+        if len(self._text) != self._length:
+            self._text = "".join(self._buffer)
+        return self._text
+
+    def feed(self, fragment: str) -> list[FlashcardItem]:
+        """Consume a text fragment and return any newly completed cards."""
+        if not fragment:
+            return []
+        offset = self._length
+        self._buffer.append(fragment)
+        self._length += len(fragment)
+
+        cards: list[FlashcardItem] = []
+        for index, char in enumerate(fragment, start=offset):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = self.text[self._string_start + 1 : index]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char == ":" and self._depth == 1:
+                self._last_key = self._last_string
+            elif char in "{[":
+                self._depth += 1
+                if char == "[" and self._depth == 2:
+                    self._array_key = self._last_key
+                elif (
+                    char == "{"
+                    and self._depth == 3
+                    and self._array_key == "flashcards"
+                ):
+                    self._object_start = index
+            elif char in "}]":
+                if char == "}" and self._depth == 3 and self._object_start is not None:
+                    card = self._decode_card(self.text[self._object_start : index + 1])
+                    if card:
+                        cards.append(card)
+                    self._object_start = None
+                self._depth -= 1
+                if self._depth <= 1:
+                    self._array_key = None
+        return cards
+
+    def finish(self, cards: list[FlashcardItem]) -> FlashcardPayload:
+        """Validate the complete document and return the final payload."""
+        payload = _load_json(self.text)
+        if "summary" not in payload:
+            raise GeminiServiceError("Gemini response missing required fields")
+        if not cards:
+            raise GeminiServiceError("No flashcards produced by Gemini")
+        return FlashcardPayload(
+            cards=cards, summary=payload["summary"], source=GeminiService.name
+        )
+
+    @staticmethod
+    def _decode_card(raw: str) -> FlashcardItem | None:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return parse_card(item)
+
+
+BATCH_FLASHCARD_PROMPT = (
+    "You are an instructional designer. The text below contains several "
+    "independent study documents, each introduced by a line of the form "
+    "'### Document <id>'. For every document, using only that document's text, "
+    "generate exactly 5 high-quality flashcards with question and answer fields "
+    "and a concise summary paragraph capturing the key concept. "
+    "Respond strictly as JSON with a key 'results' holding a list of objects with "
+    "keys 'id', 'flashcards' and 'summary', one per document."
+)
 
 
 class GeminiService:
     """Encapsulates communication with Google Gemini."""
 
-    def __init__(self) -> None:
+    name = "gemini"
+
+    def __init__(
+        self,
+        transport: ResilientCaller | None = None,
+        scheduler: AIScheduler | None = None,
+    ) -> None:
         self._model_name = "gemini-1.5-pro"
+        self._transport = transport
+        self._scheduler = scheduler
+        self._init_lock = threading.Lock()
+
+    @property
+    def transport(self) -> ResilientCaller:
+        """Return the retrying, circuit-breaking caller used for Gemini requests."""
+        if self._transport is None:
+            with self._init_lock:
+                if self._transport is None:
+                    self._transport = ResilientCaller.from_config(
+                        current_app.config, "GEMINI_"
+                    )
+        return self._transport
+
+    @property
+    def scheduler(self) -> AIScheduler:
+        """Return the fair-share scheduler enforcing the Gemini request quota."""
+        if self._scheduler is None:
+            with self._init_lock:
+                if self._scheduler is None:
+                    self._scheduler = AIScheduler.from_config(
+                        current_app.config, "GEMINI_"
+                    )
+        return self._scheduler
 
     def _init_client(self) -> genai.GenerativeModel:
         api_key = current_app.config.get("GOOGLE_GEMINI_API_KEY")
         if not api_key:
-            raise GeminiServiceError("Gemini API key not configured")
+            raise GeminiConfigurationError("Gemini API key not configured")
         genai.configure(api_key=api_key)
         return genai.GenerativeModel(self._model_name)
 
     def chunk_resource(self, resource: Resource, *, chunk_size: int = 800) -> list[str]:
         """Chunk resource content for AI processing."""
-        if chunk_size <= 0:
-            raise GeminiServiceError("chunk_size must be positive")
+        return chunk_resource(resource, chunk_size=chunk_size)
+
+    def generate_flashcards(self, chunks: Iterable[str]) -> FlashcardPayload:
+        """Generate flashcards and summary from text chunks."""
+        model = self._init_client()
+        response = self._generate(model, _build_prompt(FLASHCARD_PROMPT, chunks))
+        if not response or not response.text:
+            raise GeminiServiceError("Empty response from Gemini")
+        payload = _load_json(response.text)
+        if "flashcards" not in payload or "summary" not in payload:
+            raise GeminiServiceError("Gemini response missing required fields")
+
+        cards = [
+            card for card in map(parse_card, payload["flashcards"]) if card is not None
+        ]
+        if not cards:
+            raise GeminiServiceError("No flashcards produced by Gemini")
+        summary = payload["summary"]
+        return FlashcardPayload(cards=cards, summary=summary, source=self.name)
 
-        text_source = (resource.text_content or resource.description or "").strip()
-        if not text_source:
-            raise GeminiServiceError("Resource missing textual content")
+    def generate_study_pack(self, chunks: Iterable[str]) -> StudyPackPayload:
+        """Generate flashcards, summary and lesson body in a single request."""
+        model = self._init_client()
+        response = self._generate(model, _build_prompt(STUDY_PACK_PROMPT, chunks))
+        if not response or not response.text:
+            raise GeminiServiceError("Empty response from Gemini")
+        payload = _load_json(response.text)
+        if any(key not in payload for key in ("flashcards", "summary", "lesson")):
+            raise GeminiServiceError("Gemini response missing required fields")
 
-        words = text_source.split()
-        if not words:
-            raise GeminiServiceError("Resource text could not be tokenized")
+        pack = StudyPackPayload.from_dict({**payload, "source": self.name})
+        if not pack.cards:
+            raise GeminiServiceError("No flashcards produced by Gemini")
+        return pack
 
-        chunks: list[str] = []
-        current_chunk: list[str] = []
-        current_length = 0
+    def generate_flashcard_batch(
+        self, documents: Mapping[str, Iterable[str]]
+    ) -> dict[str, FlashcardPayload | AIProviderError]:
+        """Generate flashcards for several documents in a single request.
 
-        for word in words:
-            word_length = len(word) + 1  # include a space
-            if current_chunk and current_length + word_length > chunk_size:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = [word]
-                current_length = len(word)
-            else:
-                current_chunk.append(word)
-                current_length += word_length
+        Returns a payload per document id, or the error for documents the
+        response omitted or left incomplete, so one bad item does not fail the
+        rest. Errors affecting the whole request are raised.
+        """
+        model = self._init_client()
+        response = self._generate(model, _build_batch_prompt(documents))
+        if not response or not response.text:
+            raise GeminiServiceError("Empty response from Gemini")
+        results = _load_json(response.text).get("results")
+        if not isinstance(results, list):
+            raise GeminiServiceError("Gemini response missing required fields")
 
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
+        by_id = {
+            str(item.get("id")): item for item in results if isinstance(item, dict)
+        }
+        payloads: dict[str, FlashcardPayload | AIProviderError] = {}
+        for key in documents:
+            item = by_id.get(key)
+            if item is None:
+                payloads[key] = GeminiServiceError("Gemini omitted this document")
+                continue
+            cards = [
+                card
+                for card in map(parse_card, item.get("flashcards") or [])
+                if card is not None
+            ]
+            if not cards or not item.get("summary"):
+                payloads[key] = GeminiServiceError(
+                    "Gemini response missing required fields"
+                )
+                continue
+            payloads[key] = FlashcardPayload(
+                cards=cards, summary=item["summary"], source=self.name
+            )
+        return payloads
 
-        return chunks
+    def stream_flashcards(
+        self, chunks: Iterable[str]
+    ) -> Iterator[FlashcardItem | FlashcardPayload]:
+        """Stream flashcards as Gemini produces them.
 
-    def generate_flashcards(self, chunks: Iterable[str]) -> FlashcardPayload:
-        """Generate flashcards and summary from text chunks."""
+        Yields each :class:`FlashcardItem` as soon as it is complete and finally
+        the full :class:`FlashcardPayload` once the response has been validated.
+        """
         model = self._init_client()
-        prompt = (
-            "You are an instructional designer. Given the following study text, generate "
-            "exactly 5 high-quality flashcards with question and answer fields in JSON list format. "
-            "Also produce a concise summary paragraph capturing the key concept. "
-            "Respond strictly as JSON with keys 'flashcards' and 'summary'."
+        response = self._generate(
+            model, _build_prompt(FLASHCARD_PROMPT, chunks), stream=True
         )
-        combined_text = "\n\n".join(chunks)
-        response = model.generate_content(f"{prompt}\n\nText:\n{combined_text}")
-        if not response or not response.text:
+
+        parser = FlashcardStreamParser()
+        cards: list[FlashcardItem] = []
+        try:
+            for chunk in response:
+                for card in parser.feed(getattr(chunk, "text", "") or ""):
+                    cards.append(card)
+                    yield card
+        except GeminiServiceError:
+            raise
+        except Exception as exc:  # pragma: no cover - SDK transport errors
+            raise GeminiServiceError(f"Gemini stream interrupted: {exc}") from exc
+
+        if not parser.text:
             raise GeminiServiceError("Empty response from Gemini")
+        yield parser.finish(cards)
+
+    def _generate(self, model: genai.GenerativeModel, prompt: str, **kwargs: Any):
+        """Call the model through the resilient transport.
+
+        Quota is taken from the scheduler for every request the transport
+        sends, including retries and hedged duplicates.
+        """
+        call = self.transport.stream if kwargs.get("stream") else self.transport.call
         try:
-            payload = json.loads(response.text)
-        except json.JSONDecodeError as exc:
-            raise GeminiServiceError("Gemini returned invalid JSON") from exc
+            return call(
+                lambda: model.generate_content(prompt, **kwargs),
+                acquire=self.scheduler.acquire,
+            )
+        except QueueTimeoutError as exc:
+            raise GeminiUnavailableError(str(exc)) from exc
+        except CircuitOpenError as exc:
+            raise GeminiUnavailableError("Gemini is temporarily unavailable") from exc
+        except Exception as exc:
+            if is_transient(exc):
+                raise GeminiUnavailableError(f"Gemini is unavailable: {exc}") from exc
+            raise GeminiServiceError(f"Gemini request failed: {exc}") from exc
 
-        if "flashcards" not in payload or "summary" not in payload:
-            raise GeminiServiceError("Gemini response missing required fields")
 
-        cards: list[FlashcardItem] = []
-        for item in payload["flashcards"]:
-            question = item.get("question")
-            answer = item.get("answer")
-            if not question or not answer:
-                continue
-            cards.append(FlashcardItem(question=question, answer=answer))
-        if not cards:
-            raise GeminiServiceError("No flashcards produced by Gemini")
-        summary = payload["summary"]
-        return FlashcardPayload(cards=cards, summary=summary)
+def _build_prompt(instructions: str, chunks: Iterable[str]) -> str:
+    """Combine prompt instructions with the resource text."""
+    combined_text = "\n\n".join(chunks)
+    return f"{instructions}\n\nText:\n{combined_text}"
+
+
+def _build_batch_prompt(documents: Mapping[str, Iterable[str]]) -> str:
+    """Combine the batch instructions with each document under its id."""
+    sections = [
+        f"### Document {key}\n" + "\n\n".join(chunks)
+        for key, chunks in documents.items()
+    ]
+    return f"{BATCH_FLASHCARD_PROMPT}\n\nText:\n" + "\n\n".join(sections)
+
+
+def _load_json(text: str) -> dict[str, Any]:
+    """Decode a JSON object, tolerating a surrounding Markdown code fence."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else ""
+        cleaned = cleaned.rsplit("```", 1)[0]
+    try:
+        payload = json.loads(cleaned)
+    except json.JSONDecodeError as exc:
+        raise GeminiServiceError("Gemini returned invalid JSON") from exc
+    if not isinstance(payload, dict):
+        raise GeminiServiceError("Gemini returned invalid JSON")
+    return payload
 
 
 gemini_service = GeminiService()
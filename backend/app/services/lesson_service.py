@@ -2,9 +2,26 @@
 
 from __future__ import annotations
 
+from datetime import datetime
+from typing import Any, Sequence
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
 from ..extensions import db
-from ..models import Lesson, Resource, User
-from .gemini_service import GeminiService, GeminiServiceError, gemini_service
+from ..models import Category, FlashcardDeck, Lesson, Resource, User
+from ..models.category import lesson_categories
+from ..utils.http_cache import PUBLIC_LESSONS, invalidate_public
+from ..utils.pagination import decode_cursor, encode_cursor
+from .ai_provider import AIProviderError, StudyPackPayload
+from .ai_scheduler import ai_requester
+from .flashcard_service import (
+    FlashcardService,
+    FlashcardServiceError,
+    flashcard_service,
+)
+from .study_pack_service import StudyPackService, study_pack_service
 
 
 class LessonServiceError(Exception):
@@ -14,25 +31,66 @@ class LessonServiceError(Exception):
 class LessonService:
     """Encapsulates lesson workflows."""
 
-    def __init__(self, ai_service: GeminiService) -> None:
-        self._ai_service = ai_service
+    def __init__(
+        self, study_packs: StudyPackService, decks: FlashcardService
+    ) -> None:
+        self._study_packs = study_packs
+        self._decks = decks
+
+    def generate_lesson(
+        self, *, author: User, resource: Resource, provider: str | None = None
+    ) -> Lesson:
+        """Generate a lesson from a resource.
+
+        The lesson is built from the resource's shared study pack, so a deck
+        generated for the same resource reuses the same AI response.
+        """
+        lesson, _ = self._add_lesson(
+            author=author, resource=resource, provider=provider
+        )
+        db.session.commit()
+        return lesson
+
+    def generate_lesson_with_deck(
+        self, *, author: User, resource: Resource, provider: str | None = None
+    ) -> tuple[Lesson, FlashcardDeck]:
+        """Generate a lesson and a flashcard deck from one study pack.
+
+        Both are built from the same pack, so an uncached fallback pack is
+        not generated twice, and they are committed together: if the deck
+        cannot be created, neither is saved.
+        """
+        lesson, pack = self._add_lesson(
+            author=author, resource=resource, provider=provider
+        )
+        try:
+            deck = self._decks.add_study_pack_deck(
+                owner=author, resource=resource, pack=pack
+            )
+        except (FlashcardServiceError, SQLAlchemyError) as exc:
+            db.session.rollback()
+            raise LessonServiceError(f"Could not create deck: {exc}") from exc
+        db.session.commit()
+        return lesson, deck
 
-    def generate_lesson(self, *, author: User, resource: Resource) -> Lesson:
-        """Generate a lesson from a resource."""
+    def _add_lesson(
+        self, *, author: User, resource: Resource, provider: str | None
+    ) -> tuple[Lesson, StudyPackPayload]:
         if resource.owner_id != author.id and not author.has_role("admin"):
             raise LessonServiceError(
                 "Unauthorized to generate lesson for this resource"
             )
         try:
-            chunks = self._ai_service.chunk_resource(resource, chunk_size=1000)
-            payload = self._ai_service.generate_flashcards(chunks)
-        except GeminiServiceError as exc:  # pragma: no cover - relies on external API
+            with ai_requester(author):
+                payload = self._study_packs.get_study_pack(resource, provider=provider)
+        except AIProviderError as exc:  # pragma: no cover - relies on external API
             resource.ai_processing_status = "failed"
             db.session.commit()
             raise LessonServiceError(str(exc)) from exc
         lesson = Lesson(
             title=f"Lesson on {resource.original_name}",
-            content="\n".join(
+            content=payload.lesson
+            or "\n".join(
                 f"Q: {card.question}\nA: {card.answer}" for card in payload.cards
             ),
             summary=payload.summary,
@@ -42,14 +100,88 @@ class LessonService:
         )
         db.session.add(lesson)
         resource.ai_processing_status = "complete"
-        db.session.commit()
-        return lesson
+        return lesson, payload
 
     def publish_lesson(self, lesson: Lesson) -> Lesson:
         """Publish a lesson."""
         lesson.status = "published"
         db.session.commit()
+        invalidate_public(PUBLIC_LESSONS)
         return lesson
 
+    def catalog(
+        self,
+        *,
+        categories: Sequence[str] = (),
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> dict[str, Any]:
+        """Return a page of published lesson summaries, newest first.
+
+        Only summary columns are selected; lesson content is never loaded.
+        ``categories`` keeps lessons tagged with any of the named categories.
+        Pages are keyset paginated on ``(created_at, id)``.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed.
+        """
+        limit = limit or current_app.config.get("LESSON_CATALOG_PAGE_SIZE", 20)
+        categories = sorted(set(categories))
+
+        stmt = (
+            sa.select(
+                Lesson.id,
+                Lesson.title,
+                Lesson.summary,
+                Lesson.created_at,
+                User.username.label("author"),
+            )
+            .outerjoin(User, User.id == Lesson.author_id)
+            .where(Lesson.status == "published")
+            .order_by(Lesson.created_at.desc(), Lesson.id.desc())
+            .limit(limit + 1)
+        )
+        if categories:
+            stmt = stmt.where(
+                sa.exists()
+                .where(lesson_categories.c.lesson_id == Lesson.id)
+                .where(lesson_categories.c.category_id == Category.id)
+                .where(Category.name.in_(categories))
+            )
+        if cursor is not None:
+            created_at, lesson_id = decode_cursor(cursor, (datetime, int))
+            stmt = stmt.where(
+                sa.tuple_(Lesson.created_at, Lesson.id) < (created_at, lesson_id)
+            )
+        rows = db.session.execute(stmt).all()
+        page_rows = rows[:limit]
+
+        tags: dict[int, list[str]] = {row.id: [] for row in page_rows}
+        if tags:
+            for lesson_id, name in db.session.execute(
+                sa.select(lesson_categories.c.lesson_id, Category.name)
+                .join(Category, Category.id == lesson_categories.c.category_id)
+                .where(lesson_categories.c.lesson_id.in_(tags))
+                .order_by(Category.name)
+            ):
+                tags[lesson_id].append(name)
+
+        last = rows[limit - 1] if len(rows) > limit else None
+        page = {
+            "items": [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "summary": row.summary,
+                    "author": row.author,
+                    "categories": tags[row.id],
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in page_rows
+            ],
+            "next_cursor": encode_cursor([last.created_at, last.id]) if last else None,
+        }
+        return page
+
 
-lesson_service = LessonService(gemini_service)
+lesson_service = LessonService(study_pack_service, flashcard_service)
@@ -0,0 +1,153 @@
+"""Strip extraction noise from resource text before it is sent to a model."""
+
+from __future__ import annotations
+
+import math
+import re
+import zlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+PAGE_BREAK = "\f"
+SHINGLE_SIZE = 5
+NEAR_DUPLICATE_THRESHOLD = 0.8
+MIN_REPEATED_PAGES = 3
+REPEATED_LINE_RATIO = 0.5
+EDGE_LINES = 3
+
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d{1,6}(?:\s*(?:of|/)\s*\d{1,6})?$", re.I)
+_DIGITS = re.compile(r"\d+")
+_URL_ONLY = re.compile(r"^(?:https?://|www\.)\S+$", re.IGNORECASE)
+_BOILERPLATE = re.compile(
+    r"^(?:©|\(c\)|copyright\b|all rights reserved|confidential\b"
+    r"|this page (?:is )?intentionally left blank)",
+    re.IGNORECASE,
+)
+_LEADER_DOTS = re.compile(r"(?:\s*\.){4,}\s*\d*\s*$")
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class CompactionResult:
+    """Compacted text along with estimated prompt token counts."""
+
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        """Return how many prompt tokens compaction removed."""
+        return self.original_tokens - self.compacted_tokens
+
+    @property
+    def saved_ratio(self) -> float:
+        """Return the fraction of prompt tokens removed."""
+        if not self.original_tokens:
+            return 0.0
+        return self.saved_tokens / self.original_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate model tokens using the common four-characters-per-token rule."""
+    collapsed = " ".join(text.split())
+    return (len(collapsed) + 3) // 4
+
+
+def compact_text(text: str) -> CompactionResult:
+    """Remove repeated page furniture, near-duplicate paragraphs and noise.
+
+    Pages are separated by form feeds (as stored by the resource extractor).
+    Lines near the top or bottom of a page that recur on at least half of the
+    pages (running headers and footers, with digits ignored so "Page 3"
+    matches "Page 4") are dropped,
+    as are page numbers, boilerplate notices and leader-dot contents lines.
+    Formulas and numeric tables are kept even when they contain no letters.
+    Paragraphs whose hashed word shingles are at least
+    ``NEAR_DUPLICATE_THRESHOLD`` contained in an earlier paragraph are removed;
+    paragraphs without words are only removed when repeated exactly.
+    """
+    pages = [page.splitlines() for page in text.split(PAGE_BREAK)]
+    repeated = _repeated_lines(pages)
+
+    paragraphs: list[str] = []
+    for lines in pages:
+        current: list[str] = []
+        for raw in lines:
+            line = " ".join(raw.split())
+            if not line:
+                if current:
+                    paragraphs.append(" ".join(current))
+                    current = []
+                continue
+            if _is_low_information(line) or _line_key(line) in repeated:
+                continue
+            current.append(line)
+        if current:
+            paragraphs.append(" ".join(current))
+
+    compacted = "\n\n".join(_drop_near_duplicates(paragraphs))
+    return CompactionResult(
+        text=compacted,
+        original_tokens=estimate_tokens(text),
+        compacted_tokens=estimate_tokens(compacted),
+    )
+
+
+def _line_key(line: str) -> str:
+    return _DIGITS.sub("#", line.lower())
+
+
+def _repeated_lines(pages: list[list[str]]) -> set[str]:
+    """Return normalized page-edge lines that recur on many of the pages."""
+    if len(pages) < MIN_REPEATED_PAGES:
+        return set()
+    counts: Counter[str] = Counter()
+    for lines in pages:
+        content = [" ".join(line.split()) for line in lines if line.strip()]
+        edges = content[:EDGE_LINES] + content[-EDGE_LINES:]
+        counts.update({_line_key(line) for line in edges})
+    threshold = max(MIN_REPEATED_PAGES, math.ceil(len(pages) * REPEATED_LINE_RATIO))
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def _is_low_information(line: str) -> bool:
+    return bool(
+        _PAGE_NUMBER.match(line)
+        or _URL_ONLY.match(line)
+        or _BOILERPLATE.match(line)
+        or _LEADER_DOTS.search(line)
+    )
+
+
+def _shingles(paragraph: str) -> set[int]:
+    words = _WORD.findall(paragraph.lower())
+    if not words:
+        return {zlib.crc32(paragraph.encode("utf-8"))}
+    if len(words) < SHINGLE_SIZE:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(words[index : index + SHINGLE_SIZE]).encode("utf-8"))
+        for index in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def _drop_near_duplicates(paragraphs: list[str]) -> list[str]:
+    """Keep paragraphs unless their shingles mostly repeat a kept paragraph."""
+    kept: list[str] = []
+    index: defaultdict[int, list[int]] = defaultdict(list)
+    for paragraph in paragraphs:
+        shingles = _shingles(paragraph)
+        overlaps: Counter[int] = Counter()
+        for shingle in shingles:
+            overlaps.update(index.get(shingle, ()))
+        if any(
+            shared / len(shingles) >= NEAR_DUPLICATE_THRESHOLD
+            for shared in overlaps.values()
+        ):
+            continue
+        position = len(kept)
+        kept.append(paragraph)
+        for shingle in shingles:
+            index[shingle].append(position)
+    return kept
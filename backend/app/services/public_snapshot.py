@@ -0,0 +1,182 @@
+"""Static snapshots of public endpoint payloads.
+
+Each snapshotted endpoint is written under ``PUBLIC_SNAPSHOT_DIR`` at its
+URL path with a ``.json`` suffix, next to a gzip copy for proxies that serve
+precompressed files (for example nginx ``gzip_static``)::
+
+    api/v1/public/faq.json
+    api/v1/public/faq.json.gz
+    manifest.json
+
+``manifest.json`` lists every file with its ETag, sizes and build time.
+Builds hold an exclusive lock on ``.lock`` in the directory, so concurrent
+builds never lose each other's manifest entries. The live endpoints serve
+these files when the database cannot answer.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+from flask import (
+    Flask,
+    Response,
+    after_this_request,
+    current_app,
+    g,
+    has_request_context,
+)
+
+from ..utils.http_cache import PUBLIC_BLOG, PUBLIC_DECKS, PUBLIC_FAQ, PUBLIC_LESSONS
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PATHS: dict[str, str] = {
+    PUBLIC_LESSONS: "/api/v1/public/lessons",
+    PUBLIC_DECKS: "/api/v1/public/flashcards",
+    PUBLIC_BLOG: "/api/v1/public/blog",
+    PUBLIC_FAQ: "/api/v1/public/faq",
+}
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be built."""
+
+
+def snapshot_dir(app: Flask | None = None) -> Path:
+    """Return the directory snapshots are written to."""
+    return Path((app or current_app).config["PUBLIC_SNAPSHOT_DIR"])
+
+
+def build_snapshot(
+    app: Flask, namespaces: Iterable[str] | None = None
+) -> dict[str, Any]:
+    """Render public payloads for ``namespaces`` (default: all) to static files.
+
+    Payloads are fetched through the application itself, so snapshots match
+    the live responses byte for byte. Files and the manifest are replaced
+    atomically. Returns the updated manifest.
+
+    Raises:
+        SnapshotError: If an endpoint does not answer with ``200``.
+    """
+    directory = snapshot_dir(app)
+    directory.mkdir(parents=True, exist_ok=True)
+    with (directory / LOCK_NAME).open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = read_manifest(directory)
+        files = manifest.setdefault("files", {})
+        client = app.test_client()
+        for namespace in namespaces or SNAPSHOT_PATHS:
+            path = SNAPSHOT_PATHS.get(namespace)
+            if path is None:
+                continue
+            response = client.get(path)
+            if response.status_code != 200:
+                raise SnapshotError(f"{path} returned {response.status_code}")
+            body = response.get_data()
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            target = directory / f"{path.lstrip('/')}.json"
+            _write_atomic(target, body)
+            _write_atomic(target.with_name(f"{target.name}.gz"), compressed)
+            files[path] = {
+                "file": str(target.relative_to(directory)),
+                "etag": hashlib.sha256(body).hexdigest(),
+                "size": len(body),
+                "gzip_size": len(compressed),
+                "built_at": datetime.utcnow().isoformat(),
+            }
+        manifest["generated_at"] = datetime.utcnow().isoformat()
+        _write_atomic(
+            directory / MANIFEST_NAME, json.dumps(manifest, indent=2).encode()
+        )
+    return manifest
+
+
+def refresh_snapshot(namespaces: Iterable[str]) -> None:
+    """Rebuild snapshot files for ``namespaces`` if ``PUBLIC_SNAPSHOT_ON_PUBLISH``.
+
+    Inside a request the rebuild runs once, after the response has been
+    sent, for every namespace refreshed during the request; elsewhere it
+    runs immediately. Failures are logged rather than raised so publishing
+    never fails because a snapshot could not be written.
+    """
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    if not app.config.get("PUBLIC_SNAPSHOT_ON_PUBLISH"):
+        return
+    selected = [namespace for namespace in namespaces if namespace in SNAPSHOT_PATHS]
+    if not selected:
+        return
+    if not has_request_context():
+        _rebuild(app, selected)
+        return
+    pending: set[str] | None = g.get("_snapshot_namespaces")
+    if pending is None:
+        pending = g._snapshot_namespaces = set()
+
+        @after_this_request
+        def schedule(response: Response) -> Response:
+            response.call_on_close(lambda: _rebuild(app, sorted(pending)))
+            return response
+
+    pending.update(selected)
+
+
+def _rebuild(app: Flask, namespaces: list[str]) -> None:
+    with app.app_context():
+        try:
+            build_snapshot(app, namespaces)
+        except (SnapshotError, OSError):
+            logger.exception("Could not refresh public snapshot for %s", namespaces)
+
+
+def read_manifest(directory: Path) -> dict[str, Any]:
+    """Return the manifest stored in ``directory`` or an empty one."""
+    try:
+        return json.loads((directory / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {"files": {}}
+
+
+def load_snapshot(path: str) -> tuple[bytes, bytes | None, dict[str, Any]] | None:
+    """Return the snapshot body, its gzip copy and manifest entry for ``path``.
+
+    The gzip copy is ``None`` if it is missing.
+    """
+    directory = snapshot_dir()
+    entry = read_manifest(directory).get("files", {}).get(path)
+    if entry is None:
+        return None
+    target = directory / entry["file"]
+    try:
+        body = target.read_bytes()
+    except OSError:
+        return None
+    try:
+        compressed: bytes | None = target.with_name(f"{target.name}.gz").read_bytes()
+    except OSError:
+        compressed = None
+    return body, compressed, entry
+
+
+def _write_atomic(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_name, target)
+    except OSError:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,363 @@
+"""Retry, circuit breaker and hedging primitives for outbound AI calls."""
+
+from __future__ import annotations
+
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Iterable, Iterator, Mapping, TypeVar
+
+T = TypeVar("T")
+
+try:  # pragma: no cover - exercised when the Google SDK is installed
+    from google.api_core import exceptions as google_exceptions
+
+    _TRANSIENT_GOOGLE_ERRORS: tuple[type[BaseException], ...] = (
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.TooManyRequests,
+    )
+except ImportError:  # pragma: no cover - SDK is a hard dependency in production
+    _TRANSIENT_GOOGLE_ERRORS = ()
+
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    *_TRANSIENT_GOOGLE_ERRORS,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+class CallTimeoutError(TimeoutError):
+    """Raised when a call exceeds its overall time budget."""
+
+
+class _HedgeSkipped(Exception):
+    """A hedged request was not sent because it could not acquire quota."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Return whether an error is worth retrying."""
+    return isinstance(exc, TRANSIENT_ERRORS)
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    sleep: Callable[[float], None] = time.sleep
+
+    def delay(self, attempt: int) -> float:
+        """Return the jittered delay before retry number ``attempt`` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+@dataclass
+class CircuitBreaker:
+    """Fail fast after repeated failures until the upstream recovers.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. It then lets a single trial
+    call through (half-open); success closes it again, failure re-opens it.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    _failures: int = field(default=0, init=False)
+    _opened_at: float | None = field(default=None, init=False)
+    _trial_in_flight: bool = field(default=False, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    @property
+    def state(self) -> str:
+        """Return ``closed``, ``open`` or ``half_open``."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Reserve permission for a call or raise :class:`CircuitOpenError`."""
+        with self._lock:
+            state = self._state()
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                raise CircuitOpenError("Circuit breaker is open")
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def release(self) -> None:
+        """Give back a reservation from :meth:`before_call` that was not used."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._trial_in_flight = False
+
+
+@dataclass
+class _OpenedStream(Generic[T]):
+    """A stream whose first chunk has already been read."""
+
+    iterator: Iterator[T]
+    head: list[T]
+
+    def close(self) -> None:
+        close = getattr(self.iterator, "close", None)
+        if close is not None:
+            close()
+
+
+class ResilientCaller:
+    """Run a callable with retries, a circuit breaker, a deadline and hedging.
+
+    Each attempt runs on a worker thread so the overall ``timeout`` can be
+    enforced. When ``hedge_delay`` is set and an attempt has not finished
+    within that many seconds, a second identical request is launched and the
+    first successful result wins and the losing attempt is cancelled, or
+    closed once it returns. Only :func:`is_transient` errors are retried and
+    counted by the breaker; anything else, such as a rejected prompt, says
+    nothing about the upstream's health and propagates immediately.
+
+    An ``acquire`` hook passed to :meth:`call` or :meth:`stream` runs before
+    every request sent upstream, retries and hedges included, so a rate
+    limiter sees each real provider call. It runs only once the breaker has
+    admitted the attempt, so no quota is spent on calls rejected by an open
+    breaker. Errors it raises propagate unchanged without counting against
+    the breaker; a hedge that cannot acquire quota is simply not sent.
+    """
+
+    def __init__(
+        self,
+        *,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        timeout: float | None = None,
+        hedge_delay: float | None = None,
+        max_workers: int = 8,
+    ) -> None:
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ai-call"
+        )
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], prefix: str) -> "ResilientCaller":
+        """Build a caller from ``<prefix>*`` configuration keys."""
+        return cls(
+            retry=RetryPolicy(
+                max_attempts=int(config.get(f"{prefix}MAX_ATTEMPTS", 3)),
+                base_delay=float(config.get(f"{prefix}BACKOFF_BASE", 0.5)),
+                max_delay=float(config.get(f"{prefix}BACKOFF_MAX", 8.0)),
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=int(config.get(f"{prefix}BREAKER_THRESHOLD", 5)),
+                reset_timeout=float(config.get(f"{prefix}BREAKER_RESET", 30.0)),
+            ),
+            timeout=config.get(f"{prefix}TIMEOUT"),
+            hedge_delay=config.get(f"{prefix}HEDGE_DELAY"),
+        )
+
+    def call(
+        self, fn: Callable[[], T], *, acquire: Callable[[], Any] | None = None
+    ) -> T:
+        """Invoke ``fn`` under the configured resilience policies."""
+        return self._call(fn, acquire, settle=True)
+
+    def stream(
+        self,
+        fn: Callable[[], Iterable[T]],
+        *,
+        acquire: Callable[[], Any] | None = None,
+    ) -> Iterator[T]:
+        """Open the stream returned by ``fn`` under the resilience policies.
+
+        The stream is opened and its first chunk read inside the retry loop,
+        so connection failures are retried like any other call. A stream
+        cannot be replayed once chunks have been handed out, so a failure
+        while iterating is reported to the breaker and raised to the
+        consumer. The breaker records success once the stream is exhausted
+        or closed.
+        """
+
+        def open_stream() -> _OpenedStream[T]:
+            iterator = iter(fn())
+            for first in iterator:
+                return _OpenedStream(iterator, [first])
+            return _OpenedStream(iterator, [])
+
+        opened = self._call(open_stream, acquire, settle=False)
+        return self._relay(opened)
+
+    def _relay(self, opened: _OpenedStream[T]) -> Iterator[T]:
+        failed = False
+        try:
+            yield from opened.head
+            yield from opened.iterator
+        except Exception as exc:
+            failed = True
+            if is_transient(exc):
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            raise
+        finally:
+            if not failed:
+                self.breaker.record_success()
+            opened.close()
+
+    def _call(
+        self,
+        fn: Callable[[], T],
+        acquire: Callable[[], Any] | None,
+        *,
+        settle: bool,
+    ) -> T:
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_call()
+            if acquire is not None:
+                try:
+                    acquire()
+                except BaseException:
+                    self.breaker.release()
+                    raise
+            try:
+                result = self._attempt(fn, deadline, acquire)
+            except Exception as exc:
+                if not is_transient(exc):
+                    self.breaker.release()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.retry.max_attempts:
+                    raise
+                pause = self.retry.delay(attempt)
+                if deadline is not None and time.monotonic() + pause >= deadline:
+                    raise
+                self.retry.sleep(pause)
+                continue
+            if settle:
+                self.breaker.record_success()
+            return result
+
+    def _attempt(
+        self,
+        fn: Callable[[], T],
+        deadline: float | None,
+        acquire: Callable[[], Any] | None,
+    ) -> T:
+        futures: list[Future[Any]] = [self._executor.submit(fn)]
+        hedged = self.hedge_delay is None
+        settled = threading.Event()
+        last_error: BaseException | None = None
+        try:
+            while futures:
+                wait_for = _remaining(deadline)
+                if not hedged:
+                    wait_for = (
+                        self.hedge_delay
+                        if wait_for is None
+                        else min(wait_for, self.hedge_delay)
+                    )
+                done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    futures.remove(future)
+                    error = future.exception()
+                    if error is None:
+                        return future.result()
+                    if not isinstance(error, _HedgeSkipped):
+                        last_error = error
+                if not done:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise CallTimeoutError("AI call exceeded its time budget")
+                    if not hedged:
+                        hedged = True
+                        futures.append(
+                            self._executor.submit(_hedge(fn, acquire, settled))
+                        )
+        finally:
+            settled.set()
+            for future in futures:
+                _discard(future)
+        if last_error is None:  # pragma: no cover - defensive
+            raise CallTimeoutError("AI call exceeded its time budget")
+        raise last_error
+
+
+def _hedge(
+    fn: Callable[[], T],
+    acquire: Callable[[], Any] | None,
+    settled: threading.Event,
+) -> Callable[[], T]:
+    # Quota for the hedge is taken on the worker thread so the primary
+    # request's result is not held up; the caller's context is copied so the
+    # scheduler still attributes the call to the right requester.
+    if acquire is None:
+        return fn
+    context = contextvars.copy_context()
+
+    def run() -> T:
+        if settled.is_set():
+            raise _HedgeSkipped("attempt already settled")
+        try:
+            context.run(acquire)
+        except Exception as exc:
+            raise _HedgeSkipped(str(exc)) from exc
+        if settled.is_set():
+            raise _HedgeSkipped("attempt already settled")
+        return fn()
+
+    return run
+
+
+def _discard(future: Future[Any]) -> None:
+    # A losing attempt that has not started is cancelled; one already running
+    # has whatever it returns (such as an opened stream) closed when it ends.
+    if not future.cancel():
+        future.add_done_callback(_close_result)
+
+
+def _close_result(future: Future[Any]) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if close is not None:
+        close()
+
+
+def _remaining(deadline: float | None) -> float | None:
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
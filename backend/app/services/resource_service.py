@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import mimetypes
+import re
 from pathlib import Path
 from typing import Iterable
 from uuid import uuid4
@@ -13,9 +14,11 @@ from werkzeug.utils import secure_filename
 
 from ..extensions import db
 from ..models import Category, Resource, User
+from .prompt_compactor import PAGE_BREAK
 
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".txt"}
 VALID_STATUSES = {"pending", "processing", "ready", "complete", "failed"}
+_BLANK_RUNS = re.compile(r"\n{3,}")
 
 
 class ResourceServiceError(Exception):
@@ -140,7 +143,9 @@ class ResourceService:
                 from PyPDF2 import PdfReader
 
                 reader = PdfReader(str(file_path))
-                text = "\n".join(page.extract_text() or "" for page in reader.pages)
+                text = PAGE_BREAK.join(
+                    page.extract_text() or "" for page in reader.pages
+                )
             elif extension == ".docx":
                 from docx import Document
 
@@ -156,8 +161,20 @@ class ResourceService:
             )
             return None
 
-        normalized = " ".join(text.split())
-        return normalized or None
+        return _normalize_whitespace(text) or None
+
+
+def _normalize_whitespace(text: str) -> str:
+    """Collapse whitespace within lines while keeping line and page breaks.
+
+    Line structure is what lets prompt compaction recognise running headers,
+    footers and page numbers, so only runs of blank lines are squeezed.
+    """
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = [" ".join(line.split()) for line in page.splitlines()]
+        pages.append(_BLANK_RUNS.sub("\n\n", "\n".join(lines)).strip())
+    return PAGE_BREAK.join(page for page in pages if page)
 
 
 resource_service = ResourceService()
@@ -0,0 +1,362 @@
+"""Spaced-repetition study sessions backed by the FSRS scheduler."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+import numpy as np
+import sqlalchemy as sa
+from flask import current_app
+
+from ..extensions import db
+from ..models import (
+    CardReview,
+    CardState,
+    Flashcard,
+    FlashcardDeck,
+    ReviewParameters,
+    User,
+)
+from .fsrs import AGAIN, DEFAULT_WEIGHTS, RATINGS, FSRSScheduler
+from .fsrs_optimizer import ReviewHistory, fit_weights
+
+
+class ReviewServiceError(Exception):
+    """Raised when review operations fail."""
+
+
+@dataclass
+class FitSummary:
+    """Totals reported by a parameter fitting run."""
+
+    users: int = 0
+    reviews: int = 0
+    improved: int = 0
+
+
+class ReviewService:
+    """Serve due cards and record batches of review answers."""
+
+    def due_cards(
+        self, user: User, *, limit: int = 20, now: datetime | None = None
+    ) -> list[dict[str, Any]]:
+        """Return up to ``limit`` cards to study now, most overdue first.
+
+        Cards already studied come from a range scan of the
+        ``(user_id, due_at)`` index. Remaining slots are filled with cards
+        from the user's decks that have never been reviewed.
+        """
+        now = now or datetime.utcnow()
+        due_stmt = (
+            sa.select(
+                Flashcard.id,
+                Flashcard.deck_id,
+                Flashcard.question,
+                Flashcard.answer,
+                CardState.due_at,
+            )
+            .select_from(CardState)
+            .join(Flashcard, Flashcard.id == CardState.flashcard_id)
+            .where(CardState.user_id == user.id, CardState.due_at <= now)
+            .order_by(CardState.due_at)
+            .limit(limit)
+        )
+        cards = [
+            _card_payload(row, status="review") for row in db.session.execute(due_stmt)
+        ]
+        if len(cards) < limit:
+            unseen = ~sa.exists().where(
+                CardState.user_id == user.id, CardState.flashcard_id == Flashcard.id
+            )
+            new_stmt = (
+                sa.select(
+                    Flashcard.id,
+                    Flashcard.deck_id,
+                    Flashcard.question,
+                    Flashcard.answer,
+                    sa.null().label("due_at"),
+                )
+                .join(FlashcardDeck, FlashcardDeck.id == Flashcard.deck_id)
+                .where(FlashcardDeck.owner_id == user.id, unseen)
+                .order_by(Flashcard.id)
+                .limit(limit - len(cards))
+            )
+            cards.extend(
+                _card_payload(row, status="new") for row in db.session.execute(new_stmt)
+            )
+        return cards
+
+    def submit_reviews(
+        self, user: User, reviews: Iterable[dict[str, Any]]
+    ) -> list[CardState]:
+        """Record a study session's answers and reschedule the reviewed cards.
+
+        Answers are applied in ``reviewed_at`` order. All review rows are
+        written with one executemany insert, and card states with at most one
+        bulk insert and one bulk update.
+
+        Raises:
+            ReviewServiceError: If an answer is malformed, the batch is too
+                large or a card is not in one of the user's decks.
+        """
+        answers = sorted(
+            (_parse_review(review) for review in reviews), key=lambda a: a[2]
+        )
+        if not answers:
+            raise ReviewServiceError("At least one review is required")
+        max_batch = current_app.config.get("REVIEW_MAX_BATCH", 500)
+        if len(answers) > max_batch:
+            raise ReviewServiceError(f"At most {max_batch} reviews per request")
+
+        card_ids = {card_id for card_id, _, _ in answers}
+        allowed = set(
+            db.session.scalars(
+                sa.select(Flashcard.id)
+                .join(FlashcardDeck, FlashcardDeck.id == Flashcard.deck_id)
+                .where(Flashcard.id.in_(card_ids), FlashcardDeck.owner_id == user.id)
+            )
+        )
+        if card_ids - allowed:
+            missing = ", ".join(str(card_id) for card_id in sorted(card_ids - allowed))
+            raise ReviewServiceError(f"Cards not available for review: {missing}")
+
+        existing = {
+            state.flashcard_id: state
+            for state in db.session.scalars(
+                sa.select(CardState).where(
+                    CardState.user_id == user.id, CardState.flashcard_id.in_(card_ids)
+                )
+            )
+        }
+        states: dict[int, dict[str, Any]] = {
+            card_id: {
+                "user_id": user.id,
+                "flashcard_id": card_id,
+                "stability": state.stability,
+                "difficulty": state.difficulty,
+                "due_at": state.due_at,
+                "last_reviewed_at": state.last_reviewed_at,
+                "scheduled_days": state.scheduled_days,
+                "reps": state.reps,
+                "lapses": state.lapses,
+            }
+            for card_id, state in existing.items()
+        }
+
+        scheduler = self.scheduler_for(user)
+        review_rows: list[dict[str, Any]] = []
+        for card_id, rating, reviewed_at in answers:
+            previous = states.get(card_id)
+            memory = scheduler.review(
+                rating=rating,
+                reviewed_at=reviewed_at,
+                stability=previous["stability"] if previous else None,
+                difficulty=previous["difficulty"] if previous else None,
+                last_reviewed_at=previous["last_reviewed_at"] if previous else None,
+            )
+            review_rows.append(
+                {
+                    "user_id": user.id,
+                    "flashcard_id": card_id,
+                    "rating": rating,
+                    "reviewed_at": reviewed_at,
+                    "elapsed_days": memory.elapsed_days,
+                    "scheduled_days": previous["scheduled_days"] if previous else 0.0,
+                    "stability": memory.stability,
+                    "difficulty": memory.difficulty,
+                }
+            )
+            states[card_id] = {
+                "user_id": user.id,
+                "flashcard_id": card_id,
+                "stability": memory.stability,
+                "difficulty": memory.difficulty,
+                "due_at": memory.due_at,
+                "last_reviewed_at": reviewed_at,
+                "scheduled_days": memory.scheduled_days,
+                "reps": (previous["reps"] if previous else 0) + 1,
+                "lapses": (previous["lapses"] if previous else 0)
+                + (1 if previous and rating == AGAIN else 0),
+            }
+
+        db.session.execute(sa.insert(CardReview), review_rows)
+        inserts = [states[card_id] for card_id in card_ids if card_id not in existing]
+        updates = [states[card_id] for card_id in card_ids if card_id in existing]
+        if inserts:
+            db.session.execute(sa.insert(CardState), inserts)
+        if updates:
+            db.session.execute(sa.update(CardState), updates)
+        db.session.commit()
+
+        return list(
+            db.session.scalars(
+                sa.select(CardState)
+                .where(
+                    CardState.user_id == user.id, CardState.flashcard_id.in_(card_ids)
+                )
+                .order_by(CardState.due_at)
+                .execution_options(populate_existing=True)
+            )
+        )
+
+    def scheduler_for(self, user: User) -> FSRSScheduler:
+        """Return the FSRS scheduler for ``user``, using fitted weights if any."""
+        parameters = db.session.get(ReviewParameters, user.id)
+        return FSRSScheduler(
+            parameters.weights if parameters else DEFAULT_WEIGHTS,
+            desired_retention=current_app.config.get("REVIEW_DESIRED_RETENTION", 0.9),
+        )
+
+    def count_fit_reviews(self, *, min_reviews: int | None = None) -> int:
+        """Return how many reviews :meth:`fit_parameters` will fit."""
+        eligible = _eligible_users(min_reviews).subquery()
+        return db.session.scalar(
+            sa.select(sa.func.coalesce(sa.func.sum(eligible.c.reviews), 0))
+        )
+
+    def fit_parameters(
+        self,
+        *,
+        min_reviews: int | None = None,
+        users_per_batch: int = 2000,
+        iterations: int = 40,
+        progress: Callable[[int], None] | None = None,
+    ) -> FitSummary:
+        """Fit FSRS weights for every user with at least ``min_reviews`` reviews.
+
+        ``min_reviews`` defaults to the ``REVIEW_FIT_MIN_REVIEWS`` setting.
+        Users are processed in batches of ``users_per_batch``. Each batch's
+        history is loaded as columns, fitted in one vectorized run and its
+        weights written back with one bulk insert and one bulk update.
+        ``progress`` is called with the number of reviews in each finished
+        batch.
+        """
+        eligible = db.session.execute(
+            _eligible_users(min_reviews).order_by(CardReview.user_id)
+        ).all()
+        summary = FitSummary()
+        for offset in range(0, len(eligible), users_per_batch):
+            batch = eligible[offset : offset + users_per_batch]
+            user_ids = [user_id for user_id, _ in batch]
+            history = _load_history(user_ids)
+            if not len(history.user_ids):
+                if progress is not None:
+                    progress(sum(count for _, count in batch))
+                continue
+
+            existing = {
+                row.user_id: row.weights
+                for row in db.session.execute(
+                    sa.select(ReviewParameters.user_id, ReviewParameters.weights).where(
+                        ReviewParameters.user_id.in_(user_ids)
+                    )
+                )
+            }
+            initial = np.array(
+                [
+                    existing.get(int(user_id), DEFAULT_WEIGHTS)
+                    for user_id in history.user_ids
+                ],
+                dtype=np.float64,
+            )
+            result = fit_weights(history, initial, iterations=iterations)
+
+            counts = dict(batch)
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "user_id": int(user_id),
+                    "weights": [round(float(value), 6) for value in weights],
+                    "review_count": int(counts[int(user_id)]),
+                    "log_loss": float(loss),
+                    "fitted_at": now,
+                }
+                for user_id, weights, loss in zip(
+                    history.user_ids, result.weights, result.final_loss
+                )
+            ]
+            inserts = [row for row in rows if row["user_id"] not in existing]
+            updates = [row for row in rows if row["user_id"] in existing]
+            if inserts:
+                db.session.execute(sa.insert(ReviewParameters), inserts)
+            if updates:
+                db.session.execute(sa.update(ReviewParameters), updates)
+            db.session.commit()
+
+            reviews = sum(counts.values())
+            summary.users += len(rows)
+            summary.reviews += reviews
+            summary.improved += int((result.final_loss < result.initial_loss).sum())
+            if progress is not None:
+                progress(reviews)
+        return summary
+
+
+def _eligible_users(min_reviews: int | None) -> sa.Select:
+    if min_reviews is None:
+        min_reviews = current_app.config.get("REVIEW_FIT_MIN_REVIEWS", 100)
+    return (
+        sa.select(CardReview.user_id, sa.func.count().label("reviews"))
+        .group_by(CardReview.user_id)
+        .having(sa.func.count() >= min_reviews)
+    )
+
+
+def _load_history(user_ids: list[int]) -> ReviewHistory:
+    """Load the review columns of ``user_ids`` into a :class:`ReviewHistory`."""
+    result = db.session.execute(
+        sa.select(
+            CardReview.user_id,
+            CardReview.flashcard_id,
+            CardReview.rating,
+            CardReview.elapsed_days,
+        )
+        .where(CardReview.user_id.in_(user_ids))
+        .order_by(CardReview.user_id, CardReview.flashcard_id, CardReview.reviewed_at)
+    )
+    columns = np.array(result.all(), dtype=np.float64).reshape(-1, 4)
+    return ReviewHistory.from_columns(
+        columns[:, 0].astype(np.int64),
+        columns[:, 1].astype(np.int64),
+        columns[:, 2].astype(np.int8),
+        columns[:, 3],
+    )
+
+
+def _parse_review(review: Any) -> tuple[int, int, datetime]:
+    if not isinstance(review, dict):
+        raise ReviewServiceError("Each review must be an object")
+    card_id = review.get("flashcard_id")
+    rating = review.get("rating")
+    if not isinstance(card_id, int) or isinstance(card_id, bool):
+        raise ReviewServiceError("flashcard_id must be an integer")
+    if rating not in RATINGS or isinstance(rating, bool):
+        raise ReviewServiceError("rating must be 1 (again), 2, 3 or 4 (easy)")
+
+    now = datetime.utcnow()
+    raw_time = review.get("reviewed_at")
+    if raw_time is None:
+        return card_id, rating, now
+    try:
+        reviewed_at = datetime.fromisoformat(str(raw_time).replace("Z", "+00:00"))
+    except ValueError as exc:
+        raise ReviewServiceError("reviewed_at must be an ISO 8601 timestamp") from exc
+    if reviewed_at.tzinfo is not None:
+        reviewed_at = reviewed_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return card_id, rating, min(reviewed_at, now)
+
+
+def _card_payload(row: Any, *, status: str) -> dict[str, Any]:
+    return {
+        "flashcard_id": row.id,
+        "deck_id": row.deck_id,
+        "question": row.question,
+        "answer": row.answer,
+        "due_at": row.due_at.isoformat() if row.due_at else None,
+        "status": status,
+    }
+
+
+review_service = ReviewService()
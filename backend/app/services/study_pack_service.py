@@ -0,0 +1,69 @@
+"""Shared AI study packs reused by deck and lesson generation."""
+
+from __future__ import annotations
+
+import hashlib
+
+from ..models import Resource
+from .ai_provider import AIProviderRegistry, StudyPackPayload
+from .ai_registry import ai_providers
+from .extractive_service import ExtractiveService
+from .gemini_service import STUDY_PACK_PROMPT
+
+STUDY_PACK_CHUNK_SIZE = 1000
+
+
+class StudyPackService:
+    """Produce one combined AI response per resource and cache it on the resource.
+
+    Deck and lesson generation both read from the same pack, so generating both
+    for a resource costs a single Gemini call. The cached pack is keyed by a
+    fingerprint of the resource text and prompt and is regenerated whenever
+    either changes. Packs built by the local extractive backend are cheap to
+    rebuild and are never cached, so a fallback result does not shadow a
+    later remote one.
+    """
+
+    def __init__(self, providers: AIProviderRegistry) -> None:
+        self._providers = providers
+
+    def get_study_pack(
+        self,
+        resource: Resource,
+        *,
+        provider: str | None = None,
+        refresh: bool = False,
+    ) -> StudyPackPayload:
+        """Return the resource's study pack, generating it when missing or stale.
+
+        Raises:
+            AIProviderError: If the pack has to be generated and generation fails.
+        """
+        ai_service = self._providers.get(provider)
+        fingerprint = self.fingerprint(resource)
+        cached = resource.ai_study_pack
+        if (
+            not refresh
+            and cached
+            and cached.get("fingerprint") == fingerprint
+            and provider in (None, "auto", cached.get("source"))
+        ):
+            return StudyPackPayload.from_dict(cached)
+
+        chunks = ai_service.chunk_resource(resource, chunk_size=STUDY_PACK_CHUNK_SIZE)
+        pack = ai_service.generate_study_pack(chunks)
+        if pack.source != ExtractiveService.name:
+            resource.ai_study_pack = {**pack.to_dict(), "fingerprint": fingerprint}
+        return pack
+
+    def fingerprint(self, resource: Resource) -> str:
+        """Hash the inputs that determine a resource's study pack."""
+        digest = hashlib.sha256()
+        digest.update(STUDY_PACK_PROMPT.encode("utf-8"))
+        digest.update(b"\0")
+        source = resource.text_content or resource.description or ""
+        digest.update(source.encode("utf-8"))
+        return digest.hexdigest()
+
+
+study_pack_service = StudyPackService(ai_providers)
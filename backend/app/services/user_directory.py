@@ -0,0 +1,149 @@
+"""Paginated, filterable listing of users for administrators."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from flask import current_app
+
+from ..extensions import db
+from ..models import Profile, Role, User
+from ..models.role import user_roles
+from ..utils.pagination import decode_cursor, encode_cursor
+from ..utils.sql import escape_like
+from .counter_service import counter_service
+
+
+class UserDirectoryService:
+    """Query users by role, active flag and email/username prefix.
+
+    Every filter is applied in SQL. ``prefix`` matches the start of the
+    lowercased email or username, served by the ``lower()`` indexes on
+    ``users``.
+    """
+
+    def page(
+        self,
+        *,
+        role: str | None = None,
+        active: bool | None = None,
+        prefix: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> dict[str, Any]:
+        """Return a page of users, newest first.
+
+        Pages are keyset paginated on ``(created_at, id)``; roles for the
+        page are loaded with one extra query.
+
+        Raises:
+            InvalidCursorError: If ``cursor`` is malformed.
+        """
+        limit = limit or current_app.config.get("ADMIN_USERS_PAGE_SIZE", 50)
+        stmt = (
+            sa.select(
+                User.id,
+                User.email,
+                User.username,
+                User.is_active,
+                User.is_email_verified,
+                User.last_login_at,
+                User.created_at,
+                Profile.first_name,
+                Profile.last_name,
+            )
+            .outerjoin(Profile, Profile.user_id == User.id)
+            .where(*self.filters(role=role, active=active, prefix=prefix))
+            .order_by(User.created_at.desc(), User.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            created_at, user_id = decode_cursor(cursor, (datetime, int))
+            stmt = stmt.where(
+                sa.tuple_(User.created_at, User.id) < (created_at, user_id)
+            )
+        rows = db.session.execute(stmt).all()
+        page_rows = rows[:limit]
+
+        roles: dict[int, list[str]] = {row.id: [] for row in page_rows}
+        if roles:
+            for user_id, name in db.session.execute(
+                sa.select(user_roles.c.user_id, Role.name)
+                .join(Role, Role.id == user_roles.c.role_id)
+                .where(user_roles.c.user_id.in_(roles))
+                .order_by(Role.name)
+            ):
+                roles[user_id].append(name)
+
+        last = rows[limit - 1] if len(rows) > limit else None
+        return {
+            "items": [
+                {
+                    "id": row.id,
+                    "email": row.email,
+                    "username": row.username,
+                    "first_name": row.first_name,
+                    "last_name": row.last_name,
+                    "roles": roles[row.id],
+                    "is_active": row.is_active,
+                    "is_email_verified": row.is_email_verified,
+                    "last_login_at": (
+                        row.last_login_at.isoformat() if row.last_login_at else None
+                    ),
+                    "created_at": row.created_at.isoformat(),
+                }
+                for row in page_rows
+            ],
+            "next_cursor": encode_cursor([last.created_at, last.id]) if last else None,
+        }
+
+    def count(
+        self,
+        *,
+        role: str | None = None,
+        active: bool | None = None,
+        prefix: str | None = None,
+    ) -> int:
+        """Return the number of users matching the filters without loading them.
+
+        The unfiltered total is read from the maintained ``users`` counter.
+        """
+        filters = self.filters(role=role, active=active, prefix=prefix)
+        if not filters:
+            return counter_service.values()["users"]
+        return db.session.scalar(
+            sa.select(sa.func.count()).select_from(User).where(*filters)
+        )
+
+    def filters(
+        self,
+        *,
+        role: str | None = None,
+        active: bool | None = None,
+        prefix: str | None = None,
+    ) -> list[sa.ColumnElement[bool]]:
+        """Return the SQL conditions for the directory filters that are set."""
+        filters: list[sa.ColumnElement[bool]] = []
+        if role:
+            filters.append(
+                sa.exists()
+                .where(user_roles.c.user_id == User.id)
+                .where(user_roles.c.role_id == Role.id)
+                .where(Role.name == role)
+            )
+        if active is not None:
+            filters.append(User.is_active.is_(active))
+        if prefix:
+            pattern = f"{escape_like(prefix.strip().lower())}%"
+            filters.append(
+                sa.or_(
+                    sa.func.lower(User.email).like(pattern, escape="\\"),
+                    sa.func.lower(User.username).like(pattern, escape="\\"),
+                )
+            )
+        return filters
+
+
+user_directory_service = UserDirectoryService()
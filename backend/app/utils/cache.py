@@ -0,0 +1,303 @@
+"""Application cache with pluggable backends.
+
+``CACHE_TYPE`` selects the backend: ``"memory"`` keeps an LRU cache inside
+each process, ``"filesystem"`` shares entries between processes through
+files in ``CACHE_DIR``. Keys can be grouped into namespaces whose entries
+are retired together by :meth:`Cache.invalidate`. Invalidation only reaches
+other processes through a shared backend, so deployments running several
+workers should use ``"filesystem"``.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Protocol, TypeVar
+
+from flask import Flask, current_app
+
+T = TypeVar("T")
+
+
+class CacheBackend(Protocol):
+    """Storage used by :class:`Cache`."""
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None: ...
+
+    def delete(self, *keys: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(
+        self,
+        default_timeout: float = 60,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.default_timeout = default_timeout
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for ``key`` or ``None`` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        """Store ``value`` under ``key`` for ``timeout`` seconds."""
+        timeout = self.default_timeout if timeout is None else timeout
+        with self._lock:
+            self._entries[key] = (self._clock() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        """Remove ``keys`` from the cache."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class FileSystemCache:
+    """Cache shared between processes through one JSON file per entry.
+
+    ``directory`` must be private to the application: it is created with
+    mode ``0700`` and refused if it is writable by other users. Values must
+    be JSON serialisable; ``bytes`` are stored base64 encoded. Files are
+    written to a temporary name and renamed into place, so readers never see
+    a partial entry.
+
+    Each file's mtime is set to its expiry time, so pruning works from
+    ``stat`` alone: once more than ``max_entries`` files exist, expired
+    entries are removed first and then those closest to expiring. Pruning
+    runs every ``prune_interval`` writes, so the directory may briefly hold
+    a few more entries than ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        default_timeout: float = 60,
+        max_entries: int = 4096,
+        clock: Callable[[], float] = time.time,
+        prune_interval: int | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        status = self.directory.stat()
+        if status.st_uid != os.getuid() or status.st_mode & 0o022:
+            raise ValueError(
+                f"Cache directory {self.directory} must be owned by this user "
+                "and not writable by others"
+            )
+        self.default_timeout = default_timeout
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval or max(1, max_entries // 64)
+        self._clock = clock
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with path.open("rb") as handle:
+                expires_at, value = json.load(handle, object_hook=_decode_bytes)
+        except (OSError, ValueError):
+            return None
+        if expires_at <= self._clock():
+            path.unlink(missing_ok=True)
+            return None
+        return value
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        timeout = self.default_timeout if timeout is None else timeout
+        expires_at = self._clock() + timeout
+        payload = json.dumps([expires_at, value], default=_encode_bytes).encode()
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.utime(temp_name, (expires_at, expires_at))
+            os.replace(temp_name, self._path(key))
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        with self._writes_lock:
+            self._writes += 1
+            due = not self._writes % self.prune_interval
+        if due:
+            self._prune()
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.cache"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha1(key.encode()).hexdigest()}.cache"
+
+    def _prune(self) -> None:
+        entries: list[tuple[float, str]] = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(".cache"):
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        now = self._clock()
+        excess = len(entries) - self.max_entries
+        for index, (expires_at, path) in enumerate(entries):
+            if index >= excess and expires_at > now:
+                break
+            Path(path).unlink(missing_ok=True)
+
+
+def _encode_bytes(value: Any) -> dict[str, str]:
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Cannot cache values of type {type(value).__name__}")
+
+
+def _decode_bytes(value: dict[str, Any]) -> Any:
+    if value.keys() == {"__bytes__"}:
+        return base64.b64decode(value["__bytes__"])
+    return value
+
+
+def create_backend(config: Any) -> CacheBackend:
+    """Build the backend selected by ``CACHE_TYPE`` in ``config``."""
+    cache_type = config.get("CACHE_TYPE", "memory")
+    timeout = config.get("CACHE_DEFAULT_TIMEOUT", 60)
+    if cache_type == "memory":
+        return MemoryCache(
+            default_timeout=timeout,
+            max_entries=config.get("CACHE_MAX_ENTRIES", 1024),
+        )
+    if cache_type == "filesystem":
+        directory = config.get("CACHE_DIR")
+        if not directory:
+            raise ValueError("CACHE_DIR must be set when CACHE_TYPE is filesystem")
+        return FileSystemCache(
+            directory,
+            default_timeout=timeout,
+            max_entries=config.get("CACHE_MAX_ENTRIES", 4096),
+        )
+    raise ValueError(f"Unknown CACHE_TYPE: {cache_type}")
+
+
+class Cache:
+    """Flask extension exposing a per-application cache backend."""
+
+    def __init__(self) -> None:
+        # Per-key lock and the number of threads using it.
+        self._flights: dict[str, list[Any]] = {}
+        self._flights_lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["cache"] = create_backend(app.config)
+
+    @property
+    def backend(self) -> CacheBackend:
+        return current_app.extensions["cache"]
+
+    def get(self, key: str) -> Any | None:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any, timeout: float | None = None) -> None:
+        self.backend.set(key, value, timeout)
+
+    def delete(self, *keys: str) -> None:
+        self.backend.delete(*keys)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], T | None],
+        timeout: float | None = None,
+    ) -> T | None:
+        """Return the cached value for ``key``, computing it on a miss.
+
+        Concurrent misses for the same key in this process wait for a single
+        call to ``factory`` instead of all recomputing it. A ``None`` result
+        is returned but not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                value = self.get(key)
+                if value is None:
+                    value = factory()
+                    if value is not None:
+                        self.set(key, value, timeout)
+        finally:
+            with self._flights_lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    self._flights.pop(key, None)
+        return value
+
+    def generation(self, namespace: str) -> str:
+        """Return the current generation token of ``namespace``.
+
+        Keys built with the token are retired together when the namespace is
+        invalidated. A token that expired or was evicted is replaced by a new
+        one, so entries stored under it can never be served again.
+        """
+        key = f"generation:{namespace}"
+        token = self.get(key)
+        if token is None:
+            token = uuid.uuid4().hex
+            self.set(key, token, current_app.config.get("CACHE_GENERATION_TIMEOUT"))
+        return token
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Retire every entry stored under ``namespaces``."""
+        timeout = current_app.config.get("CACHE_GENERATION_TIMEOUT")
+        for namespace in namespaces:
+            self.set(f"generation:{namespace}", uuid.uuid4().hex, timeout)
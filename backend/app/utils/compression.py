@@ -0,0 +1,212 @@
+"""Content-negotiated response compression.
+
+``gzip`` is always available; ``br`` and ``zstd`` are offered when the
+optional ``brotli`` and ``zstandard`` packages are installed. The encoding is
+picked from ``Accept-Encoding`` by quality, preferring ``br``, then ``zstd``,
+then ``gzip`` on ties.
+
+The :class:`Compress` extension compresses responses in ``after_request``:
+buffered bodies of at least ``COMPRESS_MIN_SIZE`` bytes at once, generator
+responses chunk by chunk as they stream, flushing the compressor after every
+chunk so streamed records reach the client as soon as they are produced.
+Responses that already carry a ``Content-Encoding`` are left alone, so cached
+responses can attach precompressed bodies from :func:`compress_variants`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Protocol
+
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "image/svg+xml",
+        "text/css",
+        "text/csv",
+        "text/html",
+        "text/plain",
+    }
+)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def sync(self) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class Codec:
+    """A content coding with one-shot and streaming compressors."""
+
+    name: str
+    compress: Callable[[bytes, int], bytes]
+    stream: Callable[[int], StreamCompressor]
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def sync(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=min(level, 11))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def sync(self) -> bytes:
+        return self._compressor.flush()
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def sync(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _codecs() -> dict[str, Codec]:
+    codecs: dict[str, Codec] = {}
+    if brotli is not None:
+        codecs["br"] = Codec(
+            "br",
+            lambda data, level: brotli.compress(data, quality=min(level, 11)),
+            _BrotliStream,
+        )
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            "zstd",
+            lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+            _ZstdStream,
+        )
+    codecs["gzip"] = Codec(
+        "gzip",
+        lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+        _GzipStream,
+    )
+    return codecs
+
+
+CODECS = _codecs()
+
+
+def negotiate(available: Iterable[str] | None = None) -> str | None:
+    """Return the best encoding the current request accepts, or ``None``."""
+    choices = [name for name in CODECS if available is None or name in available]
+    if not choices:
+        return None
+    return request.accept_encodings.best_match(choices)
+
+
+def compress_variants(body: bytes, mimetype: str) -> dict[str, bytes]:
+    """Return ``body`` compressed with every codec if it is worth compressing."""
+    config = current_app.config
+    if (
+        not config.get("COMPRESS_ENABLED", True)
+        or mimetype not in COMPRESSIBLE_MIMETYPES
+        or len(body) < config.get("COMPRESS_MIN_SIZE", 500)
+    ):
+        return {}
+    level = config.get("COMPRESS_LEVEL", 6)
+    return {name: codec.compress(body, level) for name, codec in CODECS.items()}
+
+
+def _stream(chunks: Iterable[Any], compressor: StreamCompressor) -> Iterator[bytes]:
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if not chunk:
+                continue
+            yield compressor.compress(chunk) + compressor.sync()
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+class Compress:
+    """Flask extension compressing eligible responses."""
+
+    def init_app(self, app: Flask) -> None:
+        app.after_request(self.after_request)
+
+    def after_request(self, response: Response) -> Response:
+        config = current_app.config
+        if (
+            not config.get("COMPRESS_ENABLED", True)
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or "no-transform" in response.headers.get("Cache-Control", "")
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate()
+        if encoding is None:
+            return response
+
+        codec = CODECS[encoding]
+        level = config.get("COMPRESS_LEVEL", 6)
+        if response.is_streamed:
+            response.response = _stream(response.response, codec.stream(level))
+            response.headers.pop("Content-Length", None)
+        else:
+            body = response.get_data()
+            if len(body) < config.get("COMPRESS_MIN_SIZE", 500):
+                return response
+            response.set_data(codec.compress(body, level))
+        response.headers["Content-Encoding"] = encoding
+        _weaken_etag(response)
+        return response
+
+
+def _weaken_etag(response: Response) -> None:
+    # A compressed body is a different representation; a weak validator
+    # still lets clients revalidate against the uncompressed ETag.
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
@@ -0,0 +1,133 @@
+"""Cached responses with strong ETags for anonymous read endpoints."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from functools import wraps
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+import sqlalchemy as sa
+from flask import Response, current_app, make_response, request
+from sqlalchemy.exc import DBAPIError
+
+from ..extensions import cache, db
+from .compression import compress_variants, negotiate
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_DECKS = "public:decks"
+PUBLIC_LESSONS = "public:lessons"
+PUBLIC_BLOG = "public:blog"
+PUBLIC_FAQ = "public:faq"
+
+
+def cached_response(
+    namespace: str, *, timeout: float | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., Response]]:
+    """Cache successful responses of a GET view under ``namespace``.
+
+    Entries are keyed by path and normalized query string and retired by
+    ``cache.invalidate(namespace)``. Concurrent misses compute the response
+    once. Every response carries a strong ETag over its body, and a request
+    whose ``If-None-Match`` matches gets ``304 Not Modified``. Only ``200``
+    responses are cached.
+
+    Bodies are stored alongside their compressed variants, so compression
+    also happens once per cache fill rather than once per response.
+
+    On PostgreSQL, queries are bounded by ``PUBLIC_STATEMENT_TIMEOUT_MS``.
+    If the database fails or times out, a request without query arguments
+    is answered from the static snapshot of the endpoint when one exists.
+    """
+
+    def decorator(view: Callable[..., Any]) -> Callable[..., Response]:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Response:
+            query = urlencode(sorted(request.args.items(multi=True)))
+            key = (
+                f"response:{namespace}:{cache.generation(namespace)}:"
+                f"{request.path}?{query}"
+            )
+            fresh: list[Response] = []
+
+            def render() -> dict[str, Any] | None:
+                _limit_statement_time()
+                response = make_response(view(*args, **kwargs))
+                fresh.append(response)
+                if response.status_code != 200 or response.is_streamed:
+                    return None
+                body = response.get_data()
+                return {
+                    "body": body,
+                    "mimetype": response.mimetype,
+                    "etag": hashlib.sha256(body).hexdigest(),
+                    "encoded": compress_variants(body, response.mimetype),
+                }
+
+            try:
+                entry = cache.get_or_set(
+                    key,
+                    render,
+                    timeout
+                    if timeout is not None
+                    else current_app.config.get("RESPONSE_CACHE_TIMEOUT", 300),
+                )
+            except DBAPIError:
+                db.session.rollback()
+                snapshot = None if request.args else _snapshot_entry(request.path)
+                if snapshot is None:
+                    raise
+                logger.warning("Serving %s from snapshot", request.path)
+                entry = snapshot
+            if entry is None:
+                return fresh[0]
+            encoded = entry.get("encoded") or {}
+            encoding = negotiate(encoded) if encoded else None
+            response = Response(
+                encoded[encoding] if encoding else entry["body"],
+                mimetype=entry["mimetype"],
+            )
+            response.set_etag(entry["etag"], weak=encoding is not None)
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+            response.vary.add("Accept-Encoding")
+            response.headers["Cache-Control"] = "public, no-cache"
+            if "built_at" in entry:
+                response.headers["X-Public-Snapshot"] = entry["built_at"]
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_public(*namespaces: str) -> None:
+    """Retire cached responses for ``namespaces`` and refresh their snapshots."""
+    from ..services.public_snapshot import refresh_snapshot
+
+    cache.invalidate(*namespaces)
+    refresh_snapshot(namespaces)
+
+
+def _limit_statement_time() -> None:
+    timeout_ms = int(current_app.config.get("PUBLIC_STATEMENT_TIMEOUT_MS") or 0)
+    if timeout_ms > 0 and db.engine.dialect.name == "postgresql":
+        db.session.execute(sa.text(f"SET LOCAL statement_timeout = {timeout_ms}"))
+
+
+def _snapshot_entry(path: str) -> dict[str, Any] | None:
+    from ..services.public_snapshot import load_snapshot
+
+    snapshot = load_snapshot(path)
+    if snapshot is None:
+        return None
+    body, compressed, meta = snapshot
+    return {
+        "body": body,
+        "mimetype": "application/json",
+        "etag": meta["etag"],
+        "encoded": {"gzip": compressed} if compressed else {},
+        "built_at": meta["built_at"],
+    }
@@ -0,0 +1,60 @@
+"""Opaque cursors for keyset pagination."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list[Any]:
+    """Decode a cursor made by :func:`encode_cursor` holding values of ``types``.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or its values do not
+            match ``types`` (``bool`` is not accepted as an ``int``).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("unexpected cursor shape")
+        values = [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+    for value, expected in zip(values, types):
+        if not isinstance(value, expected) or (
+            isinstance(value, bool) and expected is not bool
+        ):
+            raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def parse_limit(raw: Any, *, default: int, maximum: int) -> int:
+    """Return a page size from a query argument, clamped to ``1..maximum``.
+
+    Raises:
+        ValueError: If ``raw`` is not an integer.
+    """
+    if raw in (None, ""):
+        return default
+    return max(1, min(int(raw), maximum))
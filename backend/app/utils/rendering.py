@@ -0,0 +1,52 @@
+"""Markdown rendering for user-authored content."""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import math
+import re
+
+from markdown_it import MarkdownIt
+
+# Bump when rendering output changes so stored HTML is regenerated.
+RENDERER_VERSION = "1"
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+_TAG = re.compile(r"<[^>]+>")
+
+# ``js-default`` disables raw HTML, so any markup in the source is escaped,
+# and rejects ``javascript:``/``vbscript:``/``file:`` links.
+_markdown = MarkdownIt("js-default", {"html": False, "typographer": False})
+
+
+def content_hash(text: str) -> str:
+    """Return the key under which the rendering of ``text`` is stored."""
+    return hashlib.sha256(f"{RENDERER_VERSION}\0{text}".encode()).hexdigest()
+
+
+def render_markdown(text: str) -> str:
+    """Render Markdown ``text`` to sanitized HTML."""
+    return _markdown.render(text)
+
+
+def plain_text(text: str) -> str:
+    """Return the visible text of Markdown ``text`` with whitespace collapsed."""
+    return " ".join(html.unescape(_TAG.sub(" ", render_markdown(text))).split())
+
+
+def excerpt(text: str, length: int = EXCERPT_LENGTH) -> str:
+    """Return the first ``length`` characters of ``text``, cut between words."""
+    if len(text) <= length:
+        return text
+    cut = text[: length + 1]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return f"{cut[:length].rstrip()}…"
+
+
+def reading_minutes(text: str, words_per_minute: int = WORDS_PER_MINUTE) -> int:
+    """Return the whole minutes needed to read ``text`` (at least one)."""
+    return max(1, math.ceil(len(text.split()) / words_per_minute))
@@ -0,0 +1,8 @@
+"""Helpers for building SQL expressions."""
+
+from __future__ import annotations
+
+
+def escape_like(value: str) -> str:
+    """Escape ``LIKE`` wildcards in ``value`` for use with ``escape="\\\\"``."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -46,6 +46,68 @@ class BaseConfig:
     GOOGLE_OAUTH_CLIENT_SECRET = os.getenv("GOOGLE_OAUTH_CLIENT_SECRET")
     GOOGLE_OAUTH_REDIRECT_URI = os.getenv("GOOGLE_OAUTH_REDIRECT_URI")
     GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
+    AI_PROVIDER = os.getenv("AI_PROVIDER", "auto")
+    AI_BATCH_TOKEN_BUDGET = int(os.getenv("AI_BATCH_TOKEN_BUDGET", "6000"))
+    AI_BATCH_MAX_DOCUMENTS = int(os.getenv("AI_BATCH_MAX_DOCUMENTS", "8"))
+    FLASHCARD_BATCH_MAX = int(os.getenv("FLASHCARD_BATCH_MAX", "25"))
+    AI_PROMPT_COMPACTION = os.getenv("AI_PROMPT_COMPACTION", "true").lower() == "true"
+    GEMINI_MAX_ATTEMPTS = int(os.getenv("GEMINI_MAX_ATTEMPTS", "3"))
+    GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "0.5"))
+    GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "8"))
+    GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "120"))
+    GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))
+    GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+    GEMINI_HEDGE_DELAY = (
+        float(os.getenv("GEMINI_HEDGE_DELAY", "0"))
+        if os.getenv("GEMINI_HEDGE_DELAY")
+        else None
+    )
+    # Enforced per worker process: N workers allow N times this rate.
+    GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+    GEMINI_BURST = float(os.getenv("GEMINI_BURST", "10"))
+    GEMINI_QUEUE_TIMEOUT = float(os.getenv("GEMINI_QUEUE_TIMEOUT", "30"))
+    AI_ROLE_WEIGHTS = os.getenv(
+        "AI_ROLE_WEIGHTS", "admin:4,teacher:2,expert:2,student:1"
+    )
+    REVIEW_DESIRED_RETENTION = float(os.getenv("REVIEW_DESIRED_RETENTION", "0.9"))
+    REVIEW_MAX_BATCH = int(os.getenv("REVIEW_MAX_BATCH", "500"))
+    REVIEW_FIT_MIN_REVIEWS = int(os.getenv("REVIEW_FIT_MIN_REVIEWS", "100"))
+    # "memory" invalidates public responses in the current process only; other
+    # workers serve them for up to RESPONSE_CACHE_TIMEOUT. Deployments with
+    # several workers should use "filesystem" with a private CACHE_DIR.
+    CACHE_TYPE = os.getenv("CACHE_TYPE", "memory")
+    CACHE_DIR = os.getenv("CACHE_DIR")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "60"))
+    CACHE_GENERATION_TIMEOUT = int(os.getenv("CACHE_GENERATION_TIMEOUT", "86400"))
+    RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))
+    COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+    PUBLIC_SNAPSHOT_DIR = os.getenv(
+        "PUBLIC_SNAPSHOT_DIR", str(BASE_DIR / "public_snapshot")
+    )
+    PUBLIC_SNAPSHOT_ON_PUBLISH = (
+        os.getenv("PUBLIC_SNAPSHOT_ON_PUBLISH", "false").lower() == "true"
+    )
+    PUBLIC_STATEMENT_TIMEOUT_MS = int(os.getenv("PUBLIC_STATEMENT_TIMEOUT_MS", "2000"))
+    PUBLIC_FEED_PAGE_SIZE = int(os.getenv("PUBLIC_FEED_PAGE_SIZE", "20"))
+    PUBLIC_FEED_MAX_PAGE_SIZE = int(os.getenv("PUBLIC_FEED_MAX_PAGE_SIZE", "100"))
+    DECK_CARDS_PAGE_SIZE = int(os.getenv("DECK_CARDS_PAGE_SIZE", "100"))
+    DECK_CARDS_MAX_PAGE_SIZE = int(os.getenv("DECK_CARDS_MAX_PAGE_SIZE", "500"))
+    DECK_IMPORT_BATCH_SIZE = int(os.getenv("DECK_IMPORT_BATCH_SIZE", "1000"))
+    DECK_IMPORT_MAX_CARDS = int(os.getenv("DECK_IMPORT_MAX_CARDS", "50000"))
+    DECK_IMPORT_MAX_LINE_BYTES = int(os.getenv("DECK_IMPORT_MAX_LINE_BYTES", "65536"))
+    DECK_IMPORT_MAX_BYTES = int(os.getenv("DECK_IMPORT_MAX_BYTES", "67108864"))
+    LESSON_CATALOG_PAGE_SIZE = int(os.getenv("LESSON_CATALOG_PAGE_SIZE", "20"))
+    LESSON_CATALOG_MAX_PAGE_SIZE = int(os.getenv("LESSON_CATALOG_MAX_PAGE_SIZE", "100"))
+    ADMIN_USERS_PAGE_SIZE = int(os.getenv("ADMIN_USERS_PAGE_SIZE", "50"))
+    ADMIN_USERS_MAX_PAGE_SIZE = int(os.getenv("ADMIN_USERS_MAX_PAGE_SIZE", "200"))
+    ADMIN_BULK_MAX_IDS = int(os.getenv("ADMIN_BULK_MAX_IDS", "1000"))
+    BLOG_FEED_PAGE_SIZE = int(os.getenv("BLOG_FEED_PAGE_SIZE", "10"))
+    BLOG_FEED_MAX_PAGE_SIZE = int(os.getenv("BLOG_FEED_MAX_PAGE_SIZE", "50"))
+    BLOG_SEARCH_PAGE_SIZE = int(os.getenv("BLOG_SEARCH_PAGE_SIZE", "20"))
+    BLOG_SEARCH_MAX_PAGE_SIZE = int(os.getenv("BLOG_SEARCH_MAX_PAGE_SIZE", "100"))
     CORS_ORIGINS = (
         os.getenv("CORS_ORIGINS", "").split(",") if os.getenv("CORS_ORIGINS") else []
     )
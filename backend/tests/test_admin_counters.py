@@ -0,0 +1,146 @@
+"""Tests for incrementally maintained admin dashboard counters."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import BlogPost, Lesson, Notification, Resource, Role, User
+from app.services.counter_service import counter_service
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/counters.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _user(name: str, *roles: str) -> User:
+    user = User(email=f"{name}@example.com", username=name)
+    user.set_password("Secret123!")
+    for role in roles:
+        user.roles.append(Role(name=role))
+    return user
+
+
+def _recount() -> dict[str, int]:
+    def count(model, *where) -> int:
+        stmt = sa.select(sa.func.count()).select_from(model).where(*where)
+        return db.session.scalar(stmt)
+
+    return {
+        "users": count(User),
+        "pending_resources": count(
+            Resource, Resource.ai_processing_status != "complete"
+        ),
+        "published_lessons": count(Lesson, Lesson.status == "published"),
+        "unread_notifications": count(Notification, Notification.is_read.is_(False)),
+        "published_posts": count(BlogPost, BlogPost.is_published.is_(True)),
+        "draft_posts": count(BlogPost, BlogPost.is_published.is_(False)),
+    }
+
+
+def _populate() -> User:
+    owner = _user("owner")
+    db.session.add(owner)
+    for index in range(3):
+        owner.notifications.append(Notification(subject=f"n{index}", message="hi"))
+        owner.resources.append(
+            Resource(
+                filename=f"f{index}",
+                original_name=f"f{index}.txt",
+                storage_url=f"/uploads/f{index}",
+            )
+        )
+        owner.lessons.append(
+            Lesson(title=f"Lesson {index}", content="Body", status="draft")
+        )
+        db.session.add(
+            BlogPost(title=f"Post {index}", slug=f"post-{index}", content="Body")
+        )
+    db.session.commit()
+    return owner
+
+
+def test_counters_follow_inserts_updates_and_deletes(test_app):
+    owner = _populate()
+    assert counter_service.values() == _recount()
+    assert counter_service.values()["unread_notifications"] == 3
+
+    # Attributes expired by the commit still report their previous value.
+    owner.notifications[0].is_read = True
+    owner.resources[0].ai_processing_status = "complete"
+    owner.lessons[1].status = "published"
+    db.session.scalars(sa.select(BlogPost).limit(2)).all()[0].is_published = True
+    db.session.commit()
+    values = counter_service.values()
+    assert values == _recount()
+    assert (values["published_posts"], values["draft_posts"]) == (1, 2)
+
+    db.session.delete(owner)
+    db.session.delete(db.session.scalars(sa.select(BlogPost).limit(1)).one())
+    db.session.commit()
+    assert counter_service.values() == _recount()
+    assert counter_service.values()["users"] == 0
+
+
+def test_cascaded_and_orphaned_deletes_are_counted(test_app):
+    owner = _populate()
+    owner.notifications.remove(owner.notifications[0])
+    owner.resources.pop()
+    db.session.commit()
+    assert counter_service.values() == _recount()
+
+    db.session.delete(owner)
+    db.session.commit()
+    values = counter_service.values()
+    assert values == _recount()
+    assert (values["pending_resources"], values["unread_notifications"]) == (0, 0)
+
+
+def test_rolled_back_changes_leave_counters_untouched(test_app):
+    _populate()
+    before = counter_service.values()
+    db.session.add(_user("ghost"))
+    db.session.flush()
+    db.session.rollback()
+    assert counter_service.values() == before == _recount()
+
+
+def test_reconcile_repairs_drift(test_app):
+    _populate()
+    db.session.execute(sa.update(Notification).values(is_read=True))
+    db.session.commit()
+    assert counter_service.values()["unread_notifications"] == 3
+
+    assert counter_service.reconcile() == {"unread_notifications": (3, 0)}
+    assert counter_service.values() == _recount()
+    assert counter_service.reconcile() == {}
+
+
+def test_admin_summary_reads_counters(test_app):
+    _populate()
+    db.session.add(_user("admin", "admin"))
+    db.session.commit()
+    client = test_app.test_client()
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "admin@example.com", "password": "Secret123!"},
+    ).get_json()["access_token"]
+
+    summary = client.get(
+        "/api/v1/admin/summary", headers={"Authorization": f"Bearer {token}"}
+    ).get_json()
+    assert summary == {
+        "user_count": 2,
+        "resource_pending": 3,
+        "published_lessons": 0,
+        "unread_notifications": 3,
+    }
@@ -0,0 +1,136 @@
+"""Tests for the fair-share AI call scheduler."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from app.services.ai_scheduler import (
+    AIScheduler,
+    QueueTimeoutError,
+    Requester,
+    TokenBucket,
+    parse_role_weights,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_scheduler(clock: FakeClock, **kwargs) -> AIScheduler:
+    bucket = TokenBucket(rate=100.0, capacity=1.0, clock=clock)
+    return AIScheduler(bucket, **{"queue_timeout": 60, **kwargs})
+
+
+def wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def run_queued(scheduler: AIScheduler, clock: FakeClock, requesters) -> list[str]:
+    """Queue labelled requesters on an empty bucket and release one per token."""
+    scheduler.acquire(requester=Requester())  # drain the single token
+    order: list[str] = []
+
+    def worker(label: str, requester: Requester) -> None:
+        scheduler.acquire(requester=requester)
+        order.append(label)
+
+    threads = []
+    for label, requester in requesters:
+        thread = threading.Thread(
+            target=worker, args=(label, requester), daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+        depth = len(threads)
+        wait_until(lambda: sum(scheduler.snapshot()["queue_depth"].values()) == depth)
+
+    for step in range(1, len(threads) + 1):
+        clock.now += 0.015
+        wait_until(lambda: len(order) == step)
+    for thread in threads:
+        thread.join()
+    return order
+
+
+def test_bucket_grants_burst_then_rate_limits():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3.0, clock=clock)
+
+    for _ in range(3):
+        assert bucket.wait_time(1) == 0
+        bucket.take(1)
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.wait_time(1) == 0
+
+
+def test_users_are_served_round_robin():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    heavy = Requester(user_id=1, roles=("student",))
+    light = Requester(user_id=2, roles=("student",))
+
+    order = run_queued(
+        scheduler,
+        clock,
+        [("h1", heavy), ("h2", heavy), ("h3", heavy), ("l1", light), ("l2", light)],
+    )
+
+    assert order == ["h1", "l1", "h2", "l2", "h3"]
+
+
+def test_interactive_calls_jump_ahead_of_batch_work():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    batch = Requester(user_id=1, roles=("teacher",), priority="batch")
+    student = Requester(user_id=2, roles=("student",))
+
+    order = run_queued(
+        scheduler, clock, [("b1", batch), ("b2", batch), ("s1", student)]
+    )
+
+    assert order == ["s1", "b1", "b2"]
+    snapshot = scheduler.snapshot()
+    assert snapshot["granted"] == {"interactive": 2, "batch": 2}
+    assert snapshot["wait_seconds"]["batch"]["max"] > 0
+
+
+def test_role_weights_give_larger_share():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    teacher = Requester(user_id=1, roles=("teacher",))
+    student = Requester(user_id=2, roles=("student",))
+
+    order = run_queued(
+        scheduler,
+        clock,
+        [("t1", teacher), ("t2", teacher), ("t3", teacher), ("s1", student)],
+    )
+
+    assert order == ["t1", "t2", "s1", "t3"]
+
+
+def test_queue_timeout_is_reported():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, queue_timeout=0)
+    scheduler.acquire()
+
+    with pytest.raises(QueueTimeoutError):
+        scheduler.acquire()
+    assert scheduler.snapshot()["timed_out"]["interactive"] == 1
+    assert scheduler.snapshot()["queue_depth"]["interactive"] == 0
+
+
+def test_parse_role_weights():
+    assert parse_role_weights("admin:4, teacher:2") == {"admin": 4.0, "teacher": 2.0}
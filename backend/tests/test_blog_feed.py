@@ -0,0 +1,78 @@
+"""Tests for the public blog feed and post pages."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import BlogPost
+from app.utils.rendering import excerpt
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/blog.db"
+
+    with app.app_context():
+        db.create_all()
+        start = datetime(2026, 1, 1)
+        for index in range(5):
+            db.session.add(
+                BlogPost(
+                    title=f"Post {index}",
+                    slug=f"post-{index}",
+                    content=f"# Heading {index}\n\n" + "**study** " * 450,
+                    is_published=index != 2,
+                    created_at=start + timedelta(days=index),
+                )
+            )
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_excerpt_cuts_between_words():
+    assert excerpt("short text") == "short text"
+    assert excerpt("alpha beta gamma", length=12) == "alpha beta…"
+
+
+def test_summary_is_stored_and_refreshed_on_content_change(test_app):
+    post = db.session.query(BlogPost).filter_by(slug="post-0").one()
+    assert post.excerpt.startswith("Heading 0 study study")
+    assert "*" not in post.excerpt and len(post.excerpt) <= 281
+    assert post.reading_minutes == 3
+
+    post.content = "Just a few words."
+    db.session.commit()
+    assert (post.excerpt, post.reading_minutes) == ("Just a few words.", 1)
+
+
+def test_feed_pages_through_published_summaries(test_app):
+    client = test_app.test_client()
+    first = client.get("/api/v1/public/blog?limit=2").get_json()
+    assert [item["slug"] for item in first["items"]] == ["post-4", "post-3"]
+    assert "content" not in first["items"][0]
+    assert first["items"][0]["reading_minutes"] == 3
+
+    second = client.get(
+        f"/api/v1/public/blog?limit=2&cursor={first['next_cursor']}"
+    ).get_json()
+    assert [item["slug"] for item in second["items"]] == ["post-1", "post-0"]
+    assert second["next_cursor"] is None
+    assert client.get("/api/v1/public/blog?cursor=bogus").status_code == 400
+
+
+def test_post_detail_carries_etag(test_app):
+    client = test_app.test_client()
+    response = client.get("/api/v1/public/blog/post-1")
+    assert response.status_code == 200
+    assert response.get_json()["content"].startswith("# Heading 1")
+
+    etag = response.headers["ETag"]
+    cached = client.get("/api/v1/public/blog/post-1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert client.get("/api/v1/public/blog/post-2").status_code == 404
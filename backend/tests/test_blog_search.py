@@ -0,0 +1,106 @@
+"""Tests for indexed blog search."""
+
+from __future__ import annotations
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import BlogPost, Role, User
+from app.services.blog_search import blog_search_service
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/blog.db"
+
+    with app.app_context():
+        db.create_all()
+        admin = User(email="admin@example.com", username="admin")
+        admin.set_password("Admin123!")
+        admin.roles.append(Role(name="admin"))
+        db.session.add(admin)
+        db.session.add_all(
+            [
+                BlogPost(
+                    title="Spaced repetition explained",
+                    slug="spaced-repetition",
+                    content="Reviewing at growing intervals beats cramming.",
+                    is_published=True,
+                ),
+                BlogPost(
+                    title="Release notes",
+                    slug="intro-to-python-decks",
+                    content="Decks now support spaced review of Python snippets.",
+                    is_published=True,
+                ),
+                BlogPost(
+                    title="Unannounced feature",
+                    slug="secret-roadmap",
+                    content="Spaced practice for teams.",
+                    is_published=False,
+                ),
+            ]
+        )
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _slugs(posts):
+    return [post.slug for post in posts]
+
+
+def test_search_ranks_title_matches_and_matches_prefixes(test_app):
+    assert _slugs(blog_search_service.search("spac", published=True)) == [
+        "spaced-repetition",
+        "intro-to-python-decks",
+    ]
+    assert _slugs(blog_search_service.search("spaced", published=False)) == [
+        "secret-roadmap"
+    ]
+    assert blog_search_service.search("nothing here") == []
+
+
+def test_search_finds_partial_slugs(test_app):
+    assert _slugs(blog_search_service.search("ro-to-pyth")) == [
+        "intro-to-python-decks"
+    ]
+    assert set(_slugs(blog_search_service.search("in"))) == {
+        "intro-to-python-decks",
+        "spaced-repetition",
+    }
+
+
+def test_index_follows_updates_and_deletes(test_app):
+    post = db.session.query(BlogPost).filter_by(slug="spaced-repetition").one()
+    post.title = "Interleaving explained"
+    post.content = "Mix topics while studying."
+    db.session.commit()
+    assert _slugs(blog_search_service.search("interleav")) == ["spaced-repetition"]
+    assert "spaced-repetition" not in _slugs(blog_search_service.search("cramming"))
+
+    db.session.delete(post)
+    db.session.commit()
+    assert blog_search_service.search("interleav") == []
+
+
+def test_public_and_admin_search_endpoints(test_app):
+    client = test_app.test_client()
+    response = client.get("/api/v1/public/blog/search?q=python")
+    assert response.status_code == 200
+    assert [item["slug"] for item in response.get_json()] == [
+        "intro-to-python-decks"
+    ]
+    assert client.get("/api/v1/public/blog/search").status_code == 400
+
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "admin@example.com", "password": "Admin123!"},
+    ).get_json()["access_token"]
+    drafts = client.get(
+        "/api/v1/admin/blog-posts?q=spaced&status=draft",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert [item["slug"] for item in drafts.get_json()] == ["secret-roadmap"]
@@ -0,0 +1,121 @@
+"""Tests for set-based bulk admin operations."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import Lesson, Resource, Role, User
+from app.services.counter_service import counter_service
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/bulk.db"
+
+    with app.app_context():
+        db.create_all()
+        admin = User(email="admin@example.com", username="root")
+        admin.set_password("Admin123!")
+        admin.roles.append(Role(name="admin"))
+        db.session.add_all([admin, Role(name="marketing")])
+        for index in range(4):
+            user = User(email=f"user{index}@example.com", username=f"member_{index}")
+            user.set_password("Secret123!")
+            user.resources.append(
+                Resource(
+                    filename=f"f{index}",
+                    original_name=f"f{index}.txt",
+                    storage_url=f"/uploads/f{index}",
+                )
+            )
+            user.lessons.append(
+                Lesson(title=f"Lesson {index}", content="Body", status="draft")
+            )
+            db.session.add(user)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def client(test_app):
+    client = test_app.test_client()
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "admin@example.com", "password": "Admin123!"},
+    ).get_json()["access_token"]
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+def _ids(model, *where) -> list[int]:
+    return db.session.scalars(sa.select(model.id).where(*where)).all()
+
+
+def test_dry_run_reports_without_writing(client):
+    body = {"filter": {"q": "member_"}, "is_active": False, "dry_run": True}
+    response = client.post("/api/v1/admin/users/bulk", json=body)
+    assert response.get_json() == {"matched": 4, "affected": 4, "dry_run": True}
+    assert _ids(User, User.is_active.is_(False)) == []
+
+
+def test_users_are_updated_and_assigned_roles_in_bulk(client):
+    members = _ids(User, User.username.like("member%"))
+    response = client.post(
+        "/api/v1/admin/users/bulk", json={"ids": members[:2], "is_active": False}
+    )
+    assert response.get_json() == {"matched": 2, "affected": 2, "dry_run": False}
+    repeat = client.post(
+        "/api/v1/admin/users/bulk", json={"ids": members, "is_active": False}
+    ).get_json()
+    assert (repeat["matched"], repeat["affected"]) == (4, 2)
+
+    assign = client.post(
+        "/api/v1/admin/users/bulk/roles",
+        json={"filter": {"active": False}, "role": "marketing"},
+    ).get_json()
+    assert (assign["matched"], assign["affected"]) == (4, 4)
+    again = client.post(
+        "/api/v1/admin/users/bulk/roles",
+        json={"filter": {"role": "marketing"}, "role": "marketing"},
+    ).get_json()
+    assert (again["matched"], again["affected"]) == (4, 0)
+    assert client.get("/api/v1/admin/users/count?role=marketing").get_json() == {
+        "count": 4
+    }
+
+
+def test_resources_and_lessons_keep_counters_current(client):
+    assert counter_service.values()["pending_resources"] == 4
+    resources = _ids(Resource)
+    response = client.post(
+        "/api/v1/admin/resources/bulk",
+        json={"ids": resources[:3], "ai_processing_status": "complete"},
+    )
+    assert response.get_json()["affected"] == 3
+    assert counter_service.values()["pending_resources"] == 1
+
+    published = client.post(
+        "/api/v1/admin/lessons/bulk/publish", json={"filter": {"status": "draft"}}
+    ).get_json()
+    assert published["affected"] == 4
+    assert counter_service.values()["published_lessons"] == 4
+    assert counter_service.reconcile() == {}
+
+
+def test_invalid_selections_are_rejected(client):
+    def status(path: str, body: dict) -> int:
+        return client.post(f"/api/v1/admin/{path}", json=body).status_code
+
+    assert status("users/bulk", {"is_active": False}) == 400
+    assert status("users/bulk", {"filter": {}, "is_active": False}) == 400
+    assert status("users/bulk", {"filter": {"q": " "}, "is_active": False}) == 400
+    assert status("users/bulk", {"ids": [True], "is_active": False}) == 400
+    assert status("users/bulk", {"filter": {"email": "x"}, "is_active": False}) == 400
+    assert status("users/bulk/roles", {"ids": [1], "role": "ghost"}) == 404
+    assert status("resources/bulk", {"ids": [1], "ai_processing_status": "x"}) == 400
+    assert status("lessons/bulk/publish", {"filter": {"author_id": "1"}}) == 400
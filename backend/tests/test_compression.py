@@ -0,0 +1,113 @@
+"""Tests for content-negotiated response compression."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import FAQ
+from app.utils import compression
+from flask import Response, jsonify, stream_with_context
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/compress.db"
+
+    @app.get("/test/items/<int:count>")
+    def items(count: int):
+        return jsonify([{"id": index} for index in range(count)])
+
+    @app.get("/test/stream")
+    def stream():
+        def generate():
+            for index in range(200):
+                yield json.dumps({"id": index}) + "\n"
+
+        return Response(
+            stream_with_context(generate()), mimetype="application/x-ndjson"
+        )
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_large_responses_are_gzipped_when_accepted(test_app):
+    client = test_app.test_client()
+    response = client.get("/test/items/100", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert len(json.loads(gzip.decompress(response.get_data()))) == 100
+
+    small = client.get("/test/items/2", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    refused = client.get(
+        "/test/items/100", headers={"Accept-Encoding": "gzip;q=0, identity"}
+    )
+    assert "Content-Encoding" not in refused.headers
+    assert len(refused.get_json()) == 100
+
+
+def test_streamed_responses_are_compressed_incrementally(test_app):
+    response = test_app.test_client().get(
+        "/test/stream", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    lines = gzip.decompress(response.get_data()).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(range(200))
+
+
+def test_streamed_chunks_are_flushed_as_they_are_produced(test_app):
+    response = test_app.test_client().get(
+        "/test/stream", headers={"Accept-Encoding": "gzip"}, buffered=False
+    )
+    decompressor = zlib.decompressobj(31)
+    first = next(iter(response.response))
+
+    assert decompressor.decompress(first) == b'{"id": 0}\n'
+    response.close()
+
+
+def test_cached_responses_store_compressed_bodies(test_app, monkeypatch):
+    db.session.add_all(
+        FAQ(question=f"Question {index}?", answer="An answer " * 10)
+        for index in range(20)
+    )
+    db.session.commit()
+    calls: list[int] = []
+    codec = compression.CODECS["gzip"]
+
+    def counting(data: bytes, level: int) -> bytes:
+        calls.append(len(data))
+        return codec.compress(data, level)
+
+    monkeypatch.setitem(
+        compression.CODECS,
+        "gzip",
+        compression.Codec("gzip", counting, codec.stream),
+    )
+    client = test_app.test_client()
+    headers = {"Accept-Encoding": "gzip"}
+
+    first = client.get("/api/v1/public/faq", headers=headers)
+    second = client.get("/api/v1/public/faq", headers=headers)
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert second.get_data() == first.get_data()
+    assert len(json.loads(gzip.decompress(first.get_data()))) == 20
+    assert len(calls) == 1
+
+    etag = first.headers["ETag"]
+    assert etag.startswith("W/")
+    revalidated = client.get(
+        "/api/v1/public/faq", headers={**headers, "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
@@ -0,0 +1,166 @@
+"""Tests for paginated, streamed and packaged deck cards."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import User
+from app.services.flashcard_store import insert_deck
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/cards.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def deck_id(test_app) -> int:
+    user = User(email="learner@example.com", username="learner")
+    user.set_password("Learner123!")
+    db.session.add(user)
+    db.session.flush()
+    deck = insert_deck(
+        title="Large",
+        owner_id=user.id,
+        cards=[{"question": f"Q{i}", "answer": f"A{i}"} for i in range(250)],
+    )
+    db.session.commit()
+    return deck.id
+
+
+@pytest.fixture()
+def client(test_app, deck_id):
+    client = test_app.test_client()
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "learner@example.com", "password": "Learner123!"},
+    )
+    token = response.get_json()["access_token"]
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+def test_deck_endpoint_returns_metadata_only(client, deck_id):
+    body = client.get(f"/api/v1/flashcards/{deck_id}").get_json()
+
+    assert body["title"] == "Large"
+    assert body["card_count"] == 250
+    assert "flashcards" not in body
+
+
+def test_cards_are_paginated_with_cursor(client, deck_id):
+    questions: list[str] = []
+    url = f"/api/v1/flashcards/{deck_id}/cards?limit=100"
+    pages = 0
+    while url:
+        body = client.get(url).get_json()
+        pages += 1
+        questions.extend(card["question"] for card in body["items"])
+        cursor = body["next_cursor"]
+        url = f"/api/v1/flashcards/{deck_id}/cards?limit=100&cursor={cursor}"
+        url = url if cursor else ""
+
+    assert pages == 3
+    assert questions == [f"Q{i}" for i in range(250)]
+    bad = client.get(f"/api/v1/flashcards/{deck_id}/cards?limit=abc")
+    assert bad.status_code == 400
+
+
+def test_cards_stream_as_ndjson(client, deck_id):
+    response = client.get(f"/api/v1/flashcards/{deck_id}/cards/stream")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    cards = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(cards) == 250
+    assert cards[0]["question"] == "Q0" and cards[-1]["answer"] == "A249"
+
+
+def _package(cards, title="Imported") -> io.BytesIO:
+    lines = [{"format": "flashy-deck", "version": 1, "title": title}, *cards]
+    body = "".join(json.dumps(line) + "\n" for line in lines)
+    return io.BytesIO(gzip.compress(body.encode()))
+
+
+def test_export_streams_a_gzip_package(client, deck_id):
+    response = client.get(f"/api/v1/flashcards/{deck_id}/export")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/gzip"
+    lines = gzip.decompress(response.get_data()).decode().splitlines()
+    header = json.loads(lines[0])
+    assert header["title"] == "Large" and header["card_count"] == 250
+    assert len(lines) == 251
+    assert json.loads(lines[1]) == {"question": "Q0", "answer": "A0"}
+
+
+def test_export_round_trips_into_new_deck(client, deck_id, test_app):
+    test_app.config["DECK_IMPORT_BATCH_SIZE"] = 100
+    package = client.get(f"/api/v1/flashcards/{deck_id}/export").get_data()
+
+    response = client.post(
+        "/api/v1/flashcards/import",
+        data={"file": (io.BytesIO(package), "deck.ndjson.gz")},
+    )
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["title"] == "Large" and body["id"] != deck_id
+    assert (body["imported"], body["duplicates"], body["card_count"]) == (250, 0, 250)
+
+
+def test_import_into_deck_skips_duplicate_cards(client, deck_id):
+    cards = [
+        {"question": "Q1", "answer": "A1"},
+        {"question": "  q1 ", "answer": "a1"},
+        {"question": "New", "answer": "Card"},
+        {"question": "new", "answer": "card"},
+    ]
+
+    response = client.post(
+        "/api/v1/flashcards/import",
+        data={"file": (_package(cards), "deck.ndjson.gz"), "deck_id": str(deck_id)},
+    )
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["imported"], body["duplicates"], body["card_count"]) == (1, 3, 251)
+    assert body["version"] == 2
+
+
+def test_import_rejects_invalid_packages(client):
+    not_gzip = client.post(
+        "/api/v1/flashcards/import",
+        data={"file": (io.BytesIO(b"plain text"), "deck.txt")},
+    )
+    bad_card = client.post(
+        "/api/v1/flashcards/import",
+        data={"file": (_package([{"question": "Q"}]), "deck.ndjson.gz")},
+    )
+
+    assert not_gzip.status_code == 400
+    assert bad_card.status_code == 400
+    assert "question and an answer" in bad_card.get_json()["message"]
+
+
+def test_import_bounds_decompressed_lines(client):
+    bomb = io.BytesIO(gzip.compress(b"x" * (10 * 1024 * 1024)))
+
+    response = client.post(
+        "/api/v1/flashcards/import", data={"file": (bomb, "deck.ndjson.gz")}
+    )
+
+    assert response.status_code == 400
+    assert "at most" in response.get_json()["message"]
@@ -0,0 +1,70 @@
+"""Tests for the offline extractive flashcard backend."""
+
+from __future__ import annotations
+
+import pytest
+from app import create_app
+from app.services.ai_provider import FallbackProvider
+from app.services.extractive_service import ExtractiveService, ExtractiveServiceError
+from app.services.gemini_service import (
+    GeminiConfigurationError,
+    GeminiService,
+    GeminiUnavailableError,
+)
+
+TEXT = [
+    "Photosynthesis is the process by which plants convert light into chemical "
+    "energy. Chlorophyll is a green pigment that absorbs light in the chloroplast. "
+    "The Calvin cycle refers to the reactions that fix carbon dioxide into sugar.",
+    "Plants release oxygen as a by-product of photosynthesis in their leaves. "
+    "Stomata are the small pores that let carbon dioxide enter the leaf tissue. "
+    "Light intensity and temperature both limit the rate of photosynthesis.",
+]
+
+
+class UnavailableGemini(GeminiService):
+    def generate_flashcards(self, chunks):
+        raise GeminiUnavailableError("Gemini is temporarily unavailable")
+
+
+def test_definitional_sentences_become_questions():
+    payload = ExtractiveService().generate_flashcards(TEXT)
+
+    questions = {card.question: card.answer for card in payload.cards}
+    assert questions["What is Photosynthesis?"].startswith("The process by which")
+    assert questions["What are Stomata?"].startswith("The small pores")
+    assert "What does the Calvin cycle refer to?" in questions
+    assert len(payload.cards) == 5
+    assert payload.source == "extractive"
+    assert payload.summary
+
+
+def test_study_pack_includes_lesson_outline():
+    pack = ExtractiveService().generate_study_pack(TEXT)
+
+    assert pack.lesson.startswith("Overview")
+    assert "Key points" in pack.lesson
+
+
+def test_text_without_sentences_is_rejected():
+    with pytest.raises(ExtractiveServiceError):
+        ExtractiveService().generate_flashcards(["too short"])
+
+
+def test_fallback_is_used_when_remote_provider_is_unavailable():
+    app = create_app("backend.config.TestingConfig")
+    provider = FallbackProvider(UnavailableGemini(), ExtractiveService())
+
+    with app.app_context():
+        payload = provider.generate_flashcards(TEXT)
+
+    assert payload.source == "extractive"
+
+
+def test_missing_api_key_is_not_hidden_by_the_fallback():
+    app = create_app("backend.config.TestingConfig")
+    app.config["GOOGLE_GEMINI_API_KEY"] = None
+    provider = FallbackProvider(GeminiService(), ExtractiveService())
+
+    with app.app_context(), pytest.raises(GeminiConfigurationError):
+        provider.generate_flashcards(TEXT)
@@ -0,0 +1,146 @@
+"""Tests for packing several resources into one generation request."""
+
+from __future__ import annotations
+
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import FlashcardDeck, Resource, Role, User
+from app.services.flashcard_service import flashcard_service
+from app.services.gemini_service import gemini_service
+
+
+class BatchModel:
+    """Answer batch prompts for every document except ``skip_id``."""
+
+    def __init__(self, skip_id: str | None = None) -> None:
+        self.prompts: list[str] = []
+        self.skip_id = skip_id
+
+    def generate_content(self, prompt: str, **kwargs):
+        self.prompts.append(prompt)
+        ids = re.findall(r"^### Document (\S+)$", prompt, re.MULTILINE)
+        results = [
+            {
+                "id": doc_id,
+                "flashcards": [{"question": f"Q{doc_id}", "answer": f"A{doc_id}"}],
+                "summary": f"Summary {doc_id}",
+            }
+            for doc_id in ids
+            if doc_id != self.skip_id
+        ]
+        return SimpleNamespace(text=json.dumps({"results": results}))
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/batch.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def resources(test_app):
+    user = User(email="teacher@example.com", username="teacher")
+    user.set_password("Teacher123!")
+    user.roles.append(Role(name="teacher"))
+    items = [
+        Resource(
+            owner=user,
+            filename=f"note-{index}.txt",
+            original_name=f"note-{index}.txt",
+            storage_url=f"https://cdn.example.com/note-{index}.txt",
+            text_content=f"Short note number {index} about retrieval practice.",
+            ai_processing_status="ready",
+        )
+        for index in range(3)
+    ]
+    db.session.add_all([user, *items])
+    db.session.commit()
+    return items
+
+
+def login(client) -> dict[str, str]:
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "teacher@example.com", "password": "Teacher123!"},
+    )
+    return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+
+def test_small_resources_share_one_request(test_app, resources, monkeypatch):
+    model = BatchModel(skip_id=str(resources[1].id))
+    monkeypatch.setattr(gemini_service, "_init_client", lambda: model)
+    client = test_app.test_client()
+
+    response = client.post(
+        "/api/v1/flashcards/generate/batch",
+        json={
+            "resource_ids": [resource.id for resource in resources],
+            "provider": "gemini",
+        },
+        headers=login(client),
+    )
+
+    assert response.status_code == 200
+    assert len(model.prompts) == 1
+    results = {item["resource_id"]: item for item in response.get_json()["results"]}
+    first, skipped, last = (results[resource.id] for resource in resources)
+    assert first["deck"]["description"] == f"Summary {resources[0].id}"
+    assert last["deck"]["flashcards"][0]["question"] == f"Q{resources[2].id}"
+    assert skipped["deck"] is None and "omitted" in skipped["error"]
+    assert resources[1].ai_processing_status == "failed"
+    assert db.session.scalar(db.select(db.func.count()).select_from(FlashcardDeck)) == 2
+
+
+def test_batch_size_is_capped(test_app, resources):
+    test_app.config["FLASHCARD_BATCH_MAX"] = 2
+    client = test_app.test_client()
+
+    response = client.post(
+        "/api/v1/flashcards/generate/batch",
+        json={"resource_ids": [resource.id for resource in resources]},
+        headers=login(client),
+    )
+
+    assert response.status_code == 400
+    assert "At most 2" in response.get_json()["message"]
+
+
+@pytest.mark.parametrize(
+    "resource_ids", [[], "1", [True], ["1"], [1.5], [None], [[1]]]
+)
+def test_malformed_resource_ids_are_rejected(test_app, resources, resource_ids):
+    client = test_app.test_client()
+
+    response = client.post(
+        "/api/v1/flashcards/generate/batch",
+        json={"resource_ids": resource_ids},
+        headers=login(client),
+    )
+
+    assert response.status_code == 400
+
+
+def test_token_budget_splits_batches(test_app, resources, monkeypatch):
+    model = BatchModel()
+    monkeypatch.setattr(gemini_service, "_init_client", lambda: model)
+
+    results = flashcard_service.generate_decks_batch(
+        owner=resources[0].owner,
+        resources=resources,
+        provider="gemini",
+        token_budget=30,
+    )
+
+    assert len(model.prompts) == 2
+    assert all(result.deck is not None for result in results)
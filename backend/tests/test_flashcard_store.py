@@ -0,0 +1,107 @@
+"""Tests for bulk deck persistence."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import Flashcard, User
+from app.services.ai_provider import FlashcardItem
+from app.services.flashcard_store import clone_deck, insert_deck
+
+
+def test_deck_and_cards_are_inserted_in_two_statements(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/store.db"
+
+    with app.app_context():
+        db.create_all()
+        try:
+            user = User(email="teacher@example.com", username="teacher")
+            user.set_password("Teacher123!")
+            db.session.add(user)
+            db.session.commit()
+            cards = [
+                FlashcardItem(question=f"Q{index}", answer=f"A{index}")
+                for index in range(300)
+            ]
+            statements: list[str] = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement.split()[0].upper())
+
+            sa.event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                deck = insert_deck(title="Bulk", owner_id=user.id, cards=cards)
+                db.session.commit()
+            finally:
+                sa.event.remove(db.engine, "before_cursor_execute", record)
+
+            assert statements.count("INSERT") == 2
+            assert "UPDATE" not in statements
+            assert deck.version == 1 and deck.card_count == 300
+            assert len(deck.flashcards) == 300
+            last = db.session.scalar(
+                sa.select(Flashcard.question)
+                .where(Flashcard.deck_id == deck.id)
+                .order_by(Flashcard.id.desc())
+                .limit(1)
+            )
+            assert last == "Q299"
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+def test_clone_copies_deck_and_cards_in_sql(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/clone.db"
+
+    with app.app_context():
+        db.create_all()
+        try:
+            owner = User(email="owner@example.com", username="owner")
+            owner.set_password("Owner123!")
+            teacher = User(email="teacher@example.com", username="teacher")
+            teacher.set_password("Teacher123!")
+            db.session.add_all([owner, teacher])
+            db.session.commit()
+            source = insert_deck(
+                title="Source",
+                description="Original",
+                owner_id=owner.id,
+                cards=[{"question": f"Q{i}", "answer": f"A{i}"} for i in range(500)],
+            )
+            db.session.commit()
+            source_id, teacher_id = source.id, teacher.id
+            db.session.expunge_all()
+
+            statements: list[str] = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            sa.event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                clone, copied = clone_deck(source_id, owner_id=teacher_id)
+                db.session.commit()
+            finally:
+                sa.event.remove(db.engine, "before_cursor_execute", record)
+
+            assert copied == 500
+            assert not any(
+                s.lstrip().upper().startswith("SELECT") and "FROM flashcards" in s
+                for s in statements
+            )
+            assert clone.owner_id == teacher_id
+            assert clone.source_deck_id == source_id
+            assert (clone.title, clone.description) == ("Source", "Original")
+            questions = db.session.scalars(
+                sa.select(Flashcard.question)
+                .where(Flashcard.deck_id == clone.id)
+                .order_by(Flashcard.id)
+            ).all()
+            assert questions[:2] == ["Q0", "Q1"] and len(questions) == 500
+        finally:
+            db.session.remove()
+            db.drop_all()
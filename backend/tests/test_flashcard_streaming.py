@@ -0,0 +1,113 @@
+"""Tests for streamed flashcard generation."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import Flashcard, FlashcardDeck, Resource, Role, User
+from app.services.gemini_service import FlashcardStreamParser, gemini_service
+
+STREAMED_RESPONSE = json.dumps(
+    {
+        "flashcards": [
+            {"question": "What is {recall}?", "answer": 'Retrieving "facts"'},
+            {"question": "What is spacing?", "answer": "Reviewing over days"},
+        ],
+        "summary": "Memory techniques.",
+    }
+)
+
+
+class FakeModel:
+    """Stand-in for the Gemini model that replays a response in fragments."""
+
+    def __init__(self, text: str, size: int = 7) -> None:
+        self._fragments = [text[i : i + size] for i in range(0, len(text), size)]
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        assert stream
+        return [SimpleNamespace(text=fragment) for fragment in self._fragments]
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/streaming.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def owner(test_app) -> User:
+    role = Role(name="student")
+    user = User(email="learner@example.com", username="learner")
+    user.set_password("Learner123!")
+    user.roles.append(role)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_parser_emits_cards_as_objects_complete():
+    parser = FlashcardStreamParser()
+    emitted = []
+    for index in range(0, len(STREAMED_RESPONSE), 5):
+        emitted.append(parser.feed(STREAMED_RESPONSE[index : index + 5]))
+
+    cards = [card for batch in emitted for card in batch]
+    questions = [card.question for card in cards]
+    assert questions == ["What is {recall}?", "What is spacing?"]
+    first_card_at = next(i for i, batch in enumerate(emitted) if batch)
+    assert first_card_at < len(emitted) // 2
+
+    payload = parser.finish(cards)
+    assert payload.summary == "Memory techniques."
+    assert payload.cards[0].answer == 'Retrieving "facts"'
+
+
+def test_stream_endpoint_sends_cards_then_persists_deck(test_app, owner, monkeypatch):
+    resource = Resource(
+        owner=owner,
+        filename="notes.txt",
+        original_name="notes.txt",
+        storage_url="https://cdn.example.com/notes.txt",
+        text_content="Active recall and spacing improve retention.",
+    )
+    db.session.add(resource)
+    db.session.commit()
+    monkeypatch.setattr(
+        gemini_service, "_init_client", lambda: FakeModel(STREAMED_RESPONSE)
+    )
+
+    client = test_app.test_client()
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"email": "learner@example.com", "password": "Learner123!"},
+    )
+    headers = {"Authorization": f"Bearer {login.get_json()['access_token']}"}
+
+    response = client.post(
+        "/api/v1/flashcards/generate/stream",
+        json={"resource_id": resource.id},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    frames = [frame for frame in response.get_data(as_text=True).split("\n\n") if frame]
+    events = [frame.split("\n")[0].removeprefix("event: ") for frame in frames]
+    assert events == ["card", "card", "deck"]
+
+    deck_payload = json.loads(frames[-1].split("\n")[1].removeprefix("data: "))
+    assert deck_payload["description"] == "Memory techniques."
+    assert db.session.scalar(db.select(db.func.count()).select_from(Flashcard)) == 2
+    deck = db.session.get(FlashcardDeck, deck_payload["id"])
+    assert deck.resource.ai_processing_status == "complete"
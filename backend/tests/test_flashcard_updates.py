@@ -0,0 +1,195 @@
+"""Tests for diff-based deck updates."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import Flashcard, FlashcardDeck, Resource, Role, User
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/updates.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def deck(test_app) -> FlashcardDeck:
+    user = User(email="learner@example.com", username="learner")
+    user.set_password("Learner123!")
+    user.roles.append(Role(name="student"))
+    deck = FlashcardDeck(title="Memory", owner=user)
+    for index in range(3):
+        deck.flashcards.append(Flashcard(question=f"Q{index}", answer=f"A{index}"))
+    db.session.add(deck)
+    db.session.commit()
+    return deck
+
+
+@pytest.fixture()
+def client(test_app, deck):
+    client = test_app.test_client()
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "learner@example.com", "password": "Learner123!"},
+    )
+    token = response.get_json()["access_token"]
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+def test_update_applies_minimal_diff(client, deck):
+    first, second, _ = (card.id for card in deck.flashcards)
+    untouched_at = db.session.get(Flashcard, first).updated_at
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement.split()[0].upper())
+
+    sa.event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.put(
+            f"/api/v1/flashcards/{deck.id}",
+            json={
+                "version": 1,
+                "cards": [
+                    {"id": first, "question": "Q0", "answer": "A0"},
+                    {"id": second, "question": "Q1", "answer": "A1 edited"},
+                    {"question": "Q3", "answer": "A3"},
+                ],
+            },
+        )
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["version"] == 2 and "flashcards" not in body
+    page = client.get(f"/api/v1/flashcards/{deck.id}/cards").get_json()
+    cards = {card["question"]: card for card in page["items"]}
+    assert cards["Q0"]["id"] == first
+    assert cards["Q1"] == {**cards["Q1"], "id": second, "answer": "A1 edited"}
+    assert "Q2" not in cards and "Q3" in cards
+    db.session.expire_all()
+    assert db.session.get(Flashcard, first).updated_at == untouched_at
+    writes = [kind for kind in statements if kind in {"INSERT", "UPDATE", "DELETE"}]
+    assert sorted(writes) == ["DELETE", "INSERT", "UPDATE", "UPDATE"]
+
+
+def test_stale_version_is_rejected(client, deck):
+    cards = [{"question": "Q", "answer": "A"}]
+    assert client.put(
+        f"/api/v1/flashcards/{deck.id}", json={"version": 1, "cards": cards}
+    ).status_code == 200
+
+    response = client.put(
+        f"/api/v1/flashcards/{deck.id}", json={"version": 1, "cards": cards}
+    )
+
+    assert response.status_code == 409
+    assert response.get_json()["version"] == 2
+
+
+def test_foreign_card_ids_are_rejected(client, deck):
+    response = client.put(
+        f"/api/v1/flashcards/{deck.id}",
+        json={"cards": [{"id": 9999, "question": "Q", "answer": "A"}]},
+    )
+
+    assert response.status_code == 400
+    assert len(db.session.get(FlashcardDeck, deck.id).flashcards) == 3
+
+
+@pytest.mark.parametrize(
+    "cards",
+    [
+        [],
+        [{"id": True, "question": "Q", "answer": "A"}],
+        [{"id": "5", "question": "Q", "answer": "A"}],
+    ],
+)
+def test_malformed_cards_are_rejected(client, deck, cards):
+    response = client.put(f"/api/v1/flashcards/{deck.id}", json={"cards": cards})
+
+    assert response.status_code == 400
+    assert "belong" not in response.get_json()["message"]
+    assert len(db.session.get(FlashcardDeck, deck.id).flashcards) == 3
+
+
+def test_clone_endpoint_copies_deck(client, deck):
+    response = client.post(
+        f"/api/v1/flashcards/{deck.id}/clone", json={"title": "Mine"}
+    )
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["title"] == "Mine"
+    assert body["source_deck_id"] == deck.id
+    assert body["card_count"] == 3
+    assert "flashcards" not in body
+    clone = db.session.get(FlashcardDeck, body["id"])
+    assert [card.question for card in clone.flashcards] == ["Q0", "Q1", "Q2"]
+
+
+def test_clone_of_another_users_deck_drops_resource(client, test_app):
+    other = User(email="other@example.com", username="other")
+    other.set_password("Other123!")
+    resource = Resource(
+        owner=other,
+        filename="notes.txt",
+        original_name="notes.txt",
+        storage_url="/uploads/notes.txt",
+    )
+    shared = FlashcardDeck(
+        title="Shared", owner=other, resource=resource, is_public=True
+    )
+    db.session.add(shared)
+    db.session.commit()
+
+    response = client.post(f"/api/v1/flashcards/{shared.id}/clone")
+
+    assert response.status_code == 201
+    assert response.get_json()["resource_id"] is None
+
+
+def test_clone_requires_access(client, test_app):
+    other = User(email="other@example.com", username="other")
+    other.set_password("Other123!")
+    private = FlashcardDeck(title="Private", owner=other)
+    db.session.add(private)
+    db.session.commit()
+
+    response = client.post(f"/api/v1/flashcards/{private.id}/clone")
+
+    assert response.status_code == 403
+
+
+def test_card_count_is_adjusted_once_per_flush(test_app, deck):
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE flashcard_decks"):
+            statements.append(statement)
+
+    sa.event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        for index in range(5):
+            deck.flashcards.append(Flashcard(question=f"N{index}", answer="A"))
+        db.session.commit()
+        assert len(statements) == 1
+        assert db.session.get(FlashcardDeck, deck.id).card_count == 8
+
+        db.session.delete(deck)
+        db.session.commit()
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", record)
+    assert len(statements) == 1
+    assert db.session.scalar(sa.select(sa.func.count(Flashcard.id))) == 0
@@ -0,0 +1,139 @@
+"""Tests for fitting FSRS weights from review history."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import CardReview, Flashcard, FlashcardDeck, ReviewParameters, User
+from app.services.fsrs import AGAIN, DEFAULT_WEIGHTS, GOOD
+from app.services.fsrs_optimizer import ReviewHistory, fit_weights
+from app.services.review_service import review_service
+
+
+def _forgetful_columns(user_id: int, cards: int = 20, reviews: int = 6):
+    """Reviews of a user who forgets most cards after a few days."""
+    rng = np.random.default_rng(user_id)
+    user_ids, card_ids, ratings, elapsed = [], [], [], []
+    for card in range(cards):
+        for step in range(reviews):
+            user_ids.append(user_id)
+            card_ids.append(card)
+            ratings.append(GOOD if step == 0 or rng.random() < 0.3 else AGAIN)
+            elapsed.append(0.0 if step == 0 else 3.0)
+    return user_ids, card_ids, ratings, elapsed
+
+
+def _history(*user_ids: int) -> ReviewHistory:
+    columns = [[], [], [], []]
+    for user_id in user_ids:
+        for column, values in zip(columns, _forgetful_columns(user_id)):
+            column.extend(values)
+    return ReviewHistory.from_columns(
+        np.array(columns[0]),
+        np.array(columns[1]),
+        np.array(columns[2], dtype=np.int8),
+        np.array(columns[3], dtype=float),
+    )
+
+
+def test_history_groups_sequences_by_user_and_card():
+    history = ReviewHistory.from_columns(
+        np.array([1, 1, 1, 2]),
+        np.array([5, 5, 6, 5]),
+        np.array([GOOD, AGAIN, GOOD, GOOD], dtype=np.int8),
+        np.array([0.0, 2.0, 0.0, 0.0]),
+    )
+
+    assert history.user_ids.tolist() == [1, 2]
+    assert history.ratings.shape == (3, 2)
+    assert history.ratings[0].tolist() == [GOOD, AGAIN]
+    assert history.active.tolist() == [3, 1]
+    assert history.predictions.tolist() == [1, 0]
+
+
+def test_fit_lowers_loss_for_every_user():
+    history = _history(1, 2, 3)
+
+    result = fit_weights(history, iterations=15)
+
+    assert result.weights.shape == (3, len(DEFAULT_WEIGHTS))
+    assert np.all(result.final_loss < result.initial_loss)
+    assert np.allclose(history.user_losses(result.weights), result.final_loss)
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/fsrs.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _add_reviews(user: User, columns) -> None:
+    deck = FlashcardDeck(title=f"{user.username} deck", owner=user)
+    cards = {}
+    for card in sorted(set(columns[1])):
+        cards[card] = Flashcard(question=f"Q{card}", answer=f"A{card}")
+        deck.flashcards.append(cards[card])
+    db.session.add(deck)
+    db.session.flush()
+    start = datetime(2026, 1, 1)
+    reviewed_at: dict[int, datetime] = {}
+    rows = []
+    for _, card, rating, elapsed in zip(*columns):
+        reviewed_at[card] = reviewed_at.get(card, start) + timedelta(days=elapsed)
+        rows.append(
+            {
+                "user_id": user.id,
+                "flashcard_id": cards[card].id,
+                "rating": rating,
+                "reviewed_at": reviewed_at[card],
+                "elapsed_days": elapsed,
+                "stability": 1.0,
+                "difficulty": 5.0,
+            }
+        )
+    db.session.execute(sa.insert(CardReview), rows)
+
+
+def test_fit_parameters_writes_weights_back(test_app):
+    users = [User(email=f"u{i}@example.com", username=f"u{i}") for i in range(3)]
+    for user in users:
+        user.set_password("Learner123!")
+    db.session.add_all(users)
+    db.session.flush()
+    _add_reviews(users[0], _forgetful_columns(users[0].id))
+    _add_reviews(users[1], _forgetful_columns(users[1].id))
+    _add_reviews(users[2], _forgetful_columns(users[2].id, cards=2))
+    db.session.commit()
+
+    assert review_service.count_fit_reviews(min_reviews=50) == 240
+    progress = []
+    summary = review_service.fit_parameters(
+        min_reviews=50, iterations=10, progress=progress.append
+    )
+
+    assert summary.users == 2
+    assert summary.reviews == 240
+    assert progress == [240]
+    stored = db.session.scalars(sa.select(ReviewParameters)).all()
+    assert {row.user_id for row in stored} == {users[0].id, users[1].id}
+    assert all(row.review_count == 120 for row in stored)
+    fitted = db.session.get(ReviewParameters, users[0].id).weights
+    assert review_service.scheduler_for(users[0]).weights.tolist() == fitted
+    assert review_service.scheduler_for(users[2]).weights.tolist() == list(
+        DEFAULT_WEIGHTS
+    )
+
+    refit = review_service.fit_parameters(min_reviews=50, iterations=2)
+    assert refit.users == 2
+    assert db.session.scalar(sa.select(sa.func.count(ReviewParameters.user_id))) == 2
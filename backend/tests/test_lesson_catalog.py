@@ -0,0 +1,111 @@
+"""Tests for the public lesson catalog."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import Category, Lesson, User
+from app.services.lesson_service import lesson_service
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/catalog.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def lessons(test_app) -> list[Lesson]:
+    author = User(email="expert@example.com", username="expert")
+    author.set_password("Expert123!")
+    science = Category(name="Science")
+    history = Category(name="History")
+    start = datetime(2026, 1, 1)
+    lessons = []
+    for index in range(5):
+        lesson = Lesson(
+            title=f"Lesson {index}",
+            content="Long body " * 200,
+            summary=f"Summary {index}",
+            author=author,
+            status="published" if index != 4 else "draft",
+            created_at=start + timedelta(days=index),
+        )
+        lesson.categories.append(science if index % 2 == 0 else history)
+        lessons.append(lesson)
+    db.session.add_all(lessons)
+    db.session.commit()
+    return lessons
+
+
+def test_catalog_returns_projected_summaries(test_app, lessons):
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    client = test_app.test_client()
+    sa.event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        body = client.get("/api/v1/public/lessons").get_json()
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", record)
+
+    assert [item["title"] for item in body["items"]] == [
+        "Lesson 3",
+        "Lesson 2",
+        "Lesson 1",
+        "Lesson 0",
+    ]
+    assert body["items"][0] == {
+        "id": lessons[3].id,
+        "title": "Lesson 3",
+        "summary": "Summary 3",
+        "author": "expert",
+        "categories": ["History"],
+        "created_at": "2026-01-04T00:00:00",
+    }
+    assert body["next_cursor"] is None
+    assert not any("lessons.content" in statement for statement in statements)
+
+
+def test_catalog_filters_by_category_and_pages(test_app, lessons):
+    client = test_app.test_client()
+
+    science = client.get("/api/v1/public/lessons?category=Science").get_json()
+    first = client.get("/api/v1/public/lessons?limit=3").get_json()
+    rest = client.get(
+        f"/api/v1/public/lessons?limit=3&cursor={first['next_cursor']}"
+    ).get_json()
+
+    assert [item["title"] for item in science["items"]] == ["Lesson 2", "Lesson 0"]
+    assert len(first["items"]) == 3
+    assert [item["title"] for item in rest["items"]] == ["Lesson 0"]
+    assert rest["next_cursor"] is None
+
+
+def test_first_page_cache_is_invalidated_on_publish(test_app, lessons):
+    client = test_app.test_client()
+    assert len(client.get("/api/v1/public/lessons").get_json()["items"]) == 4
+
+    db.session.execute(
+        sa.update(Lesson).where(Lesson.id == lessons[0].id).values(title="Renamed")
+    )
+    db.session.commit()
+    cached = client.get("/api/v1/public/lessons").get_json()["items"]
+    assert cached[-1]["title"] == "Lesson 0"
+
+    lesson_service.publish_lesson(lessons[4])
+    items = client.get("/api/v1/public/lessons").get_json()["items"]
+    assert items[0]["title"] == "Lesson 4"
+    assert items[-1]["title"] == "Renamed"
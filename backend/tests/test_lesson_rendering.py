@@ -0,0 +1,59 @@
+"""Tests for stored lesson HTML renderings."""
+
+from __future__ import annotations
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import Lesson
+from app.utils import rendering
+from app.utils.rendering import render_markdown
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/render.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_markdown_is_rendered_and_sanitized():
+    html = render_markdown(
+        "# Recall\n\n**Bold** point\n\n<script>alert(1)</script>\n\n"
+        "[bad](javascript:alert(1)) [good](https://example.com)"
+    )
+
+    assert "<h1>Recall</h1>" in html
+    assert "<strong>Bold</strong>" in html
+    assert "<script>" not in html and "&lt;script&gt;" in html
+    assert 'href="javascript:' not in html
+    assert '<a href="https://example.com">good</a>' in html
+
+
+def test_lessons_render_on_save_only_when_content_changes(test_app, monkeypatch):
+    calls: list[str] = []
+    original = rendering.render_markdown
+
+    def counting(text: str) -> str:
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr("app.models.lesson.render_markdown", counting)
+    lesson = Lesson(title="Memory", content="Use *spacing*.")
+    db.session.add(lesson)
+    db.session.commit()
+    assert lesson.rendered_content == "<p>Use <em>spacing</em>.</p>\n"
+
+    lesson.status = "published"
+    db.session.commit()
+    assert len(calls) == 1
+
+    lesson.content = "Use **recall**."
+    db.session.commit()
+    assert len(calls) == 2
+    assert "<strong>recall</strong>" in lesson.rendered_content
@@ -0,0 +1,77 @@
+"""Tests for prompt compaction of extracted resource text."""
+
+from __future__ import annotations
+
+from app import create_app
+from app.models import Resource
+from app.services.ai_provider import chunk_resource
+from app.services.prompt_compactor import PAGE_BREAK, compact_text
+
+BODY = [
+    "Photosynthesis converts light energy into chemical energy stored in sugar.\n"
+    "It takes place in the chloroplasts of plant cells.",
+    "The light reactions split water and release oxygen as a by-product.\n"
+    "The Calvin cycle then fixes carbon dioxide into three-carbon sugars.",
+    "Stomata regulate gas exchange and water loss through the leaf surface.\n"
+    "Guard cells open and close each stoma in response to light.",
+    "Summary: photosynthesis converts light energy into chemical energy stored "
+    "in sugar.\nIt takes place in the chloroplasts of plant cells.",
+]
+
+
+def textbook() -> str:
+    pages = []
+    for number, body in enumerate(BODY, start=1):
+        pages.append(
+            "Biology 101 - Chapter 4\n"
+            f"{body}\n\n"
+            "© 2024 Example Press. All rights reserved.\n"
+            f"Page {number} of {len(BODY)}"
+        )
+    return PAGE_BREAK.join(pages)
+
+
+def test_headers_footers_and_page_numbers_are_removed():
+    result = compact_text(textbook())
+
+    assert "Biology 101" not in result.text
+    assert "Page" not in result.text
+    assert "Example Press" not in result.text
+    assert "Guard cells open and close" in result.text
+
+
+def test_near_duplicate_paragraphs_are_collapsed():
+    result = compact_text(textbook())
+
+    assert result.text.count("chloroplasts of plant cells") == 1
+    assert result.saved_ratio > 0.2
+    assert result.saved_tokens == result.original_tokens - result.compacted_tokens
+
+
+def test_short_documents_keep_repeated_lines():
+    text = "Key idea\nRecall beats rereading.\fKey idea\nSpacing beats cramming."
+
+    assert "Key idea" in compact_text(text).text
+
+
+def test_chunk_resource_uses_compacted_text():
+    app = create_app("backend.config.TestingConfig")
+    resource = Resource(text_content=textbook())
+
+    with app.app_context():
+        compacted = " ".join(chunk_resource(resource, chunk_size=10_000))
+        app.config["AI_PROMPT_COMPACTION"] = False
+        raw = " ".join(chunk_resource(resource, chunk_size=10_000))
+
+    assert "Biology 101" not in compacted
+    assert "Biology 101" in raw
+    assert len(compacted) < len(raw)
+
+
+def test_formulas_and_numeric_tables_are_kept():
+    text = "Area of a circle:\n\n∑ = ∫ ≈ √\n\n2.5 | 3.1 | 4.7\n\n∑ = ∫ ≈ √\n\n12"
+
+    result = compact_text(text).text
+    assert result.count("∑ = ∫ ≈ √") == 1
+    assert "2.5 | 3.1 | 4.7" in result
+    assert "12" not in result.split("\n\n")
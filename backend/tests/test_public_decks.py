@@ -0,0 +1,141 @@
+"""Tests for the public deck feed."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import Flashcard, FlashcardDeck, Role, User
+from app.utils.pagination import encode_cursor
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/public.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def teacher(test_app) -> User:
+    user = User(email="teacher@example.com", username="teacher")
+    user.set_password("Teacher123!")
+    user.roles.append(Role(name="teacher"))
+    for index in range(5):
+        deck = FlashcardDeck(title=f"Deck {index}", owner=user)
+        for card in range(index + 1):
+            deck.flashcards.append(Flashcard(question=f"Q{card}", answer="A"))
+        db.session.add(deck)
+    db.session.commit()
+    return user
+
+
+def _login(test_app, email: str, password: str):
+    client = test_app.test_client()
+    response = client.post(
+        "/api/v1/auth/login", json={"email": email, "password": password}
+    )
+    token = response.get_json()["access_token"]
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+def _deck_ids() -> list[int]:
+    return db.session.scalars(sa.select(FlashcardDeck.id).order_by("id")).all()
+
+
+def test_feed_lists_only_published_decks_with_counts(test_app, teacher):
+    client = _login(test_app, "teacher@example.com", "Teacher123!")
+    ids = _deck_ids()
+    assert test_app.test_client().get("/api/v1/public/flashcards").get_json() == {
+        "items": [],
+        "next_cursor": None,
+    }
+
+    for deck_id in ids[1:4]:
+        assert client.post(f"/api/v1/flashcards/{deck_id}/publish").status_code == 200
+
+    body = test_app.test_client().get("/api/v1/public/flashcards").get_json()
+    assert [item["id"] for item in body["items"]] == [ids[3], ids[2], ids[1]]
+    assert [item["card_count"] for item in body["items"]] == [4, 3, 2]
+    assert body["items"][0]["owner"] == "teacher"
+    assert "flashcards" not in body["items"][0]
+
+
+def test_feed_pages_with_keyset_cursor(test_app, teacher):
+    client = _login(test_app, "teacher@example.com", "Teacher123!")
+    for deck_id in _deck_ids():
+        client.post(f"/api/v1/flashcards/{deck_id}/publish")
+    public = test_app.test_client()
+
+    seen: list[int] = []
+    url = "/api/v1/public/flashcards?limit=2"
+    while url:
+        body = public.get(url).get_json()
+        seen.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        url = f"/api/v1/public/flashcards?limit=2&cursor={cursor}" if cursor else ""
+
+    assert seen == sorted(_deck_ids(), reverse=True)
+    bad = public.get("/api/v1/public/flashcards?cursor=not-a-cursor")
+    assert bad.status_code == 400
+
+
+@pytest.mark.parametrize("feed", ["lessons", "flashcards", "blog"])
+@pytest.mark.parametrize(
+    "values",
+    [[{"dt": "2026-01-01T00:00:00"}, [1]], ["x", 1], [{"dt": "2026-01-01"}, True]],
+)
+def test_cursor_values_of_the_wrong_type_are_rejected(test_app, feed, values):
+    response = test_app.test_client().get(
+        f"/api/v1/public/{feed}?cursor={encode_cursor(values)}"
+    )
+    assert response.status_code == 400
+
+
+def test_first_page_is_cached_until_visibility_changes(test_app, teacher):
+    client = _login(test_app, "teacher@example.com", "Teacher123!")
+    first, second = _deck_ids()[:2]
+    client.post(f"/api/v1/flashcards/{first}/publish")
+    public = test_app.test_client()
+    assert len(public.get("/api/v1/public/flashcards").get_json()["items"]) == 1
+
+    db.session.execute(
+        sa.update(FlashcardDeck).where(FlashcardDeck.id == first).values(title="Stale")
+    )
+    db.session.commit()
+    items = public.get("/api/v1/public/flashcards").get_json()["items"]
+    assert items[0]["title"] == "Deck 0"
+
+    client.post(f"/api/v1/flashcards/{second}/publish")
+    items = public.get("/api/v1/public/flashcards").get_json()["items"]
+    assert [item["title"] for item in items] == ["Deck 1", "Stale"]
+
+    client.post(f"/api/v1/flashcards/{second}/unpublish")
+    items = public.get("/api/v1/public/flashcards").get_json()["items"]
+    assert [item["id"] for item in items] == [first]
+
+
+def test_public_decks_can_be_cloned_by_others(test_app, teacher):
+    owner = _login(test_app, "teacher@example.com", "Teacher123!")
+    deck_id = _deck_ids()[2]
+    other = User(email="other@example.com", username="other")
+    other.set_password("Other123!")
+    db.session.add(other)
+    db.session.commit()
+    client = _login(test_app, "other@example.com", "Other123!")
+
+    assert client.post(f"/api/v1/flashcards/{deck_id}/clone").status_code == 403
+    owner.post(f"/api/v1/flashcards/{deck_id}/publish")
+    assert client.post(f"/api/v1/flashcards/{deck_id}/publish").status_code == 403
+
+    response = client.post(f"/api/v1/flashcards/{deck_id}/clone")
+    assert response.status_code == 201
+    assert response.get_json()["card_count"] == 3
+    assert response.get_json()["is_public"] is False
@@ -0,0 +1,111 @@
+"""Tests for static snapshots of public content."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import cache, db
+from app.models import FAQ, Role, User
+from app.services.public_snapshot import MANIFEST_NAME, build_snapshot, load_snapshot
+from app.utils.http_cache import PUBLIC_FAQ, invalidate_public
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/snapshot.db"
+    app.config["PUBLIC_SNAPSHOT_DIR"] = str(tmp_path / "snapshot")
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(FAQ(question="What is Flashy?", answer="A study tool."))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_snapshot_matches_live_responses(test_app, tmp_path):
+    manifest = build_snapshot(test_app)
+    directory = tmp_path / "snapshot"
+
+    assert json.loads((directory / MANIFEST_NAME).read_text()) == manifest
+    entry = manifest["files"]["/api/v1/public/faq"]
+    body = (directory / entry["file"]).read_bytes()
+    compressed = (directory / f"{entry['file']}.gz").read_bytes()
+    assert gzip.decompress(compressed) == body
+    assert entry["size"] == len(body) and entry["gzip_size"] == len(compressed)
+
+    live = test_app.test_client().get("/api/v1/public/faq")
+    assert live.get_data() == body
+    assert live.headers["ETag"].strip('"') == entry["etag"]
+    assert set(manifest["files"]) == {
+        "/api/v1/public/lessons",
+        "/api/v1/public/flashcards",
+        "/api/v1/public/blog",
+        "/api/v1/public/faq",
+    }
+
+
+def test_publish_refreshes_snapshot_when_enabled(test_app):
+    test_app.config["PUBLIC_SNAPSHOT_ON_PUBLISH"] = True
+    build_snapshot(test_app, [PUBLIC_FAQ])
+    db.session.add(FAQ(question="New?", answer="Yes."))
+    db.session.commit()
+
+    invalidate_public(PUBLIC_FAQ)
+    body, _, _ = load_snapshot("/api/v1/public/faq")
+    assert len(json.loads(body)) == 2
+
+
+def test_publish_rebuilds_snapshot_after_the_response(test_app):
+    test_app.config["PUBLIC_SNAPSHOT_ON_PUBLISH"] = True
+    admin = User(email="admin@example.com", username="admin")
+    admin.set_password("Admin123!")
+    admin.roles.append(Role(name="admin"))
+    db.session.add(admin)
+    db.session.commit()
+    client = test_app.test_client()
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "admin@example.com", "password": "Admin123!"},
+    ).get_json()["access_token"]
+
+    response = client.post(
+        "/api/v1/admin/content/faq",
+        json={"question": "New?", "answer": "Yes."},
+        headers={"Authorization": f"Bearer {token}"},
+        buffered=False,
+    )
+    assert response.status_code == 201
+    assert load_snapshot("/api/v1/public/faq") is None
+    response.close()
+    body, _, _ = load_snapshot("/api/v1/public/faq")
+    assert len(json.loads(body)) == 2
+
+
+def test_database_failure_falls_back_to_snapshot(test_app):
+    build_snapshot(test_app, [PUBLIC_FAQ])
+    cache.invalidate(PUBLIC_FAQ)
+    db.session.execute(sa.text("DROP TABLE faqs"))
+    db.session.commit()
+    client = test_app.test_client()
+
+    response = client.get("/api/v1/public/faq")
+    assert response.status_code == 200
+    assert response.headers["X-Public-Snapshot"]
+    assert response.get_json()[0]["question"] == "What is Flashy?"
+
+    etag = response.headers["ETag"]
+    revalidated = client.get("/api/v1/public/faq", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    compressed = client.get("/api/v1/public/faq", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(compressed.get_data())) == response.get_json()
+
+    with pytest.raises(sa.exc.OperationalError):
+        client.get("/api/v1/public/faq?page=2")
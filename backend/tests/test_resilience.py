@@ -0,0 +1,242 @@
+"""Tests for retrying, circuit-breaking and hedged AI calls."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from app.services.ai_scheduler import AIScheduler, TokenBucket
+from app.services.gemini_service import (
+    GeminiService,
+    GeminiServiceError,
+    GeminiUnavailableError,
+)
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientCaller,
+    RetryPolicy,
+)
+from google.api_core import exceptions as google_exceptions
+
+RESPONSE = '{"flashcards": [{"question": "Q1", "answer": "A1"}], "summary": "S"}'
+
+
+class FaultyModel:
+    """Local fake for Gemini that injects latency and errors per call."""
+
+    def __init__(self, script: list) -> None:
+        self._script = list(script)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def generate_content(self, prompt: str, **kwargs):
+        with self._lock:
+            self.calls += 1
+            step = self._script.pop(0) if self._script else None
+        if isinstance(step, (int, float)):
+            time.sleep(step)
+        elif isinstance(step, BaseException):
+            raise step
+        return SimpleNamespace(text=RESPONSE)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_service(model: FaultyModel, **caller_options) -> GeminiService:
+    caller_options.setdefault(
+        "retry", RetryPolicy(max_attempts=3, sleep=lambda _: None)
+    )
+    service = GeminiService(
+        transport=ResilientCaller(**caller_options),
+        scheduler=AIScheduler(TokenBucket(rate=1000, capacity=1000)),
+    )
+    service._init_client = lambda: model  # type: ignore[method-assign]
+    return service
+
+
+def test_transient_errors_are_retried():
+    model = FaultyModel(
+        [
+            google_exceptions.ServiceUnavailable("down"),
+            google_exceptions.TooManyRequests("slow down"),
+        ]
+    )
+    payload = make_service(model).generate_flashcards(["text"])
+
+    assert model.calls == 3
+    assert payload.cards[0].question == "Q1"
+
+
+def test_permanent_errors_are_not_retried():
+    model = FaultyModel([google_exceptions.InvalidArgument("bad prompt")])
+
+    with pytest.raises(GeminiServiceError):
+        make_service(model).generate_flashcards(["text"])
+    assert model.calls == 1
+
+
+def test_breaker_fails_fast_then_recovers_after_reset():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    model = FaultyModel([ConnectionError("reset")] * 2)
+    service = make_service(
+        model, retry=RetryPolicy(max_attempts=2, sleep=lambda _: None), breaker=breaker
+    )
+
+    with pytest.raises(GeminiServiceError):
+        service.generate_flashcards(["text"])
+    assert breaker.state == "open"
+
+    with pytest.raises(GeminiUnavailableError):
+        service.generate_flashcards(["text"])
+    assert model.calls == 2
+
+    clock.now += 31
+    assert breaker.state == "half_open"
+    service.generate_flashcards(["text"])
+    assert breaker.state == "closed"
+
+
+def test_permanent_errors_leave_the_breaker_closed():
+    breaker = CircuitBreaker(failure_threshold=1)
+    model = FaultyModel([google_exceptions.InvalidArgument("bad prompt")] * 2)
+    service = make_service(model, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(GeminiServiceError):
+            service.generate_flashcards(["text"])
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now += 5
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_hedged_request_cuts_tail_latency():
+    model = FaultyModel([1.0, 0])
+    service = make_service(model, hedge_delay=0.05)
+
+    started = time.monotonic()
+    service.generate_flashcards(["text"])
+
+    assert time.monotonic() - started < 0.5
+    assert model.calls == 2
+
+
+def test_every_retry_and_hedge_takes_quota():
+    model = FaultyModel([ConnectionError("reset"), 1.0, 0])
+    service = make_service(model, hedge_delay=0.05)
+
+    service.generate_flashcards(["text"])
+
+    assert model.calls == 3
+    assert service.scheduler.snapshot()["granted"]["interactive"] == 3
+
+
+def test_open_breaker_takes_no_quota():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    caller = ResilientCaller(breaker=breaker)
+    acquired: list[int] = []
+
+    with pytest.raises(CircuitOpenError):
+        caller.call(lambda: "ok", acquire=lambda: acquired.append(1))
+    assert acquired == []
+
+    def refuse() -> None:
+        raise TimeoutError("queue full")
+
+    clock.now += 5
+    with pytest.raises(TimeoutError):
+        caller.call(lambda: "ok", acquire=refuse)
+    assert caller.call(lambda: "ok", acquire=lambda: acquired.append(1)) == "ok"
+    assert acquired == [1] and breaker.state == "closed"
+
+
+def test_timeout_budget_is_enforced():
+    model = FaultyModel([1.0, 1.0])
+    service = make_service(model, timeout=0.1)
+
+    started = time.monotonic()
+    with pytest.raises(GeminiServiceError):
+        service.generate_flashcards(["text"])
+    assert time.monotonic() - started < 0.5
+
+
+def _chunks(fail_at: int | None):
+    for index in range(3):
+        if index == fail_at:
+            raise ConnectionError("dropped")
+        yield index
+
+
+def test_stream_open_failures_are_retried():
+    breaker = CircuitBreaker(failure_threshold=2)
+    caller = ResilientCaller(
+        retry=RetryPolicy(max_attempts=2, sleep=lambda _: None), breaker=breaker
+    )
+    opened: list[int] = []
+
+    def open_stream():
+        opened.append(1)
+        return _chunks(0 if len(opened) == 1 else None)
+
+    assert list(caller.stream(open_stream)) == [0, 1, 2]
+    assert len(opened) == 2
+    assert breaker.state == "closed"
+
+
+def test_mid_stream_failures_trip_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1)
+    caller = ResilientCaller(breaker=breaker)
+
+    stream = caller.stream(lambda: _chunks(1))
+    assert next(stream) == 0
+    with pytest.raises(ConnectionError):
+        next(stream)
+    assert breaker.state == "open"
+
+
+def test_losing_hedged_stream_is_closed():
+    closed = threading.Event()
+    calls: list[int] = []
+
+    class Slow:
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            return "slow"
+
+        def close(self) -> None:
+            closed.set()
+
+    def open_stream():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            return Slow()
+        return iter(["fast"])
+
+    caller = ResilientCaller(hedge_delay=0.05)
+    assert list(caller.stream(open_stream)) == ["fast"]
+    assert closed.wait(1)
@@ -0,0 +1,144 @@
+"""Tests for cache backends and cached public responses."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import pytest
+from app import create_app
+from app.extensions import cache, db
+from app.models import FAQ, Role, User
+from app.utils.cache import FileSystemCache, MemoryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_memory_cache_evicts_least_recently_used_and_expired():
+    clock = FakeClock()
+    backend = MemoryCache(default_timeout=10, max_entries=2, clock=clock)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    assert backend.get("a") == 1
+    backend.set("c", 3)
+
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+    clock.now += 11
+    assert backend.get("a") is None
+
+
+def test_filesystem_cache_is_shared_and_pruned(tmp_path):
+    clock = FakeClock()
+    first = FileSystemCache(tmp_path, default_timeout=10, max_entries=2, clock=clock)
+    second = FileSystemCache(tmp_path, default_timeout=10, max_entries=2, clock=clock)
+    first.set("a", {"value": 1})
+    assert second.get("a") == {"value": 1}
+
+    first.set("b", 2, timeout=1)
+    clock.now += 5
+    first.set("c", 3)
+    assert len(list(tmp_path.glob("*.cache"))) == 2
+    assert second.get("b") is None
+    first.delete("a")
+    assert second.get("a") is None and second.get("c") == 3
+
+
+def test_filesystem_cache_stores_json_in_a_private_directory(tmp_path):
+    backend = FileSystemCache(tmp_path / "cache")
+    backend.set("page", {"body": b"\x00gz", "encoded": {"br": b"\xff"}})
+    assert backend.get("page") == {"body": b"\x00gz", "encoded": {"br": b"\xff"}}
+    (path,) = (tmp_path / "cache").glob("*.cache")
+    assert json.loads(path.read_bytes())[1]["body"] == {"__bytes__": "AGd6"}
+    assert (tmp_path / "cache").stat().st_mode & 0o777 == 0o700
+
+    path.write_bytes(b"\x80\x04garbage")
+    assert backend.get("page") is None
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(ValueError):
+        FileSystemCache(shared)
+
+
+@pytest.fixture(params=["memory", "filesystem"])
+def test_app(request, tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/cache.db"
+    app.config["CACHE_TYPE"] = request.param
+    app.config["CACHE_DIR"] = str(tmp_path / "cache")
+    cache.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_concurrent_misses_compute_once(test_app):
+    calls: list[int] = []
+    results: list[object] = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    def worker():
+        with test_app.app_context():
+            results.append(cache.get_or_set("key", factory))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["value"] * 8
+
+
+def test_public_responses_use_etags_and_invalidate_on_write(test_app):
+    db.session.add(FAQ(question="What is Flashy?", answer="A study tool."))
+    admin = User(email="admin@example.com", username="admin")
+    admin.set_password("Admin123!")
+    admin.roles.append(Role(name="admin"))
+    db.session.add(admin)
+    db.session.commit()
+    public = test_app.test_client()
+
+    first = public.get("/api/v1/public/faq")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag
+
+    revalidated = public.get("/api/v1/public/faq", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+    db.session.add(FAQ(question="Hidden?", answer="Not until invalidated."))
+    db.session.commit()
+    assert len(public.get("/api/v1/public/faq").get_json()) == 1
+
+    client = test_app.test_client()
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "admin@example.com", "password": "Admin123!"},
+    ).get_json()["access_token"]
+    created = client.post(
+        "/api/v1/admin/content/faq",
+        json={"question": "New?", "answer": "Yes."},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert created.status_code == 201
+
+    refreshed = public.get("/api/v1/public/faq", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert len(refreshed.get_json()) == 3
@@ -0,0 +1,128 @@
+"""Tests for spaced-repetition reviews."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import CardReview, Flashcard, FlashcardDeck, Role, User
+from app.services.fsrs import AGAIN, GOOD, FSRSScheduler
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/reviews.db"
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def deck(test_app) -> FlashcardDeck:
+    user = User(email="learner@example.com", username="learner")
+    user.set_password("Learner123!")
+    user.roles.append(Role(name="student"))
+    deck = FlashcardDeck(title="Memory", owner=user)
+    for index in range(3):
+        deck.flashcards.append(Flashcard(question=f"Q{index}", answer=f"A{index}"))
+    db.session.add(deck)
+    db.session.commit()
+    return deck
+
+
+@pytest.fixture()
+def client(test_app, deck):
+    client = test_app.test_client()
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "learner@example.com", "password": "Learner123!"},
+    )
+    token = response.get_json()["access_token"]
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+def test_scheduler_grows_intervals_on_success():
+    scheduler = FSRSScheduler()
+    start = datetime(2026, 1, 1)
+    first = scheduler.review(rating=GOOD, reviewed_at=start)
+    second = scheduler.review(
+        rating=GOOD,
+        reviewed_at=first.due_at,
+        stability=first.stability,
+        difficulty=first.difficulty,
+        last_reviewed_at=start,
+    )
+    lapse = scheduler.review(
+        rating=AGAIN,
+        reviewed_at=second.due_at,
+        stability=second.stability,
+        difficulty=second.difficulty,
+        last_reviewed_at=first.due_at,
+    )
+
+    assert second.scheduled_days > first.scheduled_days >= 1
+    assert lapse.stability < second.stability
+    assert lapse.due_at - second.due_at == timedelta(minutes=10)
+
+
+def test_session_is_recorded_in_one_request(client, deck):
+    due = client.get("/api/v1/reviews/due?limit=10").get_json()["cards"]
+    assert [card["status"] for card in due] == ["new", "new", "new"]
+
+    first, second, third = (card.id for card in deck.flashcards)
+    response = client.post(
+        "/api/v1/reviews",
+        json={
+            "reviews": [
+                {"flashcard_id": first, "rating": 3},
+                {"flashcard_id": second, "rating": 1},
+                {"flashcard_id": first, "rating": 4},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    states = {card["flashcard_id"]: card for card in response.get_json()["cards"]}
+    assert states[first]["reps"] == 2
+    assert states[second]["reps"] == 1
+    assert db.session.scalar(sa.select(sa.func.count()).select_from(CardReview)) == 3
+
+    due = client.get("/api/v1/reviews/due?limit=10").get_json()["cards"]
+    assert [(card["flashcard_id"], card["status"]) for card in due] == [(third, "new")]
+
+
+def test_reviews_for_other_users_cards_are_rejected(client, deck):
+    stranger = User(email="other@example.com", username="other")
+    stranger.set_password("Other123!")
+    other_deck = FlashcardDeck(title="Other", owner=stranger)
+    other_deck.flashcards.append(Flashcard(question="Q", answer="A"))
+    db.session.add(other_deck)
+    db.session.commit()
+
+    response = client.post(
+        "/api/v1/reviews",
+        json={"reviews": [{"flashcard_id": other_deck.flashcards[0].id, "rating": 3}]},
+    )
+
+    assert response.status_code == 400
+
+
+def test_due_query_uses_user_due_index(test_app, deck):
+    plan = db.session.execute(
+        sa.text(
+            "EXPLAIN QUERY PLAN SELECT flashcard_id FROM card_states "
+            "WHERE user_id = 1 AND due_at <= :now ORDER BY due_at LIMIT 20"
+        ),
+        {"now": datetime.utcnow()},
+    ).all()
+
+    assert any("ix_card_states_user_due" in row[-1] for row in plan)
+    assert not any("TEMP B-TREE" in row[-1] for row in plan)
@@ -0,0 +1,135 @@
+"""Tests for the shared study pack used by decks and lessons."""
+
+from __future__ import annotations
+
+import pytest
+import sqlalchemy as sa
+from app import create_app
+from app.extensions import db
+from app.models import Lesson, Resource, User
+from app.services.ai_provider import AIProviderRegistry
+from app.services.extractive_service import ExtractiveService
+from app.services.flashcard_service import FlashcardService, FlashcardServiceError
+from app.services.gemini_service import FlashcardItem, GeminiService, StudyPackPayload
+from app.services.lesson_service import LessonService, LessonServiceError
+from app.services.study_pack_service import StudyPackService
+
+
+class CountingGemini(GeminiService):
+    """Gemini service double that records how often the model is called."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def generate_study_pack(self, chunks):
+        self.calls += 1
+        return StudyPackPayload(
+            cards=[FlashcardItem(question="What is recall?", answer="Retrieval")],
+            summary="Recall strengthens memory.",
+            lesson="Recall\n\nPractise retrieving facts without cues.",
+            source=self.name,
+        )
+
+
+def test_deck_and_lesson_share_one_ai_call(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/study_pack.db"
+
+    with app.app_context():
+        db.create_all()
+        try:
+            user = User(email="teacher@example.com", username="teacher")
+            user.set_password("Teacher123!")
+            resource = Resource(
+                owner=user,
+                filename="notes.txt",
+                original_name="notes.txt",
+                storage_url="https://cdn.example.com/notes.txt",
+                text_content="Recall strengthens memory through retrieval practice.",
+            )
+            db.session.add_all([user, resource])
+            db.session.commit()
+
+            ai_service = CountingGemini()
+            providers = AIProviderRegistry({"auto": ai_service})
+            study_packs = StudyPackService(providers)
+            decks = FlashcardService(providers, study_packs)
+            lessons = LessonService(study_packs, decks)
+
+            lesson = lessons.generate_lesson(author=user, resource=resource)
+            deck = decks.generate_deck(
+                owner=user, resource=resource, use_study_pack=True
+            )
+
+            assert ai_service.calls == 1
+            assert lesson.content.startswith("Recall")
+            assert deck.description == lesson.summary
+            assert [card.question for card in deck.flashcards] == ["What is recall?"]
+
+            resource.text_content = "Spacing reviews over days beats cramming."
+            db.session.commit()
+            decks.generate_deck(owner=user, resource=resource, use_study_pack=True)
+            assert ai_service.calls == 2
+
+            lesson, deck = lessons.generate_lesson_with_deck(
+                author=user, resource=resource
+            )
+            assert ai_service.calls == 2
+            assert deck.description == lesson.summary and lesson.id and deck.id
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+def test_lesson_and_deck_share_an_uncached_pack_and_commit_together(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/combined.db"
+
+    class CountingExtractive(ExtractiveService):
+        calls = 0
+
+        def generate_study_pack(self, chunks):
+            CountingExtractive.calls += 1
+            return super().generate_study_pack(chunks)
+
+    class BrokenDecks(FlashcardService):
+        def add_study_pack_deck(self, **kwargs):
+            raise FlashcardServiceError("disk full")
+
+    with app.app_context():
+        db.create_all()
+        try:
+            user = User(email="teacher@example.com", username="teacher")
+            user.set_password("Teacher123!")
+            resource = Resource(
+                owner=user,
+                filename="bio.txt",
+                original_name="bio.txt",
+                storage_url="https://cdn.example.com/bio.txt",
+                text_content=(
+                    "Photosynthesis is the process by which plants convert light "
+                    "into chemical energy. Chlorophyll is a green pigment that "
+                    "absorbs light in the chloroplast of plant cells."
+                ),
+            )
+            db.session.add_all([user, resource])
+            db.session.commit()
+            providers = AIProviderRegistry({"auto": CountingExtractive()})
+            study_packs = StudyPackService(providers)
+
+            decks = FlashcardService(providers, study_packs)
+            lessons = LessonService(study_packs, decks)
+            lesson, deck = lessons.generate_lesson_with_deck(
+                author=user, resource=resource
+            )
+            assert CountingExtractive.calls == 1
+            assert deck.description == lesson.summary
+
+            broken = LessonService(study_packs, BrokenDecks(providers, study_packs))
+            with pytest.raises(LessonServiceError):
+                broken.generate_lesson_with_deck(author=user, resource=resource)
+            assert db.session.scalar(sa.select(sa.func.count(Lesson.id))) == 1
+        finally:
+            db.session.remove()
+            db.drop_all()
@@ -0,0 +1,96 @@
+"""Tests for the paginated admin user directory."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models import Profile, Role, User
+
+
+@pytest.fixture()
+def test_app(tmp_path):
+    app = create_app("backend.config.TestingConfig")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/users.db"
+
+    with app.app_context():
+        db.create_all()
+        admin_role, marketing_role = Role(name="admin"), Role(name="marketing")
+        start = datetime(2026, 1, 1)
+        admin = User(email="admin@example.com", username="root", created_at=start)
+        admin.set_password("Admin123!")
+        admin.roles.append(admin_role)
+        db.session.add(admin)
+        for index in range(6):
+            user = User(
+                email=f"user{index}@example.com",
+                username=f"member_{index}",
+                is_active=index != 3,
+                created_at=start + timedelta(days=index + 1),
+            )
+            user.set_password("Secret123!")
+            if index % 2:
+                user.roles.append(marketing_role)
+            db.session.add(user)
+        db.session.add(Profile(first_name="Ada", last_name="Lovelace", user=admin))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def client(test_app):
+    client = test_app.test_client()
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "admin@example.com", "password": "Admin123!"},
+    ).get_json()["access_token"]
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return client
+
+
+def _emails(page):
+    return [item["email"] for item in page["items"]]
+
+
+def test_users_are_keyset_paginated(client):
+    first = client.get("/api/v1/admin/users?limit=4").get_json()
+    assert _emails(first) == [f"user{index}@example.com" for index in (5, 4, 3, 2)]
+
+    second = client.get(
+        f"/api/v1/admin/users?limit=4&cursor={first['next_cursor']}"
+    ).get_json()
+    assert _emails(second) == [
+        "user1@example.com",
+        "user0@example.com",
+        "admin@example.com",
+    ]
+    assert second["next_cursor"] is None
+    admin = second["items"][-1]
+    assert (admin["first_name"], admin["roles"]) == ("Ada", ["admin"])
+    assert client.get("/api/v1/admin/users?cursor=bogus").status_code == 400
+
+
+def test_filters_are_applied_in_sql(client):
+    marketing = client.get("/api/v1/admin/users?role=marketing").get_json()
+    assert _emails(marketing) == [
+        f"user{index}@example.com" for index in (5, 3, 1)
+    ]
+    suspended = client.get("/api/v1/admin/users?active=false").get_json()
+    assert _emails(suspended) == ["user3@example.com"]
+    by_prefix = client.get("/api/v1/admin/users?q=MEMBER_1").get_json()
+    assert _emails(by_prefix) == ["user1@example.com"]
+    assert client.get("/api/v1/admin/users?q=member%").get_json()["items"] == []
+    assert client.get("/api/v1/admin/users?active=maybe").status_code == 400
+
+
+def test_count_endpoint(client):
+    def count(query: str = "") -> int:
+        return client.get(f"/api/v1/admin/users/count{query}").get_json()["count"]
+
+    assert count() == 7
+    assert count("?role=marketing&active=true") == 2
+    assert count("?q=user") == 6
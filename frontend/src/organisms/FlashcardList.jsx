@@ -1,5 +1,8 @@
+import { useCallback, useEffect, useState } from 'react';
 import styled from 'styled-components/native';
-import { BodyText, Heading } from '../atoms/Text';
+import Button from '../atoms/Button';
+import { BodyText, Caption, Heading } from '../atoms/Text';
+import api from '../services/api';
 
 const Container = styled.View`
   padding: ${({ theme }) => theme.spacing.md}px;
@@ -14,16 +17,51 @@ const Card = styled.View`
   border-color: ${({ theme }) => theme.colors.muted};
 `;
 
-export const FlashcardList = ({ deck }) => (
-  <Container>
-    <Heading>{deck.title}</Heading>
-    {deck.flashcards.map((card) => (
-      <Card key={card.id}>
-        <BodyText>Q: {card.question}</BodyText>
-        <BodyText>A: {card.answer}</BodyText>
-      </Card>
-    ))}
-  </Container>
-);
+export const FlashcardList = ({ deck }) => {
+  const [cards, setCards] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState(null);
+
+  const loadCards = useCallback(
+    async (cursor = null) => {
+      try {
+        setLoading(true);
+        setError(null);
+        const { data } = await api.get(`/flashcards/${deck.id}/cards`, {
+          params: cursor ? { cursor } : {}
+        });
+        setCards((previous) => (cursor ? [...previous, ...data.items] : data.items));
+        setNextCursor(data.next_cursor);
+      } catch (loadError) {
+        console.warn('Failed to load flashcards', loadError);
+        setError('Could not load flashcards.');
+      } finally {
+        setLoading(false);
+      }
+    },
+    [deck.id]
+  );
+
+  useEffect(() => {
+    loadCards();
+  }, [loadCards, deck.version]);
+
+  return (
+    <Container>
+      <Heading>{deck.title}</Heading>
+      {cards.map((card) => (
+        <Card key={card.id}>
+          <BodyText>Q: {card.question}</BodyText>
+          <BodyText>A: {card.answer}</BodyText>
+        </Card>
+      ))}
+      {error ? <Caption>{error}</Caption> : null}
+      {nextCursor ? (
+        <Button title="Load more" loading={loading} onPress={() => loadCards(nextCursor)} />
+      ) : null}
+    </Container>
+  );
+};
 
 export default FlashcardList;
@@ -37,15 +37,14 @@ const DashboardScreen = () => {
   const loadData = async () => {
     try {
       setRefreshing(true);
-      const [usersResponse, resourcesResponse, lessonsResponse] = await Promise.all([
-        api.get('/admin/users'),
+      const [resourcesResponse, summaryResponse] = await Promise.all([
         api.get('/admin/resources'),
-        api.get('/public/lessons')
+        api.get('/admin/summary')
       ]);
       setStats({
-        users: usersResponse.data.length,
+        users: summaryResponse.data.user_count,
         resources: resourcesResponse.data.length,
-        lessons: lessonsResponse.data.length
+        lessons: summaryResponse.data.published_lessons
       });
     } catch (error) {
       console.warn('Failed to load dashboard data', error);